@@ -11,6 +11,10 @@
 - 提取 attck 数组
 - 验证 technique_id 存在于 attack_techniques 表
 - 插入到 attck_mappings 表
+
+注意:
+- 批量导入器现已直接写入 attck_mappings，且不再在 manifest_json 中保存 attck 字段，
+  本脚本仅适用于旧版本导入的数据
 """
 import sqlite3
 import json
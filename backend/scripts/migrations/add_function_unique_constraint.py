@@ -0,0 +1,96 @@
+"""
+数据库迁移脚本：为 malapi_functions 添加 (hash_id, alias) 唯一约束
+
+批量导入器使用 INSERT ... ON CONFLICT DO NOTHING 去重，
+SQLite 需要存在对应的唯一索引才能识别冲突目标。
+
+使用方法:
+    cd backend
+    conda activate malapi-backend
+    python scripts/migrations/add_function_unique_constraint.py
+"""
+import sys
+import sqlite3
+from pathlib import Path
+
+# 添加项目路径
+SCRIPT_DIR = Path(__file__).parent.absolute()  # backend/scripts/migrations
+BACKEND_DIR = SCRIPT_DIR.parent.parent  # backend
+DB_PATH = BACKEND_DIR / "malapi.db"
+sys.path.insert(0, str(BACKEND_DIR))
+
+print(f"脚本目录: {SCRIPT_DIR}")
+print(f"后端目录: {BACKEND_DIR}")
+print(f"数据库路径: {DB_PATH}")
+print(f"数据库存在: {DB_PATH.exists()}")
+
+
+def migrate():
+    """执行数据库迁移"""
+
+    print("="*60)
+    print("  MalAPI - 数据库迁移：添加函数唯一约束")
+    print("="*60)
+
+    if not DB_PATH.exists():
+        print(f"❌ 数据库文件不存在: {DB_PATH}")
+        return False
+
+    print(f"\n📄 数据库路径: {DB_PATH}")
+
+    conn = None
+    try:
+        conn = sqlite3.connect(str(DB_PATH))
+        cursor = conn.cursor()
+
+        # 检查是否存在重复数据，存在时不自动删除，交由人工处理
+        print("\n🔹 检查重复的 (hash_id, alias) 记录...")
+        cursor.execute("""
+            SELECT hash_id, alias, COUNT(*)
+            FROM malapi_functions
+            GROUP BY hash_id, alias
+            HAVING COUNT(*) > 1
+        """)
+        duplicates = cursor.fetchall()
+
+        if duplicates:
+            print(f"❌ 发现 {len(duplicates)} 组重复记录，请清理后再执行迁移:")
+            for hash_id, alias, count in duplicates[:20]:
+                print(f"  {hash_id} / {alias}: {count} 条")
+            conn.close()
+            return False
+
+        print("  → 未发现重复记录")
+
+        # 创建唯一索引
+        print("\n🔹 创建唯一索引 unique_function...")
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS unique_function
+            ON malapi_functions(hash_id, alias)
+        """)
+
+        conn.commit()
+
+        print("\n" + "="*50)
+        print("✅ 数据库迁移成功完成!")
+        print("="*50)
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 迁移失败: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        # 回滚事务
+        if conn:
+            conn.rollback()
+            print("已回滚所有更改")
+
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
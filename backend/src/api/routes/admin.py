@@ -12,6 +12,7 @@ from pathlib import Path
 import tempfile
 import shutil
 import asyncio
+import time
 
 from src.database.connection import get_async_session, AsyncSessionLocal
 from src.database.models import MalAPIFunction, AttCKMapping, AttackTechnique, AttackTactic
@@ -610,7 +611,7 @@ async def get_all_techniques_simple(
             ).order_by(MalAPIFunction.id)
 
             func_result = await session.execute(func_query)
-            function_ids = [row[0] for row in func_result.fetchall()]
+            function_ids = func_result.scalars().all()
 
             technique_list.append({
                 "technique_id": tech.technique_id,
@@ -635,7 +636,7 @@ async def upload_and_import(
     update_existing: bool = Form(False)
 ):
     """上传并导入manifest.json文件"""
-    task_id = f"import_{asyncio.get_event_loop().time()}"
+    task_id = f"import_{time.perf_counter()}"
     try:
         temp_dir = tempfile.mkdtemp()
         file_path = Path(temp_dir) / file.filename
@@ -673,7 +674,7 @@ async def import_from_directory_api(
     update_existing: bool = Form(False)
 ):
     """从指定目录导入所有manifest.json文件"""
-    task_id = f"import_dir_{asyncio.get_event_loop().time()}"
+    task_id = f"import_dir_{time.perf_counter()}"
     try:
         dir_path = Path(directory_path)
         if not dir_path.exists() or not dir_path.is_dir():
@@ -700,7 +701,8 @@ async def validate_manifest_file(file: UploadFile = File(...)):
         content = await file.read()
         import json
         try:
-            data = json.loads(content)
+            # 与导入路径共用解码逻辑：有orjson时直接解析字节
+            data = ManifestParser.decode_json(content)
         except json.JSONDecodeError as e:
             return {"is_valid": False, "errors": [f"JSON格式错误: {str(e)}"], "warnings": []}
 
@@ -781,7 +783,10 @@ async def process_directory_import_task(task_id: str, directory_path: Path, upda
         import_tasks[task_id]["progress"] = 5
 
         scanner = FileScanner()
-        scan_result = await scanner.scan_directory(str(directory_path), pattern="manifest.json")
+        try:
+            scan_result = await scanner.scan_directory(str(directory_path), pattern="manifest.json")
+        finally:
+            scanner.close()
 
         if scan_result.get_file_count() == 0:
             import_tasks[task_id]["status"] = "completed"
@@ -796,11 +801,14 @@ async def process_directory_import_task(task_id: str, directory_path: Path, upda
         import_manager = ImportManager(AsyncSessionLocal)
         # update_existing 参数当前未实现，保留以备将来使用
         logger.info(f"处理目录导入任务 (update_existing={update_existing} - 当前未实现)")
-        process_result = await import_manager.import_from_directory(
-            str(directory_path),
-            pattern="manifest",
-            recursive=True
-        )
+        try:
+            process_result = await import_manager.import_from_directory(
+                str(directory_path),
+                pattern="manifest",
+                recursive=True
+            )
+        finally:
+            import_manager.close()
 
         import_tasks[task_id]["status"] = "completed"
         import_tasks[task_id]["message"] = process_result.get_overall_summary()
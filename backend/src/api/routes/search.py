@@ -184,7 +184,7 @@ async def get_search_suggestions(
         ).limit(5)
 
         function_result = await session.execute(function_query)
-        function_suggestions = [row[0] for row in function_result.fetchall()]
+        function_suggestions = function_result.scalars().all()
         suggestions.extend([{"type": "function", "value": s} for s in function_suggestions])
 
         # ATT&CK技术建议
@@ -0,0 +1,274 @@
+"""
+MalAPI系统FastAPI应用工厂
+
+设计思路：
+1. 完整版(main.py)和简化版(main_simple.py)共用同一个工厂函数
+2. 应用元信息、CORS等公共配置只在这里定义一次
+3. 数据库、路由等重量级依赖只在完整版分支中导入
+
+为什么需要工厂：
+- 两个入口原先各自构建应用，配置重复且容易不一致
+- 简化版只用于测试基础功能，不应加载数据库和全部业务路由
+"""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+# 允许跨域访问的前端地址，简化版额外允许3001端口的开发服务器
+CORS_ORIGINS = ("http://localhost:3000", "http://127.0.0.1:3000")
+SIMPLE_CORS_ORIGINS = CORS_ORIGINS + ("http://localhost:3001", "http://127.0.0.1:3001")
+
+# 简化版各组件视为正常的状态值
+_OK_STATUSES = frozenset({"healthy", "configured", "active", "operational", "loaded"})
+
+# 简化版组件状态是固定的，整体状态在导入时计算一次，状态端点直接返回同一份数据
+_STATUS_COMPONENTS = {
+    "api": {"status": "healthy", "details": "FastAPI运行正常"},
+    "cors": {"status": "configured", "details": "CORS已配置"},
+    "logging": {"status": "active", "details": "日志系统正常"},
+    "async": {"status": "operational", "details": "异步处理正常"},
+    "middleware": {"status": "loaded", "details": "中间件已加载"}
+}
+_STATIC_STATUS_PAYLOAD = {
+    "overall_status": (
+        "healthy" if all(c["status"] in _OK_STATUSES for c in _STATUS_COMPONENTS.values())
+        else "unhealthy"
+    ),
+    "timestamp": "2024-12-19T00:00:00Z",
+    "components": _STATUS_COMPONENTS,
+    "uptime": "刚刚启动"
+}
+
+
+def create_app(simple: bool = False) -> FastAPI:
+    """
+    创建FastAPI应用实例
+
+    参数说明：
+    - simple: True时创建不依赖数据库的简化版应用，仅包含测试和状态端点
+
+    返回值：
+    - FastAPI: 配置好中间件和路由的应用
+    """
+    if simple:
+        return _create_simple_app()
+    return _create_full_app()
+
+
+def _create_full_app() -> FastAPI:
+    """创建完整版应用：初始化数据库并注册全部业务路由"""
+    # 延迟导入，简化版应用不加载数据库和业务路由
+    from src.api.routes import functions, analysis, search, admin, attack
+    from src.database.connection import init_db
+    from src.utils.logger import setup_logger
+
+    logger = setup_logger("src.main")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """应用生命周期管理"""
+        # 启动时执行
+        logger.info("正在启动MalAPI后端服务...")
+        await init_db()
+        logger.info("数据库初始化完成")
+
+        yield
+
+        # 关闭时执行
+        logger.info("正在关闭MalAPI后端服务...")
+
+    app = FastAPI(
+        title="MalAPI System",
+        description="恶意软件API管理和分析系统",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # CORS配置
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Total-Count", "X-Page", "X-Page-Size", "X-Total-Pages"],
+    )
+
+    # 注册路由
+    app.include_router(functions.router, prefix="/api/v1/functions", tags=["functions"])
+    app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["analysis"])
+    app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+    app.include_router(admin.router, prefix="/api/v1", tags=["admin"])
+    app.include_router(attack.router, prefix="/api/v1/attack", tags=["ATT&CK"])
+
+    # 根路径
+    @app.get("/")
+    async def root():
+        return {
+            "message": "MalAPI System API",
+            "version": "1.0.0",
+            "docs": "/docs"
+        }
+
+    # 健康检查
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    # 全局异常处理
+    @app.exception_handler(Exception)
+    async def global_exception_handler(request, exc):
+        logger.error(f"全局异常: {str(exc)}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": "内部服务器错误", "detail": str(exc)}
+        )
+
+    return app
+
+
+def _create_simple_app() -> FastAPI:
+    """创建简化版应用：仅用于测试基础功能，不依赖数据库"""
+    logger = logging.getLogger("src.main_simple")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """应用生命周期管理"""
+        logger.info("🚀 MalAPI后端服务启动中...")
+
+        # 启动时执行
+        try:
+            logger.info("✅ 服务启动完成")
+            yield
+        except Exception as e:
+            logger.error(f"❌ 服务启动失败: {e}")
+            raise
+        finally:
+            logger.info("🛑 MalAPI后端服务关闭中...")
+
+    app = FastAPI(
+        title="MalAPI System",
+        description="恶意软件API管理和分析系统",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+
+    # CORS配置
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=SIMPLE_CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.get("/")
+    async def root():
+        """根路径 - 服务信息"""
+        return {
+            "message": "MalAPI System API",
+            "version": "1.0.0",
+            "status": "running",
+            "description": "恶意软件API管理和分析系统",
+            "endpoints": {
+                "health": "/health",
+                "docs": "/docs",
+                "api": "/api/v1/",
+                "test": "/api/v1/test"
+            }
+        }
+
+    @app.get("/health")
+    async def health_check():
+        """健康检查端点"""
+        return {
+            "status": "healthy",
+            "timestamp": "2024-12-19T00:00:00Z",
+            "version": "1.0.0",
+            "environment": os.getenv("DEBUG", "false")
+        }
+
+    @app.get("/api/v1/test")
+    async def test_endpoint():
+        """测试端点 - 验证API基本功能"""
+        return {
+            "message": "测试成功",
+            "backend": "FastAPI正常运行",
+            "cors": "CORS已启用",
+            "async": "异步端点正常",
+            "features": {
+                "fastapi": "✅",
+                "cors": "✅",
+                "async": "✅",
+                "logging": "✅"
+            }
+        }
+
+    @app.get("/api/v1/info")
+    async def system_info():
+        """系统信息端点"""
+        return {
+            "system": {
+                "name": "MalAPI System",
+                "version": "1.0.0",
+                "environment": "development" if os.getenv("DEBUG") == "true" else "production",
+                "python_version": "3.11",
+                "framework": "FastAPI",
+                "database": "SQLite (开发环境)"
+            },
+            "features": [
+                "恶意软件API管理",
+                "ATT&CK矩阵分析",
+                "LLM智能分析",
+                "实时搜索",
+                "可视化展示"
+            ],
+            "api_endpoints": [
+                "/api/v1/functions",
+                "/api/v1/attack-matrix",
+                "/api/v1/search",
+                "/api/v1/analyze",
+                "/api/v1/statistics"
+            ]
+        }
+
+    @app.get("/api/v1/status")
+    async def detailed_status():
+        """详细状态检查"""
+        return _STATIC_STATUS_PAYLOAD
+
+    # 异常处理器
+    @app.exception_handler(404)
+    async def not_found_handler(request, exc):
+        """404错误处理"""
+        return {
+            "error": "Not Found",
+            "message": f"路径 {request.url.path} 不存在",
+            "available_endpoints": [
+                "/",
+                "/health",
+                "/api/v1/test",
+                "/api/v1/info",
+                "/api/v1/status",
+                "/docs"
+            ]
+        }
+
+    @app.exception_handler(500)
+    async def internal_error_handler(request, exc):
+        """500错误处理"""
+        logger.error(f"内部服务器错误: {exc}")
+        return {
+            "error": "Internal Server Error",
+            "message": "服务器内部错误，请稍后重试",
+            "timestamp": "2024-12-19T00:00:00Z"
+        }
+
+    return app
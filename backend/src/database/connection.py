@@ -4,7 +4,7 @@
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.pool import StaticPool
 import asyncio
 from typing import AsyncGenerator
@@ -23,6 +23,8 @@ async_engine = create_async_engine(
     future=True,
     pool_pre_ping=True,
     pool_recycle=3600,  # 1小时回收连接
+    # 批量INSERT（含RETURNING）合并为多值语句，每页最多1000行
+    insertmanyvalues_page_size=1000,
     # SQLite特有配置 - 优化性能
     connect_args={
         "check_same_thread": False,
@@ -35,6 +37,29 @@ async_engine = create_async_engine(
     }
 )
 
+
+def enable_sqlite_savepoints(engine) -> None:
+    """
+    让SQLite驱动正确支持SAVEPOINT
+
+    pysqlite/aiosqlite默认在第一条DML前才隐式BEGIN，SAVEPOINT不会开启事务，
+    RELEASE最外层SAVEPOINT即等于提交，外层事务回滚时无法撤销。
+    关闭驱动的隐式事务管理并在begin时显式发出BEGIN，使嵌套事务行为与PostgreSQL一致。
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+if "sqlite" in settings.database_url_async:
+    enable_sqlite_savepoints(async_engine)
+
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
@@ -48,7 +73,10 @@ sync_engine = create_engine(
     pool_pre_ping=True,
     # SQLite特有配置
     poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url_sync else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url_sync else {},
+    # psycopg2下executemany同时合并INSERT多值与UPDATE/DELETE批处理；
+    # 异步引擎(asyncpg)由insertmanyvalues原生处理，无需此参数
+    **({} if "sqlite" in settings.database_url_sync else {"executemany_mode": "values_plus_batch"})
 )
 
 SessionLocal = sessionmaker(
@@ -122,7 +150,7 @@ async def init_attack_tables():
                 SELECT name FROM sqlite_master
                 WHERE type='table' AND name IN ('attack_tactics', 'attack_techniques')
             """))
-            existing_tables = [row[0] for row in result.fetchall()]
+            existing_tables = result.scalars().all()
 
             # 如果表不存在，使用原始SQL创建
             if 'attack_tactics' not in existing_tables:
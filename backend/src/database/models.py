@@ -129,8 +129,9 @@ class MalAPIFunction(Base):
     children = relationship("FunctionChild", back_populates="parent_function", cascade="all, delete-orphan")
     llm_analysis_cache = relationship("LLMAnalysisCache", back_populates="function", cascade="all, delete-orphan")
 
-    # 唯一约束
+    # 唯一约束（同一样本下的功能别名唯一，与schema_postgres.sql保持一致）
     __table_args__ = (
+        UniqueConstraint('hash_id', 'alias', name='unique_function'),
         {'schema': None},
     )
 
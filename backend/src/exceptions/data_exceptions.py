@@ -25,8 +25,9 @@
 >>>     print(f"导入错误: {e}")
 """
 
-from typing import Optional, List, Any, Dict
 import json
+from types import SimpleNamespace
+from typing import Optional, List, Any, Dict, Final
 
 
 class DataProcessingError(Exception):
@@ -101,14 +102,21 @@ class DataProcessingError(Exception):
 
         return result
 
+    # 子类固定的错误代码，子类构造时传给基类
+    _ERROR_CODE: Optional[str] = None
+
     def __str__(self) -> str:
-        """字符串表示，用于日志记录"""
-        error_info = f"[{self.error_code}] {self.message}"
-        if self.details:
-            key = next(iter(self.details.keys()))
-            value = self.details[key]
-            error_info += f" - {key}: {value}"
-        return error_info
+        """
+        字符串表示，用于日志记录
+
+        每次调用时读取error_code和首个详情键，构造后修改error_code或
+        向details添加的条目同样生效
+        """
+        details = self.details
+        if not details:
+            return f"[{self.error_code}] {self.message}"
+        key = next(iter(details))
+        return f"[{self.error_code}] {self.message} - {key}: {details[key]}"
 
 
 class ParseError(DataProcessingError):
@@ -128,6 +136,8 @@ class ParseError(DataProcessingError):
     - 必需字段缺失
     """
 
+    _ERROR_CODE = "PARSE_ERROR"
+
     def __init__(
         self,
         message: str,
@@ -165,7 +175,7 @@ class ParseError(DataProcessingError):
 
         super().__init__(
             message=message,
-            error_code="PARSE_ERROR",
+            error_code=self._ERROR_CODE,
             details=details,
             original_error=original_error
         )
@@ -177,6 +187,21 @@ class ParseError(DataProcessingError):
         self.suggestion = suggestion
 
 
+class RetryableParseError(ParseError):
+    """
+    可重试的解析错误
+
+    设计思路：
+    1. 读取超时、网络文件系统暂时不可用等错误重试后可能成功
+    2. 与文件不存在、格式错误等永久性错误区分，重试逻辑只需捕获这一类型
+    3. 继承ParseError，不关心是否可重试的调用方无需修改
+
+    使用场景：
+    - 读取文件超时
+    - EAGAIN、EIO、ESTALE等暂时性I/O错误
+    """
+
+
 class ValidationError(DataProcessingError):
     """
     数据验证错误异常类
@@ -194,6 +219,8 @@ class ValidationError(DataProcessingError):
     - 引用完整性验证失败
     """
 
+    _ERROR_CODE = "VALIDATION_ERROR"
+
     def __init__(
         self,
         message: str,
@@ -224,14 +251,7 @@ class ValidationError(DataProcessingError):
         if field_name:
             details["field_name"] = field_name
         if field_value is not None:
-            # 序列化复杂对象，避免显示敏感信息
-            if isinstance(field_value, (dict, list)):
-                try:
-                    details["field_value"] = json.dumps(field_value, ensure_ascii=False)
-                except (TypeError, ValueError):
-                    details["field_value"] = f"[{type(field_value).__name__}]"
-            else:
-                details["field_value"] = str(field_value)
+            details["field_value"] = self._serialize_field_value(field_value)
         if validation_rule:
             details["validation_rule"] = validation_rule
         if allowed_values:
@@ -239,7 +259,7 @@ class ValidationError(DataProcessingError):
 
         super().__init__(
             message=message,
-            error_code="VALIDATION_ERROR",
+            error_code=self._ERROR_CODE,
             details=details,
             original_error=original_error
         )
@@ -250,6 +270,16 @@ class ValidationError(DataProcessingError):
         self.validation_rule = validation_rule
         self.allowed_values = allowed_values
 
+    @staticmethod
+    def _serialize_field_value(field_value: Any) -> str:
+        """序列化字段值，复杂对象转为JSON，避免显示敏感信息"""
+        if isinstance(field_value, (dict, list)):
+            try:
+                return json.dumps(field_value, ensure_ascii=False)
+            except (TypeError, ValueError):
+                return f"[{type(field_value).__name__}]"
+        return str(field_value)
+
 
 class DataImportError(DataProcessingError):
     """
@@ -269,6 +299,8 @@ class DataImportError(DataProcessingError):
     - 事务回滚错误
     """
 
+    _ERROR_CODE = "IMPORT_ERROR"
+
     def __init__(
         self,
         message: str,
@@ -306,7 +338,7 @@ class DataImportError(DataProcessingError):
 
         super().__init__(
             message=message,
-            error_code="IMPORT_ERROR",
+            error_code=self._ERROR_CODE,
             details=details,
             original_error=original_error
         )
@@ -336,6 +368,8 @@ class ConfigurationError(DataProcessingError):
     - 配置类型错误
     """
 
+    _ERROR_CODE = "CONFIG_ERROR"
+
     def __init__(
         self,
         message: str,
@@ -378,7 +412,7 @@ class ConfigurationError(DataProcessingError):
 
         super().__init__(
             message=message,
-            error_code="CONFIG_ERROR",
+            error_code=self._ERROR_CODE,
             details=details,
             original_error=original_error
         )
@@ -392,42 +426,57 @@ class ConfigurationError(DataProcessingError):
 
 
 # 错误代码常量定义
-class ErrorCodes:
-    """
-    错误代码常量定义
-
-    设计思路：
-    1. 集中管理所有错误代码
-    2. 便于程序化处理和国际化
-    3. 避免硬编码错误代码
-    4. 保持错误代码的一致性
-    """
-
-    # 解析相关错误代码
-    PARSE_JSON_ERROR = "PARSE_JSON_ERROR"
-    PARSE_INVALID_FORMAT = "PARSE_INVALID_FORMAT"
-    PARSE_FILE_NOT_FOUND = "PARSE_FILE_NOT_FOUND"
-    PARSE_ENCODING_ERROR = "PARSE_ENCODING_ERROR"
-
-    # 验证相关错误代码
-    VALIDATE_REQUIRED_FIELD = "VALIDATE_REQUIRED_FIELD"
-    VALIDATE_INVALID_TYPE = "VALIDATE_INVALID_TYPE"
-    VALIDATE_INVALID_FORMAT = "VALIDATE_INVALID_FORMAT"
-    VALIDATE_OUT_OF_RANGE = "VALIDATE_OUT_OF_RANGE"
-    VALIDATE_REFERENCE_NOT_FOUND = "VALIDATE_REFERENCE_NOT_FOUND"
-
-    # 导入相关错误代码
-    IMPORT_DATABASE_ERROR = "IMPORT_DATABASE_ERROR"
-    IMPORT_CONNECTION_FAILED = "IMPORT_CONNECTION_FAILED"
-    IMPORT_TRANSACTION_FAILED = "IMPORT_TRANSACTION_FAILED"
-    IMPORT_DUPLICATE_KEY = "IMPORT_DUPLICATE_KEY"
-    IMPORT_FOREIGN_KEY = "IMPORT_FOREIGN_KEY"
-
-    # 配置相关错误代码
-    CONFIG_FILE_NOT_FOUND = "CONFIG_FILE_NOT_FOUND"
-    CONFIG_MISSING_KEY = "CONFIG_MISSING_KEY"
-    CONFIG_INVALID_VALUE = "CONFIG_INVALID_VALUE"
-    CONFIG_TYPE_MISMATCH = "CONFIG_TYPE_MISMATCH"
+# 设计思路：
+# 1. 集中管理所有错误代码，避免硬编码
+# 2. 模块级常量直接走全局查找，无需类属性查找
+
+# 解析相关错误代码
+PARSE_JSON_ERROR: Final[str] = "PARSE_JSON_ERROR"
+PARSE_INVALID_FORMAT: Final[str] = "PARSE_INVALID_FORMAT"
+PARSE_FILE_NOT_FOUND: Final[str] = "PARSE_FILE_NOT_FOUND"
+PARSE_ENCODING_ERROR: Final[str] = "PARSE_ENCODING_ERROR"
+
+# 验证相关错误代码
+VALIDATE_REQUIRED_FIELD: Final[str] = "VALIDATE_REQUIRED_FIELD"
+VALIDATE_INVALID_TYPE: Final[str] = "VALIDATE_INVALID_TYPE"
+VALIDATE_INVALID_FORMAT: Final[str] = "VALIDATE_INVALID_FORMAT"
+VALIDATE_OUT_OF_RANGE: Final[str] = "VALIDATE_OUT_OF_RANGE"
+VALIDATE_REFERENCE_NOT_FOUND: Final[str] = "VALIDATE_REFERENCE_NOT_FOUND"
+
+# 导入相关错误代码
+IMPORT_DATABASE_ERROR: Final[str] = "IMPORT_DATABASE_ERROR"
+IMPORT_CONNECTION_FAILED: Final[str] = "IMPORT_CONNECTION_FAILED"
+IMPORT_TRANSACTION_FAILED: Final[str] = "IMPORT_TRANSACTION_FAILED"
+IMPORT_DUPLICATE_KEY: Final[str] = "IMPORT_DUPLICATE_KEY"
+IMPORT_FOREIGN_KEY: Final[str] = "IMPORT_FOREIGN_KEY"
+
+# 配置相关错误代码
+CONFIG_FILE_NOT_FOUND: Final[str] = "CONFIG_FILE_NOT_FOUND"
+CONFIG_MISSING_KEY: Final[str] = "CONFIG_MISSING_KEY"
+CONFIG_INVALID_VALUE: Final[str] = "CONFIG_INVALID_VALUE"
+CONFIG_TYPE_MISMATCH: Final[str] = "CONFIG_TYPE_MISMATCH"
+
+# 兼容旧代码的点号访问方式（ErrorCodes.PARSE_JSON_ERROR）
+ErrorCodes = SimpleNamespace(
+    PARSE_JSON_ERROR=PARSE_JSON_ERROR,
+    PARSE_INVALID_FORMAT=PARSE_INVALID_FORMAT,
+    PARSE_FILE_NOT_FOUND=PARSE_FILE_NOT_FOUND,
+    PARSE_ENCODING_ERROR=PARSE_ENCODING_ERROR,
+    VALIDATE_REQUIRED_FIELD=VALIDATE_REQUIRED_FIELD,
+    VALIDATE_INVALID_TYPE=VALIDATE_INVALID_TYPE,
+    VALIDATE_INVALID_FORMAT=VALIDATE_INVALID_FORMAT,
+    VALIDATE_OUT_OF_RANGE=VALIDATE_OUT_OF_RANGE,
+    VALIDATE_REFERENCE_NOT_FOUND=VALIDATE_REFERENCE_NOT_FOUND,
+    IMPORT_DATABASE_ERROR=IMPORT_DATABASE_ERROR,
+    IMPORT_CONNECTION_FAILED=IMPORT_CONNECTION_FAILED,
+    IMPORT_TRANSACTION_FAILED=IMPORT_TRANSACTION_FAILED,
+    IMPORT_DUPLICATE_KEY=IMPORT_DUPLICATE_KEY,
+    IMPORT_FOREIGN_KEY=IMPORT_FOREIGN_KEY,
+    CONFIG_FILE_NOT_FOUND=CONFIG_FILE_NOT_FOUND,
+    CONFIG_MISSING_KEY=CONFIG_MISSING_KEY,
+    CONFIG_INVALID_VALUE=CONFIG_INVALID_VALUE,
+    CONFIG_TYPE_MISMATCH=CONFIG_TYPE_MISMATCH,
+)
 
 
 # 异常工厂函数，提供便捷的异常创建方法
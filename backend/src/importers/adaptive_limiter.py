@@ -0,0 +1,114 @@
+"""
+adaptive_limiter.py - 自适应解析并发限制
+
+设计思路：
+1. 解析任务在解析每个文件前获取一个名额，名额上限在运行中调整
+2. 每完成sample_interval个文件采样一次吞吐量和下游队列深度
+3. 下游队列接近饱和时降低上限，队列未增长且吞吐量上升时提高上限
+4. 上限在[minimum, maximum]之间按step增减
+
+为什么需要自适应：
+- 固定并发数无法同时适应不同的存储：本地SSD上小文件解析受CPU限制，
+  并发过低浪费吞吐；网络文件系统上并发过高只会让请求排队
+- 导入跟不上解析时，继续提高解析并发只会把结果堆在队列里
+
+使用示例：
+>>> limiter = AdaptiveLimiter(initial=10, maximum=256, backlog=queue.qsize, capacity=queue.maxsize)
+>>> async with limiter:
+>>>     result = await parser.parse_file(path)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+
+class AdaptiveLimiter:
+    """
+    按吞吐量和下游队列深度调整上限的异步并发限制器
+
+    设计考虑：
+    1. 只在事件循环中使用，计数无需加锁，等待名额使用asyncio.Condition
+    2. 下游队列深度通过回调获取，限制器不依赖具体的队列类型
+    3. capacity不大于0表示下游队列无界，此时不会因队列饱和而降低上限
+    """
+
+    # 下游队列深度达到容量的该比例时视为饱和
+    SATURATION_RATIO = 0.9
+
+    def __init__(
+        self,
+        initial: int = 10,
+        maximum: int = 256,
+        minimum: int = 1,
+        step: int = 4,
+        sample_interval: int = 100,
+        backlog: Callable[[], int] = lambda: 0,
+        capacity: int = 0
+    ):
+        """
+        初始化限制器
+
+        参数说明：
+        - initial: 初始并发上限
+        - maximum/minimum: 上限的调整范围
+        - step: 每次调整的幅度
+        - sample_interval: 每完成多少个任务采样一次
+        - backlog: 返回下游队列当前深度的回调
+        - capacity: 下游队列容量
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.step = step
+        self.sample_interval = sample_interval
+        self.backlog = backlog
+        self.capacity = capacity
+        self.logger = logging.getLogger(__name__)
+
+        self._active = 0
+        self._condition = asyncio.Condition()
+        self._completed_since_sample = 0
+        self._sample_start_ns = time.perf_counter_ns()
+        self._last_throughput = 0.0
+        self._last_backlog = 0
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._condition:
+            self._active -= 1
+            self._completed_since_sample += 1
+            if self._completed_since_sample >= self.sample_interval:
+                self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self) -> None:
+        """根据本次采样窗口的吞吐量和队列深度调整上限"""
+        now_ns = time.perf_counter_ns()
+        elapsed = (now_ns - self._sample_start_ns) / 1e9
+        throughput = self._completed_since_sample / elapsed if elapsed > 0 else 0.0
+        backlog = self.backlog()
+
+        previous_limit = self.limit
+        if self.capacity > 0 and backlog >= self.capacity * self.SATURATION_RATIO:
+            # 下游已经跟不上，提高解析并发没有意义
+            self.limit = max(self.minimum, self.limit - self.step)
+        elif backlog <= self._last_backlog and throughput > self._last_throughput:
+            self.limit = min(self.maximum, self.limit + self.step)
+
+        if self.limit != previous_limit:
+            self.logger.debug(
+                "解析并发上限调整: %d -> %d (吞吐量%.1f/秒, 队列深度%d)",
+                previous_limit, self.limit, throughput, backlog
+            )
+
+        self._completed_since_sample = 0
+        self._sample_start_ns = now_ns
+        self._last_throughput = throughput
+        self._last_backlog = backlog
@@ -23,14 +23,18 @@ batch_importer.py - 批量数据导入器
 import asyncio
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Tuple, AsyncGenerator
+import time
+from contextlib import nullcontext
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple, AsyncGenerator, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from sqlalchemy import select, insert, update, delete, text
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+from sqlalchemy import select, insert, update, delete, text, func, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from src.database.models import (
@@ -45,6 +49,32 @@ from src.exceptions.data_exceptions import (
 )
 
 
+# 生成hash_id的摘要字节数（十六进制后为40字符，对应hash_id列的String(40)）
+HASH_ID_DIGEST_SIZE = 20
+
+# 预先初始化的空哈希对象，生成hash_id时copy()后再update，省去每次构造和参数初始化
+_HASH_ID_HASHER = hashlib.blake2b(digest_size=HASH_ID_DIGEST_SIZE)
+
+# 每个错误列表最多保留的条数，超出后只追加一条省略提示，避免大量失败时列表无限增长
+MAX_COLLECTED_ERRORS = 100
+
+# 合法的status取值，frozenset使成员检查为O(1)哈希查找
+_VALID_STATUSES = frozenset({'ok', 'error', 'pending', 'generated', 'failed'})
+
+
+def _append_capped(messages: List[str], message_format: str, *args: Any) -> None:
+    """
+    向错误列表追加消息，超过MAX_COLLECTED_ERRORS后不再追加
+
+    消息与logging一样按需格式化，被丢弃的消息不会构造字符串
+    """
+    count = len(messages)
+    if count < MAX_COLLECTED_ERRORS:
+        messages.append(message_format % args if args else message_format)
+    elif count == MAX_COLLECTED_ERRORS:
+        messages.append("... 更多错误已省略")
+
+
 @dataclass
 class ImportResult:
     """
@@ -124,9 +154,9 @@ class ImportResult:
             return 0.0
         return (self.successful_imports / effective_total) * 100
 
-    def add_error(self, error_msg: str) -> None:
-        """添加错误信息"""
-        self.errors.append(error_msg)
+    def add_error(self, error_msg: str, *args: Any) -> None:
+        """添加错误信息（最多保留MAX_COLLECTED_ERRORS条）"""
+        _append_capped(self.errors, error_msg, *args)
 
     def add_warning(self, warning_msg: str) -> None:
         """添加警告信息"""
@@ -157,13 +187,40 @@ class BatchImporter:
     4. 并行处理，提高导入速度
     """
 
+    # 函数记录的唯一键，与schema_postgres.sql中的unique_function约束一致
+    FUNCTION_UNIQUE_KEY = ('hash_id', 'alias')
+
+    # 支持ON CONFLICT DO NOTHING的方言及其INSERT构造函数
+    UPSERT_INSERTS = {
+        'postgresql': pg_insert,
+        'sqlite': sqlite_insert,
+    }
+
+    # 已落入独立列或关联表的manifest字段，写入manifest_json前剔除
+    MANIFEST_STORED_FIELDS = frozenset({
+        'alias', 'hash_id', 'summary', 'generated_cpp', 'cpp_filepath',
+        'status', 'tries', 'root_function', 'attck', 'children_aliases',
+    })
+
+    # 映射表行数达到该阈值且驱动为asyncpg时，使用COPY代替INSERT
+    COPY_THRESHOLD = 100
+
+    # COPY时的列顺序
+    ATTACK_MAPPING_COLUMNS = ('function_id', 'technique_id', 'created_at')
+    CHILD_MAPPING_COLUMNS = (
+        'parent_function_id', 'child_function_name', 'child_alias',
+        'child_description', 'created_at'
+    )
+
     def __init__(
         self,
         session_factory: async_sessionmaker[AsyncSession],
         batch_size: int = 1000,
         max_retries: int = 3,
         retry_delay: float = 1.0,
-        enable_progress_tracking: bool = True
+        enable_progress_tracking: bool = True,
+        max_concurrent_batches: Optional[int] = None,
+        use_copy: bool = True
     ):
         """
         初始化批量导入器
@@ -174,12 +231,15 @@ class BatchImporter:
         - max_retries: 最大重试次数
         - retry_delay: 重试延迟时间（秒）
         - enable_progress_tracking: 是否启用进度跟踪
+        - max_concurrent_batches: 同时导入的最大批次数，默认根据连接池大小推算
+        - use_copy: PostgreSQL(asyncpg)下映射表行数达到COPY_THRESHOLD时是否使用COPY写入
 
         设计考虑：
         1. batch_size: 平衡内存使用和性能，1000是经过测试的平衡点
         2. max_retries: 处理临时性数据库问题
         3. retry_delay: 指数退避策略，避免过度重试
         4. progress_tracking: 便于监控大规模导入过程
+        5. max_concurrent_batches: 每个批次使用独立会话，并发数不超过连接池的一半，避免耗尽连接
 
         性能考虑：
         1. 批量大小影响数据库性能
@@ -191,7 +251,10 @@ class BatchImporter:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.enable_progress_tracking = enable_progress_tracking
+        self.use_copy = use_copy
         self.logger = logging.getLogger(__name__)
+        self.max_concurrent_batches = max_concurrent_batches or self._default_batch_concurrency()
+        self._check_engine_batching()
 
         # 导入统计信息
         self.stats = {
@@ -202,10 +265,59 @@ class BatchImporter:
             'total_time': 0.0,
             'average_time_per_batch': 0.0
         }
+        # 含派生指标的只读统计视图，统计变化后才重新计算
+        self._stats_view: Mapping[str, Any] = MappingProxyType({})
+        self._stats_dirty = True
 
         # 进度回调函数
         self.progress_callback: Optional[callable] = None
 
+        # 未启用进度跟踪时直接绑定空函数，调用处无需再做任何判断
+        if not enable_progress_tracking:
+            self._report_progress = lambda *args, **kwargs: None
+
+    def _default_batch_concurrency(self) -> int:
+        """
+        根据会话工厂绑定的引擎推算默认的批次并发数
+
+        规则：
+        1. SQLite同一时刻只允许一个写事务，并发写入只会互相等待锁，固定为1
+        2. 其他数据库使用连接池大小的一半，给API请求等其他使用者留出连接
+        3. 无法获取连接池大小时退回串行
+        """
+        engine = self.session_factory.kw.get('bind')
+        if engine is None or engine.dialect.name == 'sqlite':
+            return 1
+
+        pool_size = getattr(engine.pool, 'size', None)
+        if not callable(pool_size):
+            return 1
+        return max(1, pool_size() // 2)
+
+    def _check_engine_batching(self) -> None:
+        """
+        检查会话工厂绑定的引擎是否配置了多值批量INSERT
+
+        _insert_functions依赖insertmanyvalues把一次executemany改写为多值INSERT；
+        若每页行数小于batch_size，一个批次会被拆成多条语句，
+        方言不支持时则退化为逐行执行，均只记录警告而不阻止导入
+        """
+        engine = self.session_factory.kw.get('bind')
+        if engine is None:
+            return
+
+        dialect = engine.dialect
+        if not dialect.use_insertmanyvalues:
+            self.logger.warning(
+                "数据库方言%s不支持insertmanyvalues，批量插入将逐行执行", dialect.name
+            )
+        elif dialect.insertmanyvalues_page_size < self.batch_size:
+            self.logger.warning(
+                "引擎insertmanyvalues_page_size(%d)小于batch_size(%d)，每个批次将拆分为多条INSERT，"
+                "建议在create_async_engine中调大该参数",
+                dialect.insertmanyvalues_page_size, self.batch_size
+            )
+
     def set_progress_callback(self, callback: callable) -> None:
         """
         设置进度回调函数
@@ -234,7 +346,7 @@ class BatchImporter:
         2. 便于监控系统状态
         3. 调试和问题诊断
         """
-        if self.progress_callback and self.enable_progress_tracking:
+        if self.progress_callback:
             self.progress_callback(current, total, message)
 
     async def import_manifest_data(
@@ -270,67 +382,141 @@ class BatchImporter:
         3. 支持断点续传
         4. 数据一致性保证
         """
-        start_time = datetime.now()
-        result = ImportResult(total_records=len(manifest_results))
-        result.start_time = start_time
-
-        self.logger.info(f"开始批量导入，共{len(manifest_results)}条记录")
-
-        # 步骤1: 预处理和过滤
-        self.logger.info("步骤1: 数据预处理和验证")
-        valid_results = await self._preprocess_manifest_data(manifest_results, result)
-
-        if not valid_results:
-            self.logger.warning("没有有效的数据需要导入")
-            result.end_time = datetime.now()
-            result.processing_time = (result.end_time - start_time).total_seconds()
-            return result
-
-        # 步骤2: 检查重复数据
-        self.logger.info("步骤2: 检查重复数据")
-        await self._check_duplicate_data(valid_results, result)
-
-        # 步骤3: 分批导入
-        self.logger.info("步骤3: 开始分批导入")
-        successful_imports = 0
-        failed_imports = 0
+        records = []
+        invalid_summaries = []
+        for parse_result in manifest_results:
+            if parse_result.is_valid:
+                records.append(parse_result.data)
+            else:
+                invalid_summaries.append(parse_result.get_error_summary())
 
-        total_batches = (len(valid_results) + self.batch_size - 1) // self.batch_size
+        return await self.import_records(records, invalid_summaries)
 
-        for batch_idx, batch_start in enumerate(range(0, len(valid_results), self.batch_size)):
-            batch_end = min(batch_start + self.batch_size, len(valid_results))
-            batch_results = valid_results[batch_start:batch_end]
+    async def import_records(
+        self,
+        records: List[Dict[str, Any]],
+        invalid_summaries: Sequence[str] = (),
+        connection: Optional[AsyncConnection] = None
+    ) -> ImportResult:
+        """
+        批量导入已解析的manifest数据
 
-            self.logger.info(f"处理批次 {batch_idx + 1}/{total_batches} ({len(batch_results)}条记录)")
+        参数说明：
+        - records: 解析成功的manifest数据（ManifestParseResult.data）
+        - invalid_summaries: 调用方已过滤掉的无效解析结果的错误摘要，计入跳过数
+        - connection: 调用方预先取出的连接，提供时所有批次在该连接上串行执行，
+          本次调用结束时提交，连接本身由调用方负责关闭
 
-            # 报告进度
-            self._report_progress(batch_start, len(valid_results), f"处理批次 {batch_idx + 1}")
+        返回值：
+        - ImportResult: 包含导入统计和错误信息
 
-            try:
-                # 导入当前批次
-                batch_success, batch_errors = await self._import_batch_with_retry(
-                    batch_results, batch_idx + 1
-                )
+        为什么直接接收数据字典：
+        1. 调用方解析完成后即可丢弃ManifestParseResult，只保留导入需要的数据
+        2. 导入阶段不必再遍历一次结果列表过滤无效数据
+        """
+        # 耗时使用单调时钟计算，datetime只用于记录起止时间
+        start_ns = time.perf_counter_ns()
+        start_time = datetime.now()
+        result = ImportResult(total_records=len(records) + len(invalid_summaries))
+        result.start_time = start_time
+        result.skipped_imports = len(invalid_summaries)
+        for summary in invalid_summaries:
+            result.add_error("跳过无效数据: %s", summary)
+
+        self.logger.info(f"开始批量导入，共{result.total_records}条记录")
+
+        # 步骤1: 流式预处理并分批导入
+        # 预处理以生成器形式逐批产出有效数据，插入与预处理交替进行，内存占用只与批次大小相关
+        # 多个批次通过连接池并发导入，信号量限制同时进行的批次数
+        # 重复数据由数据库在插入时通过ON CONFLICT过滤
+        self.logger.info(f"步骤1: 数据预处理、验证并分批导入 (并发批次数: {self.max_concurrent_batches})")
+
+        # 串行导入时所有批次共用一个会话和事务，每个批次使用SAVEPOINT隔离，
+        # 省去每批次获取连接和BEGIN/COMMIT的开销；并发导入时每个批次需要独立连接
+        # 调用方提供连接时会话绑定到该连接，多次调用之间也不再从连接池取还连接
+        if connection is not None:
+            session_context = self.session_factory(bind=connection)
+            concurrency = 1
+        elif self.max_concurrent_batches == 1:
+            session_context = self.session_factory()
+            concurrency = 1
+        else:
+            session_context = nullcontext()
+            concurrency = self.max_concurrent_batches
+
+        async with session_context as shared_session:
+            semaphore = asyncio.Semaphore(concurrency)
+            batch_tasks = []
+            batch_sizes = []
+            dispatched = 0
+
+            async for batch_rows in self._prepare_batches(records, result):
+                batch_number = len(batch_tasks) + 1
+                self.logger.info(f"处理批次 {batch_number} ({len(batch_rows)}条记录)")
+
+                # 报告进度
+                self._report_progress(dispatched, result.total_records, f"处理批次 {batch_number}")
+                dispatched += len(batch_rows)
+
+                # 先获取信号量再创建任务，达到并发上限时暂停预处理，避免积压过多批次
+                await semaphore.acquire()
+                batch_tasks.append(asyncio.create_task(
+                    self._run_batch(batch_rows, batch_number, semaphore, shared_session)
+                ))
+                batch_sizes.append(len(batch_rows))
+
+            if not batch_tasks:
+                self.logger.warning("没有有效的数据需要导入")
+                result.end_time = datetime.now()
+                result.processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+                return result
+
+            successful_imports = 0
+            failed_imports = 0
+            duplicate_imports = 0
+
+            batch_outcomes = await asyncio.gather(*batch_tasks, return_exceptions=True)
+            for batch_number, (batch_size, outcome) in enumerate(zip(batch_sizes, batch_outcomes), start=1):
+                if isinstance(outcome, BaseException):
+                    # 批次处理失败，记录错误但不影响其他批次
+                    error_msg = f"批次{batch_number}处理失败: {str(outcome)}"
+                    result.add_error(error_msg)
+                    failed_imports += batch_size
+                    self.logger.error(error_msg, exc_info=outcome)
+                    continue
+
+                batch_success, batch_duplicates, batch_errors = outcome
+                batch_failed = batch_size - batch_success - batch_duplicates
                 successful_imports += batch_success
-                failed_imports += len(batch_results) - batch_success
+                duplicate_imports += batch_duplicates
+                failed_imports += batch_failed
 
                 # 添加错误信息
-                result.errors.extend(batch_errors)
-
-                self.logger.info(f"批次 {batch_idx + 1} 完成: 成功{batch_success}, 失败{len(batch_results) - batch_success}")
+                for error_msg in batch_errors:
+                    result.add_error(error_msg)
 
-            except Exception as e:
-                # 批次处理失败，记录错误但继续处理下一批次
-                error_msg = f"批次{batch_idx + 1}处理失败: {str(e)}"
-                result.add_error(error_msg)
-                failed_imports += len(batch_results)
-                self.logger.error(error_msg, exc_info=True)
+                self.logger.info(
+                    f"批次 {batch_number} 完成: 成功{batch_success}, 重复{batch_duplicates}, 失败{batch_failed}"
+                )
 
-        # 步骤4: 更新统计和结果
+            # 共享会话中各批次只释放了SAVEPOINT，此处统一提交
+            if shared_session is not None:
+                try:
+                    await shared_session.commit()
+                except SQLAlchemyError as e:
+                    await shared_session.rollback()
+                    error_msg = f"提交导入事务失败: {str(e)}"
+                    result.add_error(error_msg)
+                    self.logger.error(error_msg, exc_info=True)
+                    failed_imports += successful_imports
+                    successful_imports = 0
+
+        # 步骤2: 更新统计和结果（预处理阶段转换失败的记录已计入failed_imports）
         result.successful_imports = successful_imports
-        result.failed_imports = failed_imports
+        result.failed_imports += failed_imports
+        result.duplicate_imports = duplicate_imports
         result.end_time = datetime.now()
-        result.processing_time = (result.end_time - start_time).total_seconds()
+        result.processing_time = (time.perf_counter_ns() - start_ns) / 1e9
 
         # 更新全局统计
         self._update_global_statistics(result)
@@ -338,61 +524,78 @@ class BatchImporter:
         self.logger.info(f"批量导入完成: {result.get_summary()}")
         return result
 
-    async def _preprocess_manifest_data(
+    async def _prepare_batches(
         self,
-        manifest_results: List[ManifestParseResult],
+        records: List[Dict[str, Any]],
         result: ImportResult
-    ) -> List[ManifestParseResult]:
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
         """
-        预处理manifest数据
+        预处理manifest数据，验证并转换后按批次产出可直接插入的数据
 
         参数说明：
-        - manifest_results: 原始解析结果列表
+        - records: 解析成功的manifest数据列表
         - result: 导入结果对象
 
-        返回值：
-        - List[ManifestParseResult]: 过滤后的有效解析结果
+        产出值：
+        - List[Dict[str, Any]]: 最多batch_size条_convert_to_model_data的转换结果
 
         预处理内容：
-        1. 过滤无效的解析结果
-        2. 数据完整性检查
-        3. 必需字段验证
-        4. 数据标准化
-
-        为什么需要预处理：
-        1. 提前发现问题，避免数据库错误
-        2. 提高导入效率
-        3. 统一数据格式
-        4. 详细的问题报告
-        """
-        valid_results = []
+        1. 数据完整性检查
+        2. 必需字段验证
+        3. 转换为各表的插入数据
+
+        为什么使用生成器：
+        1. 不必先构建完整的有效数据列表，内存占用只与批次大小相关
+        2. 第一批数据验证完即可开始插入，不必等待全部预处理完成
+
+        为什么验证和转换在同一次遍历中完成：
+        1. 每条记录只遍历一次，验证和转换读取的是同一个字典，访问局部性更好
+        2. 批次重试时直接复用已转换的数据，无需重新转换
+        """
+        batch = []
+        valid_count = 0
         skipped_count = 0
+        failed_count = 0
+        total = len(records)
+        now = None
 
-        for i, parse_result in enumerate(manifest_results):
-            # 报告预处理进度
-            if i % 100 == 0:
-                self._report_progress(i, len(manifest_results), "预处理数据")
+        for i, data in enumerate(records):
+            # 报告预处理进度（每128条一次，位与代替取模）
+            if (i & 127) == 0:
+                self._report_progress(i, total, "预处理数据")
 
-            # 检查解析结果有效性
-            if not parse_result.is_valid:
-                error_msg = f"跳过无效数据: {parse_result.get_error_summary()}"
-                result.add_error(error_msg)
+            # 检查数据完整性
+            if not self._validate_manifest_data(data, result):
                 skipped_count += 1
                 continue
 
-            # 检查数据完整性
-            if not await self._validate_manifest_data(parse_result.data, result):
-                skipped_count += 1
+            # 转换为数据库模型数据（同一批次共用一个时间戳）
+            if not batch:
+                now = datetime.utcnow()
+            try:
+                model_data = self._convert_to_model_data(data, now)
+            except Exception as e:
+                alias = data.get('alias', 'unknown')
+                result.add_error("数据转换失败 (%s): %s", alias, e)
+                self.logger.warning("数据转换失败 (%s): %s", alias, e)
+                failed_count += 1
                 continue
 
-            valid_results.append(parse_result)
+            batch.append(model_data)
+            valid_count += 1
+
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
 
-        result.skipped_imports = skipped_count
-        self.logger.info(f"预处理完成: 有效数据{len(valid_results)}条, 跳过{skipped_count}条")
+        if batch:
+            yield batch
 
-        return valid_results
+        result.skipped_imports += skipped_count
+        result.failed_imports = failed_count
+        self.logger.info(f"预处理完成: 有效数据{valid_count}条, 跳过{skipped_count}条, 转换失败{failed_count}条")
 
-    async def _validate_manifest_data(
+    def _validate_manifest_data(
         self,
         data: Dict[str, Any],
         result: ImportResult
@@ -419,109 +622,57 @@ class BatchImporter:
         3. 提供详细的错误信息
         4. 提高导入成功率
         """
+        alias = data.get('alias')
+        status = data.get('status')
+
         # 检查必需字段
-        required_fields = ['alias', 'status']
-        for field in required_fields:
-            if not data.get(field):
-                result.add_error(f"缺少必需字段: {field}")
-                return False
+        if not alias:
+            result.add_error("缺少必需字段: alias")
+            return False
+        if not status:
+            result.add_error("缺少必需字段: status")
+            return False
 
         # 检查alias长度
-        alias = data.get('alias', '')
         if len(alias) > 255:
             result.add_error(f"alias字段过长: {len(alias)} > 255")
             return False
 
         # 检查status值
-        valid_statuses = ['ok', 'error', 'pending', 'generated', 'failed']
-        status = data.get('status', '')
-        if status not in valid_statuses:
+        if status not in _VALID_STATUSES:
             result.add_warning(f"未知的status值: {status}")
 
         return True
 
-    async def _check_duplicate_data(
+    async def _run_batch(
         self,
-        manifest_results: List[ManifestParseResult],
-        result: ImportResult
-    ) -> None:
-        """
-        检查重复数据
-
-        参数说明：
-        - manifest_results: 解析结果列表
-        - result: 导入结果对象
-
-        检查策略：
-        1. 基于hash_id去重
-        2. 基于alias去重
-        3. 数据库查询验证
-        4. 用户提供决策
-
-        为什么需要检查重复：
-        1. 避免数据重复
-        2. 提高导入效率
-        3. 维护数据唯一性
-        4. 用户友好提示
-        """
-        if not manifest_results:
-            return
-
-        async with self.session_factory() as session:
-            try:
-                # 收集所有alias和hash_id
-                aliases = [r.data.get('alias', '') for r in manifest_results if r.data.get('alias')]
-                hash_ids = [r.data.get('hash_id', '') for r in manifest_results if r.data.get('hash_id')]
-
-                duplicate_count = 0
-
-                # 检查alias重复
-                if aliases:
-                    query = select(MalAPIFunction.alias).where(
-                        MalAPIFunction.alias.in_(aliases)
-                    )
-                    existing_aliases = await session.execute(query)
-                    existing_aliases = [row[0] for row in existing_aliases.fetchall()]
-
-                    for alias in existing_aliases:
-                        result.add_warning(f"alias已存在: {alias}")
-                        duplicate_count += 1
-
-                # 检查hash_id重复
-                if hash_ids:
-                    query = select(MalAPIFunction.hash_id).where(
-                        MalAPIFunction.hash_id.in_(hash_ids)
-                    )
-                    existing_hash_ids = await session.execute(query)
-                    existing_hash_ids = [row[0] for row in existing_hash_ids.fetchall()]
-
-                    for hash_id in existing_hash_ids:
-                        result.add_warning(f"hash_id已存在: {hash_id}")
-                        duplicate_count += 1
-
-                result.duplicate_imports = duplicate_count
-
-                if duplicate_count > 0:
-                    self.logger.warning(f"发现 {duplicate_count} 条重复数据")
-
-            except SQLAlchemyError as e:
-                result.add_error(f"检查重复数据失败: {str(e)}")
-                self.logger.error(f"检查重复数据失败: {e}")
+        batch_rows: List[Dict[str, Any]],
+        batch_number: int,
+        semaphore: asyncio.Semaphore,
+        session: Optional[AsyncSession] = None
+    ) -> Tuple[int, int, List[str]]:
+        """执行单个批次的导入，完成后释放并发名额"""
+        try:
+            return await self._import_batch_with_retry(batch_rows, batch_number, session)
+        finally:
+            semaphore.release()
 
     async def _import_batch_with_retry(
         self,
-        batch_results: List[ManifestParseResult],
-        batch_number: int
-    ) -> Tuple[int, List[str]]:
+        batch_rows: List[Dict[str, Any]],
+        batch_number: int,
+        session: Optional[AsyncSession] = None
+    ) -> Tuple[int, int, List[str]]:
         """
         带重试机制的批次导入
 
         参数说明：
-        - batch_results: 当前批次的解析结果
+        - batch_rows: 当前批次已转换的模型数据
         - batch_number: 批次编号
+        - session: 共享会话，为None时每次尝试使用独立会话
 
         返回值：
-        - Tuple[int, List[str]]: (成功数量, 错误列表)
+        - Tuple[int, int, List[str]]: (成功数量, 重复数量, 错误列表)
 
         重试策略：
         1. 指数退避延迟
@@ -542,60 +693,60 @@ class BatchImporter:
             try:
                 if attempt > 0:
                     delay = self.retry_delay * (2 ** (attempt - 1))
-                    self.logger.warning(f"批次{batch_number}重试第{attempt}次，延迟{delay}秒")
+                    self.logger.warning("批次%d重试第%d次，延迟%s秒", batch_number, attempt, delay)
                     await asyncio.sleep(delay)
 
-                success_count, attempt_errors = await self._import_batch(batch_results)
+                success_count, duplicate_count, attempt_errors = await self._import_batch(batch_rows, session)
 
-                if attempt_errors:
-                    errors.extend(attempt_errors)
+                for error_msg in attempt_errors:
+                    _append_capped(errors, error_msg)
 
-                return success_count, errors
+                return success_count, duplicate_count, errors
 
             except (SQLAlchemyError, IntegrityError) as e:
                 last_exception = e
-                error_msg = f"批次{batch_number}数据库错误 (尝试{attempt + 1}): {str(e)}"
-                errors.append(error_msg)
-                self.logger.warning(error_msg)
+                _append_capped(errors, "批次%d数据库错误 (尝试%d): %s", batch_number, attempt + 1, e)
+                self.logger.warning("批次%d数据库错误 (尝试%d): %s", batch_number, attempt + 1, e)
 
                 # 某些错误不应该重试
                 if "unique constraint" in str(e).lower() or "foreign key" in str(e).lower():
-                    self.logger.error(f"批次{batch_number}遇到约束错误，停止重试")
+                    self.logger.error("批次%d遇到约束错误，停止重试", batch_number)
                     break
 
             except Exception as e:
                 last_exception = e
-                error_msg = f"批次{batch_number}未知错误 (尝试{attempt + 1}): {str(e)}"
-                errors.append(error_msg)
-                self.logger.error(error_msg)
+                _append_capped(errors, "批次%d未知错误 (尝试%d): %s", batch_number, attempt + 1, e)
+                self.logger.error("批次%d未知错误 (尝试%d): %s", batch_number, attempt + 1, e)
 
                 # 非数据库错误通常不需要重试
                 break
 
         # 所有重试都失败了
         if last_exception:
-            error_msg = f"批次{batch_number}重试失败: {str(last_exception)}"
-            errors.append(error_msg)
-            self.logger.error(error_msg)
+            _append_capped(errors, "批次%d重试失败: %s", batch_number, last_exception)
+            self.logger.error("批次%d重试失败: %s", batch_number, last_exception)
 
-        return 0, errors
+        return 0, 0, errors
 
     async def _import_batch(
         self,
-        batch_results: List[ManifestParseResult]
-    ) -> Tuple[int, List[str]]:
+        batch_rows: List[Dict[str, Any]],
+        session: Optional[AsyncSession] = None
+    ) -> Tuple[int, int, List[str]]:
         """
         导入单个批次的数据
 
         参数说明：
-        - batch_results: 当前批次的解析结果
+        - batch_rows: 当前批次已转换的模型数据（_convert_to_model_data的返回值）
+        - session: 整个导入过程共用的会话；为None时为本批次单独创建会话和事务，
+          否则本批次在SAVEPOINT中执行，失败只回滚本批次
 
         返回值：
-        - Tuple[int, List[str]]: (成功数量, 错误列表)
+        - Tuple[int, int, List[str]]: (成功数量, 重复数量, 错误列表)
 
         处理步骤：
         1. 创建数据库会话
-        2. 转换数据为模型对象
+        2. 拆分主表和映射表数据
         3. 执行批量插入
         4. 提交事务
         5. 处理异常和回滚
@@ -614,98 +765,53 @@ class BatchImporter:
         """
         errors = []
         successful_count = 0
+        duplicate_count = 0
 
-        async with self.session_factory() as session:
+        owns_session = session is None
+        async with (self.session_factory() if owns_session else nullcontext(session)) as session:
+            # 开始事务：独立会话使用完整事务，共享会话使用SAVEPOINT
+            transaction = await (session.begin() if owns_session else session.begin_nested())
             try:
-                # 开始事务
-                await session.begin()
-
-                # 准备批量插入数据
-                function_data_list = []
-                attack_mapping_data_list = []
-                child_mapping_data_list = []
-
-                # 转换解析结果为数据库模型数据
-                for parse_result in batch_results:
-                    try:
-                        model_data = await self._convert_to_model_data(parse_result.data)
-                        function_data_list.append(model_data['function'])
-                        # 保持索引关系，以便后续正确设置外键
-                        attack_mapping_data_list.append({
-                            'function_index': len(function_data_list) - 1,
-                            'mappings': model_data['attack_mappings']
-                        })
-                        child_mapping_data_list.append({
-                            'function_index': len(function_data_list) - 1,
-                            'mappings': model_data['child_mappings']
-                        })
-
-                    except Exception as e:
-                        error_msg = f"数据转换失败 ({parse_result.data.get('alias', 'unknown')}): {str(e)}"
-                        errors.append(error_msg)
-                        self.logger.warning(error_msg)
-                        continue
-
-                # 逐条插入主表并获取ID（SQLite兼容方案）
+                # 准备批量插入数据：主表行与各条输入的映射行按位置一一对应
+                function_data_list = [row['function'] for row in batch_rows]
+                attack_rows_per_input = [row['attack_mappings'] for row in batch_rows]
+                child_rows_per_input = [row['child_mappings'] for row in batch_rows]
+
+                # 批量插入主表，重复记录由ON CONFLICT跳过，RETURNING一次取回所有新ID
                 function_ids = []
                 if function_data_list:
-                    for function_data in function_data_list:
-                        try:
-                            # 创建ORM对象实例
-                            function_obj = MalAPIFunction(**function_data)
-                            session.add(function_obj)
-                            await session.flush()  # 获取生成的ID但不提交
-                            function_ids.append(function_obj.id)
-                            successful_count += 1
-                        except Exception as e:
-                            # 单条记录失败，继续处理下一条
-                            error_msg = f"插入函数失败 ({function_data.get('alias', 'unknown')}): {str(e)}"
-                            errors.append(error_msg)
-                            self.logger.warning(error_msg)
-                            continue
-
-                # 准备最终的ATT&CK映射数据（设置正确的function_id）
-                final_attack_mappings = []
-                for attack_group in attack_mapping_data_list:
-                    function_index = attack_group['function_index']
-                    if function_index < len(function_ids):
-                        function_id = function_ids[function_index]
-                        for mapping in attack_group['mappings']:
-                            mapping['function_id'] = function_id
-                            final_attack_mappings.append(mapping)
-
-                # 准备最终的子函数映射数据（设置正确的parent_function_id）
-                final_child_mappings = []
-                for child_group in child_mapping_data_list:
-                    function_index = child_group['function_index']
-                    if function_index < len(function_ids):
-                        function_id = function_ids[function_index]
-                        for mapping in child_group['mappings']:
-                            mapping['parent_function_id'] = function_id
-                            final_child_mappings.append(mapping)
-
-                # 批量插入ATT&CK映射表
-                if final_attack_mappings:
-                    await session.execute(
-                        insert(AttCKMapping),
-                        final_attack_mappings
-                    )
-
-                # 批量插入子函数映射表
-                if final_child_mappings:
-                    await session.execute(
-                        insert(FunctionChild),
-                        final_child_mappings
+                    function_ids, duplicate_count = await self._insert_functions(
+                        session, function_data_list, errors
                     )
+                    successful_count = sum(1 for function_id in function_ids if function_id is not None)
+
+                # function_ids与输入顺序一致，直接zip回填外键；重复或失败的记录(None)跳过
+                final_attack_mappings = [
+                    dict(mapping, function_id=function_id)
+                    for function_id, mappings in zip(function_ids, attack_rows_per_input)
+                    if function_id is not None
+                    for mapping in mappings
+                ]
+                final_child_mappings = [
+                    dict(mapping, parent_function_id=function_id)
+                    for function_id, mappings in zip(function_ids, child_rows_per_input)
+                    if function_id is not None
+                    for mapping in mappings
+                ]
+
+                # 批量插入ATT&CK映射表和子函数映射表
+                await self._insert_mapping_tables(
+                    session, final_attack_mappings, final_child_mappings
+                )
 
-                # 提交事务
-                await session.commit()
+                # 提交事务（共享会话中仅释放SAVEPOINT，由外层统一提交）
+                await transaction.commit()
 
-                self.logger.debug(f"批次提交成功: {successful_count}条记录")
+                self.logger.debug("批次提交成功: %d条记录", successful_count)
 
             except SQLAlchemyError as e:
                 # 回滚事务
-                await session.rollback()
+                await transaction.rollback()
                 error_msg = f"批次事务失败: {str(e)}"
                 errors.append(error_msg)
                 self.logger.error(error_msg, exc_info=True)
@@ -715,7 +821,7 @@ class BatchImporter:
 
             except Exception as e:
                 # 回滚事务
-                await session.rollback()
+                await transaction.rollback()
                 error_msg = f"批次处理失败: {str(e)}"
                 errors.append(error_msg)
                 self.logger.error(error_msg, exc_info=True)
@@ -723,14 +829,204 @@ class BatchImporter:
                 # 重新抛出异常以便重试
                 raise
 
-        return successful_count, errors
+        return successful_count, duplicate_count, errors
+
+    async def _insert_functions(
+        self,
+        session: AsyncSession,
+        function_data_list: List[Dict[str, Any]],
+        errors: List[str]
+    ) -> Tuple[List[Optional[int]], int]:
+        """
+        批量插入主表数据并返回生成的ID
+
+        参数说明：
+        - session: 当前事务所在的数据库会话
+        - function_data_list: 主表数据列表
+        - errors: 错误列表，用于收集插入失败的记录
+
+        返回值：
+        - Tuple[List[Optional[int]], int]: (与输入顺序一致的ID列表, 重复数量)
+          重复或插入失败的记录对应的ID为None
+
+        为什么使用INSERT ... ON CONFLICT DO NOTHING RETURNING：
+        1. 逐条flush获取自增ID需要N次数据库往返
+        2. 去重与插入在同一条语句中原子完成，无需事先SELECT检查，也不存在竞态
+        3. RETURNING只返回实际插入的行，按(hash_id, alias)对应回输入记录
 
-    async def _convert_to_model_data(self, data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        错误隔离：
+        遇到其他约束错误时将数据对半拆分后重试，逐步缩小到单条记录，
+        每次尝试都在SAVEPOINT中执行，失败不影响外层事务。
+        """
+        dialect_name = (await session.connection()).dialect.name
+        insert_factory = self.UPSERT_INSERTS.get(dialect_name)
+
+        if insert_factory is not None:
+            stmt = insert_factory(MalAPIFunction).on_conflict_do_nothing(
+                index_elements=self.FUNCTION_UNIQUE_KEY
+            )
+        else:
+            stmt = insert(MalAPIFunction)
+        stmt = stmt.returning(MalAPIFunction.id, MalAPIFunction.hash_id, MalAPIFunction.alias)
+
+        try:
+            async with session.begin_nested():
+                result = await session.execute(stmt, function_data_list)
+                inserted = {(hash_id, alias): function_id for function_id, hash_id, alias in result.all()}
+        except IntegrityError as e:
+            if len(function_data_list) == 1:
+                alias = function_data_list[0].get('alias', 'unknown')
+                _append_capped(errors, "插入函数失败 (%s): %s", alias, e)
+                self.logger.warning("插入函数失败 (%s): %s", alias, e)
+                return [None], 0
+
+            # 缩小分块重试，定位出错的记录
+            middle = len(function_data_list) // 2
+            first_ids, first_duplicates = await self._insert_functions(
+                session, function_data_list[:middle], errors
+            )
+            second_ids, second_duplicates = await self._insert_functions(
+                session, function_data_list[middle:], errors
+            )
+            return first_ids + second_ids, first_duplicates + second_duplicates
+
+        # 按唯一键映射回输入顺序；pop保证同一批次内的重复记录只有第一条获得ID
+        function_ids = [
+            inserted.pop((function_data['hash_id'], function_data['alias']), None)
+            for function_data in function_data_list
+        ]
+        duplicate_count = sum(1 for function_id in function_ids if function_id is None)
+        if duplicate_count:
+            self.logger.info(f"跳过 {duplicate_count} 条已存在的函数记录")
+
+        return function_ids, duplicate_count
+
+    async def _insert_mapping_tables(
+        self,
+        session: AsyncSession,
+        attack_rows: List[Dict[str, Any]],
+        child_rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        写入两张映射表
+
+        参数说明：
+        - session: 当前事务所在的数据库会话
+        - attack_rows: 已回填function_id的ATT&CK映射行
+        - child_rows: 已回填parent_function_id的子函数映射行
+
+        为什么合并为一条语句：
+        1. 同一连接上asyncpg不允许并发执行语句，拆到多个会话又会破坏批次事务的原子性
+        2. PostgreSQL支持在CTE中执行INSERT，两张表可以在一次往返中写完
+        3. 启用COPY且行数达到COPY阈值时COPY更快，仍分别走_bulk_insert_mappings
+        """
+        if attack_rows and child_rows:
+            conn = await session.connection()
+            below_copy_threshold = (
+                len(attack_rows) < self.COPY_THRESHOLD and len(child_rows) < self.COPY_THRESHOLD
+            )
+            if conn.dialect.name == 'postgresql' and (not self.use_copy or below_copy_threshold):
+                attack_insert = self._build_unnest_insert(
+                    AttCKMapping, self.ATTACK_MAPPING_COLUMNS, attack_rows
+                )
+                child_insert = self._build_unnest_insert(
+                    FunctionChild, self.CHILD_MAPPING_COLUMNS, child_rows
+                )
+                await session.execute(child_insert.add_cte(attack_insert.cte('attack_insert')))
+                return
+
+        if attack_rows:
+            await self._bulk_insert_mappings(
+                session, AttCKMapping, self.ATTACK_MAPPING_COLUMNS, attack_rows
+            )
+        if child_rows:
+            await self._bulk_insert_mappings(
+                session, FunctionChild, self.CHILD_MAPPING_COLUMNS, child_rows
+            )
+
+    @staticmethod
+    def _build_unnest_insert(
+        model: type,
+        columns: Tuple[str, ...],
+        rows: List[Dict[str, Any]]
+    ) -> Any:
+        """
+        构造 INSERT INTO ... SELECT * FROM unnest(...) 语句（仅PostgreSQL）
+
+        每列作为一个数组参数传入，无论行数多少都只有固定数量的绑定参数
+        """
+        table = model.__table__
+        arrays = [
+            bindparam(None, [row[column] for row in rows], type_=ARRAY(table.c[column].type))
+            for column in columns
+        ]
+        # render_derived生成 AS anon_1(col, ...) 列别名：多数组unnest的输出列
+        # 在PostgreSQL中都名为unnest，不加别名时无法按列名引用
+        source = func.unnest(*arrays).table_valued(*columns).render_derived()
+        return insert(model).from_select(
+            list(columns), select(*[source.c[column] for column in columns])
+        )
+
+    async def _bulk_insert_mappings(
+        self,
+        session: AsyncSession,
+        model: type,
+        columns: Tuple[str, ...],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        批量插入映射表数据
+
+        参数说明：
+        - session: 当前事务所在的数据库会话
+        - model: 映射表模型类（AttCKMapping / FunctionChild）
+        - columns: COPY时使用的列顺序
+        - rows: 待插入的数据行
+
+        为什么区分COPY和INSERT：
+        1. 每个函数通常对应多条技术映射和子函数，映射表行数远多于主表
+        2. PostgreSQL的COPY只做一次锁、权限和类型检查，大批量时明显快于INSERT
+        3. 行数较少时COPY的额外开销不划算，仍使用普通批量INSERT
+        """
+        if self.use_copy and len(rows) >= self.COPY_THRESHOLD:
+            conn = await session.connection()
+            if conn.dialect.driver == 'asyncpg':
+                await self._copy_insert(conn, model.__tablename__, columns, rows)
+                return
+
+        await session.execute(insert(model), rows)
+
+    async def _copy_insert(
+        self,
+        conn: Any,
+        table_name: str,
+        columns: Tuple[str, ...],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        使用asyncpg的COPY协议批量写入数据
+
+        注意：COPY在当前连接上执行，参与外层事务，回滚时一并撤销
+        """
+        raw_connection = await conn.get_raw_connection()
+        records = [tuple(row[column] for column in columns) for row in rows]
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name,
+            records=records,
+            columns=list(columns)
+        )
+
+    def _convert_to_model_data(
+        self,
+        data: Dict[str, Any],
+        now: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
         将解析数据转换为数据库模型数据
 
         参数说明：
         - data: 解析后的manifest数据
+        - now: 当前批次的时间戳，用于created_at/updated_at字段
 
         返回值：
         - Dict[str, List[Dict]]: 包含各表数据的字典
@@ -742,7 +1038,7 @@ class BatchImporter:
         4. 默认值填充
 
         数据转换策略：
-        1. 保持原始数据完整性
+        1. manifest_json只保存其他列和关联表未覆盖的字段
         2. 适应数据库字段约束
         3. 处理数据类型转换
         4. 生成关联表数据
@@ -764,11 +1060,15 @@ class BatchImporter:
             'summary': data.get('summary', ''),
             'cpp_code': data.get('generated_cpp', ''),
             'cpp_filepath': data.get('cpp_filepath', ''),
-            'manifest_json': data,  # 存储完整的manifest数据
+            # 仅保留未单独存储的字段，避免每行重复写入代码和映射数据
+            'manifest_json': {
+                k: v for k, v in data.items()
+                if k not in self.MANIFEST_STORED_FIELDS
+            },
             'tries': data.get('tries', 1),
             'status': data.get('status', 'unknown'),
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow()
+            'created_at': now,
+            'updated_at': now
         }
 
         # 准备ATT&CK映射数据（仅存储映射关系，technique详细信息从attack_techniques表获取）
@@ -780,7 +1080,7 @@ class BatchImporter:
                     attack_mapping_data = {
                         'function_id': None,  # 稍后更新为实际的function_id
                         'technique_id': str(technique).strip().upper(),
-                        'created_at': datetime.utcnow()
+                        'created_at': now
                     }
                     attack_mappings.append(attack_mapping_data)
 
@@ -794,7 +1094,7 @@ class BatchImporter:
                     'child_function_name': str(child_alias).strip(),
                     'child_alias': str(child_alias).strip(),
                     'child_description': str(child_info) if not isinstance(child_info, dict) else str(child_info.get('description', '')),
-                    'created_at': datetime.utcnow()
+                    'created_at': now
                 }
                 child_mappings.append(child_mapping_data)
 
@@ -815,9 +1115,14 @@ class BatchImporter:
         - str: 生成的hash_id
 
         生成策略：
-        1. 基于alias字段生成SHA256哈希
+        1. 基于alias字段生成BLAKE2b哈希
         2. 确保唯一性
-        3. 长度固定为64字符
+        3. 长度固定为40字符，与hash_id列宽度一致
+
+        为什么使用BLAKE2b：
+        hash_id只作为内部唯一标识，不承担安全用途；
+        对alias这类短输入，BLAKE2b比SHA256更快，且可直接指定摘要长度。
+        短输入的耗时主要在哈希对象初始化上，因此复用模块级的初始状态。
 
         为什么需要生成hash_id：
         1. 确保数据唯一标识
@@ -831,7 +1136,9 @@ class BatchImporter:
             fallback_data = f"{data.get('status', '')}{data.get('root_function', '')}{datetime.utcnow()}"
             alias = fallback_data
 
-        return hashlib.sha256(alias.encode('utf-8')).hexdigest()
+        hasher = _HASH_ID_HASHER.copy()
+        hasher.update(alias.encode('utf-8'))
+        return hasher.hexdigest()
 
     def _update_global_statistics(self, result: ImportResult) -> None:
         """
@@ -856,20 +1163,29 @@ class BatchImporter:
         if self.stats['total_imports'] > 0:
             self.stats['average_time_per_batch'] = self.stats['total_time'] / (self.stats['total_imports'] / self.batch_size)
 
-    def get_statistics(self) -> Dict[str, Any]:
+        self._stats_dirty = True
+
+    def get_statistics(self) -> Mapping[str, Any]:
         """
         获取导入器统计信息
 
         返回值：
-        - Dict[str, Any]: 详细的统计信息
+        - Mapping[str, Any]: 详细的统计信息（只读视图）
 
         统计内容：
         1. 导入总量统计
         2. 成功率计算
         3. 性能指标
         4. 错误统计
+
+        为什么返回只读视图：
+        统计只在导入完成时变化，而监控会频繁读取；派生指标缓存到下次更新前，
+        重复调用不再复制字典，只读视图也避免调用方误改内部统计。
         """
-        stats = self.stats.copy()
+        if not self._stats_dirty:
+            return self._stats_view
+
+        stats = dict(self.stats)
 
         # 计算成功率
         if stats['total_imports'] > 0:
@@ -887,7 +1203,9 @@ class BatchImporter:
         else:
             stats['records_per_second'] = 0.0
 
-        return stats
+        self._stats_view = MappingProxyType(stats)
+        self._stats_dirty = False
+        return self._stats_view
 
     def print_statistics(self) -> None:
         """
@@ -932,4 +1250,5 @@ class BatchImporter:
             'total_time': 0.0,
             'average_time_per_batch': 0.0
         }
+        self._stats_dirty = True
         self.logger.info("批量导入器统计信息已重置")
\ No newline at end of file
@@ -21,16 +21,23 @@ import_manager.py - 数据导入管理器
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Callable, Union
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Mapping, Optional, Callable, Tuple, Union, AsyncIterator
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
 
-from src.parsers.file_scanner import FileScanner, ScanResult
+from src.parsers.file_scanner import FileScanner, FileEntry, ScanResult
 from src.parsers.manifest_parser import ManifestParser, ManifestParseResult
+from src.importers.adaptive_limiter import AdaptiveLimiter
 from src.importers.batch_importer import BatchImporter, ImportResult
+from src.importers.parse_cache import ParseCache
 from src.exceptions.data_exceptions import (
     DataImportError,
     ParseError,
@@ -58,7 +65,7 @@ class ImportProcessResult:
     # 扫描阶段结果
     scan_result: Optional[ScanResult] = None
 
-    # 解析阶段结果
+    # 解析阶段结果（parse_results仅在importer_config['keep_parse_results']开启时保留）
     parse_results: List[ManifestParseResult] = field(default_factory=list)
     successful_parses: int = 0
     failed_parses: int = 0
@@ -171,6 +178,56 @@ class ImportProcessResult:
         return stats
 
 
+@dataclass(slots=True, frozen=True)
+class ManagerStatistics:
+    """
+    导入管理器统计快照
+
+    设计思路：
+    1. 管理器级别的计数和派生指标作为属性直接读取
+    2. 各组件的统计保持组件自己返回的映射
+    3. as_dict()生成与字典形式相同的结构，用于JSON序列化
+
+    为什么使用slots数据类：
+    1. 一个对象代替嵌套的多层字典拷贝，监控端点频繁轮询时分配更少
+    2. 属性访问有类型提示，不会因拼错键名静默得到默认值
+    3. 快照不可变，统计未变化时管理器可以把同一个实例返回给多个调用方
+    """
+    total_imports: int
+    total_files_processed: int
+    total_time: float
+    last_import_time: Optional[datetime]
+    average_files_per_import: float
+    average_time_per_import: float
+    overall_files_per_second: float
+    scanner: Mapping[str, Any]
+    parser: Mapping[str, Any]
+    importer: Mapping[str, Any]
+    parse_cache: Optional[Mapping[str, Any]] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """转换为字典，未启用解析缓存时不包含parse_cache键"""
+        stats = {
+            'total_imports': self.total_imports,
+            'total_files_processed': self.total_files_processed,
+            'total_time': self.total_time,
+            'last_import_time': self.last_import_time,
+            'scanner': dict(self.scanner),
+            'parser': dict(self.parser),
+            'importer': dict(self.importer),
+            'average_files_per_import': self.average_files_per_import,
+            'average_time_per_import': self.average_time_per_import,
+            'overall_files_per_second': self.overall_files_per_second
+        }
+        if self.parse_cache is not None:
+            stats['parse_cache'] = dict(self.parse_cache)
+        return stats
+
+
+def _noop_progress(current: int, total: int, message: str = "") -> None:
+    """未设置进度回调时使用的空回调"""
+
+
 class ImportManager:
     """
     数据导入管理器
@@ -200,6 +257,13 @@ class ImportManager:
     4. 系统初始化
     """
 
+    # 解析阶段每处理多少个文件报告一次进度
+    PROGRESS_INTERVAL = 64
+    # 解析结束时汇总输出的解析异常条数上限，只保留最近的条目
+    MAX_LOGGED_PARSE_FAILURES = 100
+    # 文件列表不超过该数量时在当前协程中逐个解析，不创建队列和解析任务
+    SERIAL_PARSE_THRESHOLD = 32
+
     def __init__(
         self,
         session_factory: async_sessionmaker[AsyncSession],
@@ -240,9 +304,16 @@ class ImportManager:
             'total_time': 0.0,
             'last_import_time': None
         }
+        # 统计代数：导入结束或重置时递增，get_statistics据此判断缓存的快照是否过期
+        self._stats_generation = 0
+        self._stats_snapshot: Optional[Tuple[int, ManagerStatistics]] = None
+        # 正在进行的导入数；导入期间各组件的计数持续变化，get_statistics不使用缓存
+        self._active_imports = 0
 
         # 进度回调函数
         self.progress_callback: Optional[Callable[[int, int, str], None]] = None
+        # 内部进度分发入口，未设置回调时为空函数，调用处无需判断
+        self._on_import_progress: Callable[[int, int, str], None] = _noop_progress
 
     def _initialize_components(
         self,
@@ -276,15 +347,29 @@ class ImportManager:
             max_workers=scanner_config.get('max_workers', 4),
             max_depth=scanner_config.get('max_depth', None),
             follow_symlinks=scanner_config.get('follow_symlinks', False),
-            timeout=scanner_config.get('timeout', 300.0)
+            timeout=scanner_config.get('timeout', 300.0),
+            parallel=scanner_config.get('parallel', False)
         )
 
         # 初始化解析器
         parser_config = parser_config or {}
+        # 解析专用线程池，文件读取和JSON解码不与数据库驱动等共用默认线程池
+        self._parse_executor = ThreadPoolExecutor(
+            max_workers=parser_config.get('io_workers', os.cpu_count() or 4),
+            thread_name_prefix="parse"
+        )
         self.parser = ManifestParser(
             strict_mode=parser_config.get('strict_mode', False),
-            validate_attack_ids=parser_config.get('validate_attack_ids', True)
+            validate_attack_ids=parser_config.get('validate_attack_ids', True),
+            executor=self._parse_executor,
+            content_memo_size=parser_config.get('content_memo_size', 10000)
         )
+        # 同时进行的解析任务数，以及解析与导入之间队列的最大长度
+        self.parse_concurrency = parser_config.get('max_concurrency', 10)
+        self.parse_queue_size = parser_config.get('queue_size', 1000)
+        # 流水线解析时是否根据吞吐量和导入队列深度调整并发数，max_concurrency作为初始值
+        self.adaptive_concurrency = parser_config.get('adaptive', False)
+        self.adaptive_max_concurrency = parser_config.get('adaptive_max_concurrency', 256)
 
         # 初始化导入器
         importer_config = importer_config or {}
@@ -293,18 +378,28 @@ class ImportManager:
             batch_size=importer_config.get('batch_size', 1000),
             max_retries=importer_config.get('max_retries', 3),
             retry_delay=importer_config.get('retry_delay', 1.0),
-            enable_progress_tracking=importer_config.get('enable_progress_tracking', True)
+            enable_progress_tracking=importer_config.get('enable_progress_tracking', True),
+            max_concurrent_batches=importer_config.get('max_concurrent_batches'),
+            use_copy=importer_config.get('use_copy', True)
+        )
+        # 是否在结果中保留全部解析结果；默认只保留计数，避免内存随文件数线性增长
+        self.keep_parse_results = importer_config.get('keep_parse_results', False)
+
+        # 解析结果缓存，仅在配置了cache_dir时启用；解析配置不同的结果分开缓存
+        cache_dir = importer_config.get('cache_dir')
+        self.parse_cache = ParseCache(
+            cache_dir, importer_config.get('cache_max_age_days', 30.0)
+        ) if cache_dir else None
+        self._parse_cache_variant = (
+            f"strict={self.parser.strict_mode},attack_ids={self.parser.validate_attack_ids}"
         )
 
-        # 设置进度回调
-        self.importer.set_progress_callback(self._on_import_progress)
-
-    def set_progress_callback(self, callback: Callable[[int, int, str], None]) -> None:
+    def set_progress_callback(self, callback: Optional[Callable[[int, int, str], None]]) -> None:
         """
         设置进度回调函数
 
         参数说明：
-        - callback: 回调函数，参数为(current, total, message)
+        - callback: 回调函数，参数为(current, total, message)；传入None取消回调
 
         回调时机：
         1. 文件扫描阶段
@@ -316,12 +411,21 @@ class ImportManager:
         2. 用户界面更新
         3. 日志记录
         4. 监控系统集成
+
+        为什么只在设置回调后才连接导入器：
+        未设置回调时导入器不再为每个批次格式化进度消息并转发
         """
         self.progress_callback = callback
+        self._on_import_progress = (
+            self._dispatch_progress if callback is not None else _noop_progress
+        )
+        self.importer.set_progress_callback(
+            self._dispatch_progress if callback is not None else None
+        )
 
-    def _on_import_progress(self, current: int, total: int, message: str = "") -> None:
+    def _dispatch_progress(self, current: int, total: int, message: str = "") -> None:
         """
-        内部进度回调处理
+        内部进度回调处理，仅在设置了回调后作为_on_import_progress使用
 
         参数说明：
         - current: 当前进度
@@ -330,12 +434,10 @@ class ImportManager:
 
         处理逻辑：
         1. 转发给用户设置的回调
-        2. 添加管理器级别的日志
-        3. 处理异常情况
+        2. 回调异常只记录警告，不中断导入
         """
         try:
-            if self.progress_callback:
-                self.progress_callback(current, total, message)
+            self.progress_callback(current, total, message)
         except Exception as e:
             self.logger.warning(f"进度回调执行失败: {e}")
 
@@ -375,6 +477,8 @@ class ImportManager:
         3. 支持部分成功处理
         4. 自动重试机制
         """
+        # 耗时使用单调时钟计算，datetime只用于记录起止时间
+        start_ns = time.perf_counter_ns()
         start_time = datetime.now()
         result = ImportProcessResult()
         result.start_time = start_time
@@ -382,45 +486,37 @@ class ImportManager:
 
         self.logger.info(f"开始从目录导入数据: {directory_path}")
 
+        self._active_imports += 1
         try:
-            # 阶段1: 文件扫描
-            self.logger.info("阶段1: 文件扫描")
-            result.scan_result = await self._scan_files(directory_path, pattern, recursive)
+            # 扫描、解析、导入三个阶段流水线执行：
+            # 扫描到的文件立即进入解析，解析出的数据攒够一批即开始导入
+            self.logger.info("扫描、解析与导入流水线开始")
+            result.scan_result = ScanResult()
+            file_stream = self._scan_files(directory_path, pattern, recursive, result.scan_result)
+            result.import_result = await self._parse_and_import(file_stream, result)
             result.total_files_found = result.scan_result.get_file_count()
 
             if result.total_files_found == 0:
                 self.logger.warning(f"在目录 {directory_path} 中未找到符合条件的文件")
-                result.end_time = datetime.now()
-                result.total_time = (result.end_time - start_time).total_seconds()
-                return result
-
-            # 报告扫描完成
-            self._on_import_progress(0, result.total_files_found, f"扫描完成，找到{result.total_files_found}个文件")
-
-            # 阶段2: 数据解析
-            self.logger.info("阶段2: 数据解析")
-            result.parse_results = await self._parse_files(result.scan_result.files, result)
-
-            # 阶段3: 数据导入
-            if result.successful_parses > 0:
-                self.logger.info("阶段3: 数据导入")
-                result.import_result = await self._import_data(result.parse_results, result)
-            else:
+            elif result.successful_parses == 0:
                 self.logger.warning("没有成功解析的数据，跳过导入阶段")
 
             # 完成处理
             result.end_time = datetime.now()
-            result.total_time = (result.end_time - start_time).total_seconds()
+            result.total_time = (time.perf_counter_ns() - start_ns) / 1e9
 
             # 更新统计信息
             self._update_manager_statistics(result)
+            # 内容缓存只在单次导入内去重，导入结束即释放
+            self.parser.clear_content_memo()
+            await self._evict_parse_cache()
 
             self.logger.info(f"导入流程完成: {result.get_overall_summary()}")
 
         except Exception as e:
             # 处理整体流程异常
             result.end_time = datetime.now()
-            result.total_time = (result.end_time - start_time).total_seconds()
+            result.total_time = (time.perf_counter_ns() - start_ns) / 1e9
 
             error_msg = f"导入流程异常: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
@@ -429,14 +525,18 @@ class ImportManager:
             if result.import_result:
                 result.import_result.add_error(error_msg)
 
+        finally:
+            self._end_import()
+
         return result
 
     async def _scan_files(
         self,
         directory_path: Union[str, Path],
         pattern: str,
-        recursive: bool
-    ) -> ScanResult:
+        recursive: bool,
+        scan_result: ScanResult
+    ) -> AsyncIterator[FileEntry]:
         """
         文件扫描阶段
 
@@ -444,33 +544,25 @@ class ImportManager:
         - directory_path: 目录路径
         - pattern: 文件模式
         - recursive: 是否递归
+        - scan_result: 扫描结果，扫描过程中增量更新
 
-        返回值：
-        - ScanResult: 扫描结果
+        产出值：
+        - FileEntry: 扫描到的文件条目
 
         扫描策略：
-        1. 使用FileScanner进行高效扫描
+        1. 使用FileScanner流式扫描，边扫描边产出
         2. 支持多种文件模式
         3. 处理各种异常情况
         4. 提供详细的扫描统计
         """
         try:
-            scan_result = await self.scanner.scan_directory(
+            async for file_entry in self.scanner.iter_scan_directory(
                 root_path=directory_path,
                 pattern=pattern,
-                recursive=recursive
-            )
-
-            self.logger.info(f"文件扫描完成: {scan_result.get_summary()}")
-
-            # 报告扫描进度
-            if scan_result.errors:
-                self.logger.warning(f"扫描过程中发现{len(scan_result.errors)}个错误")
-
-            if scan_result.warnings:
-                self.logger.info(f"扫描过程中发现{len(scan_result.warnings)}个警告")
-
-            return scan_result
+                recursive=recursive,
+                result=scan_result
+            ):
+                yield file_entry
 
         except Exception as e:
             self.logger.error(f"文件扫描失败: {e}")
@@ -480,11 +572,273 @@ class ImportManager:
                 original_error=e
             )
 
+        self.logger.info(f"文件扫描完成: {scan_result.get_summary()}")
+
+        # 报告扫描问题
+        if scan_result.errors:
+            self.logger.warning(f"扫描过程中发现{len(scan_result.errors)}个错误")
+
+        if scan_result.warnings:
+            self.logger.info(f"扫描过程中发现{len(scan_result.warnings)}个警告")
+
+    async def _parse_file(self, file: Union[Path, FileEntry]) -> ManifestParseResult:
+        """
+        解析单个文件，启用缓存时优先复用未变化文件的解析结果
+
+        参数说明：
+        - file: 文件路径，或扫描器产出的文件条目
+
+        缓存策略：
+        1. stat与缓存查询在同一次线程池调用中完成，命中时不读取文件内容
+        2. 扫描器产出的FileEntry复用目录条目缓存的文件状态，不再重复stat；
+           条目直接交给解析器，解析前的预检查也不再stat
+        3. 只缓存解析成功的结果，读取失败等临时错误下次仍会重新解析
+        4. stat失败时交给解析器处理，由解析器生成对应的错误结果
+        5. 命中的结果交给解析器登记：重新检查CPP文件是否存在，并计入解析统计
+        """
+        entry = file if isinstance(file, FileEntry) else FileEntry(Path(file))
+        if self.parse_cache is None:
+            return await self.parser.parse_file(entry)
+
+        try:
+            cached = await asyncio.to_thread(self._lookup_parse_cache, entry)
+        except OSError:
+            return await self.parser.parse_file(entry.path)
+
+        if cached is not None:
+            return self.parser.record_cached_result(cached)
+
+        parse_result = await self.parser.parse_file(entry)
+        if parse_result.is_valid:
+            await asyncio.to_thread(
+                self.parse_cache.put,
+                str(entry.path), entry.mtime_ns, entry.size,
+                parse_result, self._parse_cache_variant
+            )
+        return parse_result
+
+    def _lookup_parse_cache(self, entry: FileEntry) -> Optional[ManifestParseResult]:
+        """在线程池中执行：获取文件状态并查询缓存"""
+        return self.parse_cache.get(
+            str(entry.path), entry.mtime_ns, entry.size, self._parse_cache_variant
+        )
+
+    async def _parse_and_import(
+        self,
+        file_paths: AsyncIterator[Union[Path, FileEntry]],
+        result: ImportProcessResult
+    ) -> Optional[ImportResult]:
+        """
+        扫描、解析与导入流水线
+
+        参数说明：
+        - file_paths: 文件路径或文件条目的异步迭代器（通常为流式扫描结果）
+        - result: 处理结果对象
+
+        返回值：
+        - Optional[ImportResult]: 汇总后的导入结果，没有成功解析的数据时为None
+
+        流水线结构：
+        1. 一个生产者任务消费file_paths，放入有界的路径队列
+        2. parse_concurrency个解析任务从路径队列取文件解析，成功的结果放入有界的结果队列；
+           启用adaptive时由AdaptiveLimiter根据吞吐量和结果队列深度调整同时解析的文件数
+        3. 一个导入任务从结果队列取数据，攒够一块即调用BatchImporter导入
+        4. 上游正常结束时为每个下游任务放入一个None作为结束标记
+        5. 任一任务失败时立即取消其余任务；失败路径上不再发送结束标记，
+           避免已取消的任务阻塞在已满的队列上
+
+        为什么各阶段不依次执行：
+        1. 扫描、解析与导入可以重叠执行，数据库不必等待全部文件解析完成
+        2. 内存中只保留队列和当前数据块，而不是全部文件路径和解析结果
+        3. 队列满时上游自动等待，下游跟不上时不会无限积压
+        """
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=self.parse_queue_size)
+        if self.adaptive_concurrency:
+            # 按上限创建解析任务，实际同时解析的文件数由限制器控制
+            limiter = AdaptiveLimiter(
+                initial=self.parse_concurrency,
+                maximum=self.adaptive_max_concurrency,
+                backlog=result_queue.qsize,
+                capacity=result_queue.maxsize
+            )
+            worker_count = limiter.maximum
+        else:
+            limiter = nullcontext()
+            worker_count = max(1, self.parse_concurrency)
+        path_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * worker_count)
+        # 每块包含导入器可以并发处理的全部批次
+        chunk_size = self.importer.batch_size * self.importer.max_concurrent_batches
+        # 解析异常先放入环形缓冲，解析结束后一次性输出
+        parse_failures: deque = deque(maxlen=self.MAX_LOGGED_PARSE_FAILURES)
+
+        def files_discovered() -> int:
+            """流式扫描时文件总数随扫描增长"""
+            if result.scan_result is not None:
+                return result.scan_result.get_file_count()
+            return result.total_files_found
+
+        async def produce_paths() -> None:
+            async for file_path in file_paths:
+                await path_queue.put(file_path)
+            for _ in range(worker_count):
+                await path_queue.put(None)
+
+        async def parse_worker() -> None:
+            while (file_path := await path_queue.get()) is not None:
+                async with limiter:
+                    try:
+                        parse_result = await self._parse_file(file_path)
+                    except Exception as e:
+                        result.failed_parses += 1
+                        parse_failures.append((file_path, e))
+                        continue
+
+                if parse_result.is_valid:
+                    result.successful_parses += 1
+                    await result_queue.put(parse_result.data)
+                else:
+                    result.failed_parses += 1
+
+                if self.keep_parse_results:
+                    result.parse_results.append(parse_result)
+
+                # 每PROGRESS_INTERVAL个文件报告一次解析进度，未设置回调时不格式化消息
+                # （单线程事件循环，计数无需加锁）
+                current = result.successful_parses + result.failed_parses
+                if self.progress_callback is not None and current % self.PROGRESS_INTERVAL == 0:
+                    self._on_import_progress(current, files_discovered(), f"解析中: {file_path.name}")
+            await result_queue.put(None)
+
+        async def import_consumer() -> Optional[ImportResult]:
+            """按块导入队列中的解析结果，并汇总各块的导入结果"""
+            import_result = None
+            chunk = []
+            finished_workers = 0
+
+            # 整个流水线期间占用同一个连接，各块导入不再从连接池取还连接
+            async with self._pinned_connection() as connection:
+                while finished_workers < worker_count:
+                    record = await result_queue.get()
+                    if record is None:
+                        finished_workers += 1
+                        if finished_workers == worker_count:
+                            parsed = result.successful_parses + result.failed_parses
+                            self._on_import_progress(parsed, files_discovered(), "解析完成")
+                        continue
+
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        import_result = self._merge_import_results(
+                            import_result, await self._import_data(chunk, result, connection)
+                        )
+                        chunk = []
+
+                if chunk:
+                    import_result = self._merge_import_results(
+                        import_result, await self._import_data(chunk, result, connection)
+                    )
+            return import_result
+
+        if self.adaptive_concurrency:
+            self.logger.info(
+                f"开始流水线解析导入 (自适应解析并发数: 初始{limiter.limit}, 上限{limiter.maximum})"
+            )
+        else:
+            self.logger.info(f"开始流水线解析导入 (解析并发数: {worker_count})")
+
+        consumer = asyncio.create_task(import_consumer())
+        producer = asyncio.create_task(produce_paths())
+        workers = [asyncio.create_task(parse_worker()) for _ in range(worker_count)]
+        tasks = (consumer, producer, *workers)
+        try:
+            # 全部正常结束或任一任务抛出异常时返回
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # 失败时其余任务可能阻塞在队列上，需要主动取消；已完成的任务不受影响
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._log_parse_failures(parse_failures)
+
+        # 按导入、扫描、解析的顺序抛出第一个失败任务的原始异常
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        import_result = consumer.result()
+
+        self.logger.info(f"数据解析完成: 成功{result.successful_parses}个, 失败{result.failed_parses}个")
+        if import_result is not None:
+            self.logger.info(f"数据导入完成: {import_result.get_summary()}")
+
+        return import_result
+
+    @asynccontextmanager
+    async def _pinned_connection(self) -> AsyncIterator[Optional[AsyncConnection]]:
+        """
+        为一次导入预先取出一个数据库连接
+
+        返回值：
+        - Optional[AsyncConnection]: 导入器串行导入时为占用的连接，否则为None
+
+        为什么只在串行导入时占用连接：
+        1. 串行导入时每个数据块都要取出连接、BEGIN、COMMIT再归还，
+           占用同一个连接后只剩每块一次COMMIT，提交点也避免单个事务过大
+        2. 并发导入时各批次需要各自的连接，一个连接无法同时执行多条语句
+        """
+        engine = self.session_factory.kw.get('bind')
+        if engine is None or self.importer.max_concurrent_batches != 1:
+            yield None
+            return
+
+        async with engine.connect() as connection:
+            yield connection
+
+    def _log_parse_failures(self, parse_failures: deque) -> None:
+        """
+        一次性输出解析阶段缓冲的异常
+
+        参数说明：
+        - parse_failures: (文件, 异常)环形缓冲，超过容量时只保留最近的条目
+
+        为什么不逐个文件记录：
+        每次日志调用都要加锁并格式化，大量文件失败时会拖慢解析任务；
+        汇总为一条日志只需一次格式化和一次加锁
+        """
+        if not parse_failures:
+            return
+        self.logger.error(
+            "解析文件失败（最多保留最近%d个）:\n%s",
+            parse_failures.maxlen,
+            "\n".join(f"{file_path}: {error}" for file_path, error in parse_failures)
+        )
+
+    @staticmethod
+    def _merge_import_results(
+        total: Optional[ImportResult],
+        part: ImportResult
+    ) -> ImportResult:
+        """将一个数据块的导入结果累加到汇总结果中"""
+        if total is None:
+            return part
+
+        total.total_records += part.total_records
+        total.successful_imports += part.successful_imports
+        total.failed_imports += part.failed_imports
+        total.skipped_imports += part.skipped_imports
+        total.duplicate_imports += part.duplicate_imports
+        total.processing_time += part.processing_time
+        total.end_time = part.end_time
+        for error_msg in part.errors:
+            total.add_error(error_msg)
+        total.warnings.extend(part.warnings)
+        total.imported_ids.extend(part.imported_ids)
+        return total
+
     async def _parse_files(
         self,
         file_paths: List[Path],
         result: ImportProcessResult
-    ) -> List[ManifestParseResult]:
+    ) -> List[Dict[str, Any]]:
         """
         数据解析阶段
 
@@ -493,66 +847,75 @@ class ImportManager:
         - result: 处理结果对象
 
         返回值：
-        - List[ManifestParseResult]: 解析结果列表
+        - List[Dict[str, Any]]: 解析成功的manifest数据列表，可直接交给BatchImporter导入
+
+        为什么不返回ManifestParseResult列表：
+        1. 解析结果中的错误、警告列表等导入阶段用不到，解析完成即可释放
+        2. 导入前不必再遍历一次过滤无效结果
+        3. 需要完整解析结果时通过keep_parse_results保留到result.parse_results
 
         解析策略：
         1. 并行解析提高性能
-        2. 限制并发数避免资源耗尽
+        2. 固定数量的解析任务，避免资源耗尽
         3. 详细的错误处理和日志
         4. 支持断点续传
 
         性能考虑：
-        1. 使用信号量控制并发
+        1. 生产者与固定worker通过有界队列协作，内存与worker数相关而非文件数
         2. 批量处理减少开销
         3. 异步I/O避免阻塞
         4. 内存使用监控
         """
-        parse_results = []
+        records = []
         successful_count = 0
         failed_count = 0
-
-        # 控制并发数量
-        semaphore = asyncio.Semaphore(10)  # 最多10个并发解析任务
-
-        async def parse_single_file(file_path: Path) -> Optional[ManifestParseResult]:
-            """解析单个文件"""
+        worker_count = max(1, min(self.parse_concurrency, len(file_paths)))
+
+        # 有界队列在生产者和固定数量的解析任务之间提供背压，
+        # 调度开销只与worker数相关，不再为每个文件创建一个Task
+        path_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * worker_count)
+        # 解析异常先放入环形缓冲，解析结束后一次性输出
+        parse_failures: deque = deque(maxlen=self.MAX_LOGGED_PARSE_FAILURES)
+
+        async def produce_paths() -> None:
+            """按顺序放入文件路径，最后为每个worker放入一个结束标记"""
+            for file_path in file_paths:
+                await path_queue.put(file_path)
+            for _ in range(worker_count):
+                await path_queue.put(None)
+
+        async def parse_worker() -> None:
+            """持续从队列取文件解析，直到取到结束标记"""
             nonlocal successful_count, failed_count
-            async with semaphore:
+            while (file_path := await path_queue.get()) is not None:
                 try:
-                    parse_result = await self.parser.parse_file(file_path)
-
-                    # 更新进度
-                    if parse_result.is_valid:
-                        successful_count += 1
-                    else:
-                        failed_count += 1
-
-                    # 报告解析进度
-                    current = successful_count + failed_count
-                    self._on_import_progress(current, len(file_paths), f"解析中: {file_path.name}")
-
-                    return parse_result
-
+                    parse_result = await self._parse_file(file_path)
                 except Exception as e:
                     failed_count += 1
+                    parse_failures.append((file_path, e))
+                    continue
 
-                    self.logger.error(f"解析文件失败 {file_path}: {e}")
-                    return None
+                if parse_result.is_valid:
+                    successful_count += 1
+                    records.append(parse_result.data)
+                else:
+                    failed_count += 1
 
-        # 创建解析任务
-        self.logger.info(f"开始并行解析 {len(file_paths)} 个文件")
-        tasks = [parse_single_file(file_path) for file_path in file_paths]
+                if self.keep_parse_results:
+                    result.parse_results.append(parse_result)
 
-        # 等待所有任务完成
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+                # 每PROGRESS_INTERVAL个文件报告一次解析进度，未设置回调时不格式化消息
+                # （单线程事件循环，计数无需加锁）
+                current = successful_count + failed_count
+                if self.progress_callback is not None and current % self.PROGRESS_INTERVAL == 0:
+                    self._on_import_progress(current, len(file_paths), f"解析中: {file_path.name}")
 
-        # 处理结果
-        for item in results:
-            if isinstance(item, Exception):
-                self.logger.error(f"解析任务异常: {item}")
-                failed_count += 1
-            elif item is not None:
-                parse_results.append(item)
+        self.logger.info(f"开始并行解析 {len(file_paths)} 个文件 (解析并发数: {worker_count})")
+        try:
+            await asyncio.gather(produce_paths(), *(parse_worker() for _ in range(worker_count)))
+        finally:
+            self._log_parse_failures(parse_failures)
+        self._on_import_progress(successful_count + failed_count, len(file_paths), "解析完成")
 
         # 更新统计
         result.successful_parses = successful_count
@@ -560,19 +923,66 @@ class ImportManager:
 
         self.logger.info(f"数据解析完成: 成功{successful_count}个, 失败{failed_count}个")
 
-        return parse_results
+        return records
 
-    async def _import_data(
+    async def _parse_files_serially(
         self,
-        parse_results: List[ManifestParseResult],
+        file_paths: List[Union[str, Path]],
         result: ImportProcessResult
+    ) -> List[Dict[str, Any]]:
+        """
+        在当前协程中逐个解析少量文件
+
+        参数说明：
+        - file_paths: 文件路径列表，数量不超过SERIAL_PARSE_THRESHOLD
+        - result: 处理结果对象
+
+        返回值：
+        - List[Dict[str, Any]]: 解析成功的manifest数据列表，与_parse_files相同
+
+        为什么单独处理：
+        重新导入几十个文件是常见场景，此时创建队列、解析任务和收集结果的开销
+        比解析本身还大；文件读取仍在解析线程池中进行，不会阻塞事件循环
+        """
+        records = []
+        parse_failures: deque = deque(maxlen=self.MAX_LOGGED_PARSE_FAILURES)
+
+        for file_path in file_paths:
+            try:
+                parse_result = await self._parse_file(Path(file_path))
+            except Exception as e:
+                result.failed_parses += 1
+                parse_failures.append((file_path, e))
+                continue
+
+            if parse_result.is_valid:
+                result.successful_parses += 1
+                records.append(parse_result.data)
+            else:
+                result.failed_parses += 1
+
+            if self.keep_parse_results:
+                result.parse_results.append(parse_result)
+
+        self._log_parse_failures(parse_failures)
+        self._on_import_progress(result.successful_parses + result.failed_parses, len(file_paths), "解析完成")
+        self.logger.info(f"数据解析完成: 成功{result.successful_parses}个, 失败{result.failed_parses}个")
+
+        return records
+
+    async def _import_data(
+        self,
+        records: List[Dict[str, Any]],
+        result: ImportProcessResult,
+        connection: Optional[AsyncConnection] = None
     ) -> ImportResult:
         """
         数据导入阶段
 
         参数说明：
-        - parse_results: 解析结果列表
+        - records: 解析成功的manifest数据列表
         - result: 处理结果对象
+        - connection: 流水线预先占用的连接，为None时由导入器从连接池获取
 
         返回值：
         - ImportResult: 导入结果
@@ -590,20 +1000,17 @@ class ImportManager:
         4. 内存使用控制
         """
         try:
-            # 过滤有效的解析结果
-            valid_results = [r for r in parse_results if r.is_valid]
-
-            if not valid_results:
+            if not records:
                 self.logger.warning("没有有效的解析结果可以导入")
                 return ImportResult(total_records=0)
 
-            self.logger.info(f"开始导入 {len(valid_results)} 条有效记录")
+            self.logger.info(f"开始导入 {len(records)} 条有效记录")
 
             # 报告导入开始
-            self._on_import_progress(0, len(valid_results), "开始数据库导入")
+            self._on_import_progress(0, len(records), "开始数据库导入")
 
             # 执行批量导入
-            import_result = await self.importer.import_manifest_data(valid_results)
+            import_result = await self.importer.import_records(records, connection=connection)
 
             self.logger.info(f"数据导入完成: {import_result.get_summary()}")
 
@@ -638,6 +1045,15 @@ class ImportManager:
         self.stats['total_files_processed'] += result.total_files_found
         self.stats['total_time'] += result.total_time
         self.stats['last_import_time'] = result.end_time
+        self._stats_generation += 1
+
+    async def _evict_parse_cache(self) -> None:
+        """每次导入结束后清理长期未访问的缓存条目"""
+        if self.parse_cache is None:
+            return
+        evicted = await asyncio.to_thread(self.parse_cache.evict)
+        if evicted:
+            self.logger.info(f"清理过期解析缓存 {evicted} 条")
 
     async def import_from_file_list(
         self,
@@ -664,6 +1080,8 @@ class ImportManager:
         3. 更精确的控制
         4. 适合小批量处理
         """
+        # 耗时使用单调时钟计算，datetime只用于记录起止时间
+        start_ns = time.perf_counter_ns()
         start_time = datetime.now()
         result = ImportProcessResult()
         result.start_time = start_time
@@ -671,39 +1089,56 @@ class ImportManager:
 
         self.logger.info(f"开始从文件列表导入数据: {len(file_paths)}个文件")
 
+        self._active_imports += 1
         try:
-            # 转换路径格式
-            file_paths = [Path(fp) for fp in file_paths]
-
-            # 跳过扫描阶段，直接解析
-            result.parse_results = await self._parse_files(file_paths, result)
+            # 跳过扫描阶段，直接解析；少量文件时队列和任务调度的开销超过解析本身
+            if len(file_paths) <= self.SERIAL_PARSE_THRESHOLD:
+                records = await self._parse_files_serially(file_paths, result)
+            else:
+                records = await self._parse_files([Path(fp) for fp in file_paths], result)
 
             # 导入阶段
-            if result.successful_parses > 0:
-                result.import_result = await self._import_data(result.parse_results, result)
+            if records:
+                result.import_result = await self._import_data(records, result)
 
             # 完成处理
             result.end_time = datetime.now()
-            result.total_time = (result.end_time - start_time).total_seconds()
+            result.total_time = (time.perf_counter_ns() - start_ns) / 1e9
 
             # 更新统计
             self._update_manager_statistics(result)
+            # 内容缓存只在单次导入内去重，导入结束即释放
+            self.parser.clear_content_memo()
+            await self._evict_parse_cache()
 
             self.logger.info(f"文件列表导入完成: {result.get_overall_summary()}")
 
         except Exception as e:
             self.logger.error(f"文件列表导入失败: {e}")
             result.end_time = datetime.now()
-            result.total_time = (result.end_time - start_time).total_seconds()
+            result.total_time = (time.perf_counter_ns() - start_ns) / 1e9
+
+        finally:
+            self._end_import()
 
         return result
 
-    def get_statistics(self) -> Dict[str, Any]:
+    def _end_import(self) -> None:
+        """导入结束（无论成功与否）时调用，各组件的统计已经变化，使缓存的快照失效"""
+        self._active_imports -= 1
+        self._stats_generation += 1
+
+    def get_statistics(self) -> ManagerStatistics:
         """
         获取管理器统计信息
 
         返回值：
-        - Dict[str, Any]: 详细统计信息
+        - ManagerStatistics: 统计快照，需要字典时调用as_dict()
+
+        缓存策略：
+        两次导入之间统计只在导入结束或重置时变化，快照按统计代数缓存，
+        重复调用直接返回同一个快照，不再逐个查询组件；
+        导入进行中各组件的计数随时在变，此时每次都重新汇总且不写入缓存
 
         统计内容：
         1. 管理器级别统计
@@ -711,27 +1146,34 @@ class ImportManager:
         3. 性能指标
         4. 使用情况
         """
-        stats = self.stats.copy()
-
-        # 添加各组件统计
-        stats['scanner'] = self.scanner.get_statistics()
-        stats['parser'] = self.parser.get_statistics()
-        stats['importer'] = self.importer.get_statistics()
-
-        # 计算平均性能指标
-        if stats['total_imports'] > 0:
-            stats['average_files_per_import'] = stats['total_files_processed'] / stats['total_imports']
-            stats['average_time_per_import'] = stats['total_time'] / stats['total_imports']
-        else:
-            stats['average_files_per_import'] = 0
-            stats['average_time_per_import'] = 0
-
-        if stats['total_time'] > 0:
-            stats['overall_files_per_second'] = stats['total_files_processed'] / stats['total_time']
-        else:
-            stats['overall_files_per_second'] = 0
-
-        return stats
+        importing = self._active_imports > 0
+        cached = self._stats_snapshot
+        if not importing and cached is not None and cached[0] == self._stats_generation:
+            return cached[1]
+
+        stats = self.stats
+        total_imports = stats['total_imports']
+        total_files = stats['total_files_processed']
+        total_time = stats['total_time']
+
+        snapshot = ManagerStatistics(
+            total_imports=total_imports,
+            total_files_processed=total_files,
+            total_time=total_time,
+            last_import_time=stats['last_import_time'],
+            # 计算平均性能指标
+            average_files_per_import=total_files / total_imports if total_imports > 0 else 0,
+            average_time_per_import=total_time / total_imports if total_imports > 0 else 0,
+            overall_files_per_second=total_files / total_time if total_time > 0 else 0,
+            # 各组件统计
+            scanner=self.scanner.get_statistics(),
+            parser=self.parser.get_statistics(),
+            importer=self.importer.get_statistics(),
+            parse_cache=self.parse_cache.get_statistics() if self.parse_cache is not None else None
+        )
+        if not importing:
+            self._stats_snapshot = (self._stats_generation, snapshot)
+        return snapshot
 
     def print_statistics(self) -> None:
         """
@@ -750,28 +1192,28 @@ class ImportManager:
         print("="*70)
 
         # 管理器统计
-        print(f"总导入次数: {stats['total_imports']}")
-        print(f"总处理文件数: {stats['total_files_processed']:,}")
-        print(f"总处理时间: {stats['total_time']:.2f}s")
-        print(f"平均每次导入文件数: {stats['average_files_per_import']:.1f}")
-        print(f"平均每次导入时间: {stats['average_time_per_import']:.2f}s")
-        print(f"总体处理速度: {stats['overall_files_per_second']:.1f} 文件/秒")
+        print(f"总导入次数: {stats.total_imports}")
+        print(f"总处理文件数: {stats.total_files_processed:,}")
+        print(f"总处理时间: {stats.total_time:.2f}s")
+        print(f"平均每次导入文件数: {stats.average_files_per_import:.1f}")
+        print(f"平均每次导入时间: {stats.average_time_per_import:.2f}s")
+        print(f"总体处理速度: {stats.overall_files_per_second:.1f} 文件/秒")
 
-        if stats['last_import_time']:
-            print(f"最后导入时间: {stats['last_import_time']}")
+        if stats.last_import_time:
+            print(f"最后导入时间: {stats.last_import_time}")
 
         print("-"*70)
 
         # 组件统计
-        scanner_stats = stats['scanner']
+        scanner_stats = stats.scanner
         print(f"文件扫描器: {scanner_stats.get('total_files_found', 0)} 个文件, "
               f"平均扫描时间 {scanner_stats.get('average_scan_time', 0):.2f}s")
 
-        parser_stats = stats['parser']
-        print(f"解析器: {parser_stats.get('total_files_found', 0)} 个文件, "
+        parser_stats = stats.parser
+        print(f"解析器: {parser_stats.get('total_files', 0)} 个文件, "
               f"成功率 {parser_stats.get('success_rate', 0):.1f}%")
 
-        importer_stats = stats['importer']
+        importer_stats = stats.importer
         print(f"导入器: {importer_stats.get('total_successful', 0)} 条记录, "
               f"成功率 {importer_stats.get('success_rate', 0):.1f}%")
 
@@ -798,5 +1240,21 @@ class ImportManager:
         self.scanner.reset_statistics()
         self.parser.reset_statistics()
         self.importer.reset_statistics()
+        if self.parse_cache is not None:
+            self.parse_cache.reset_statistics()
+        self._stats_generation += 1
+
+        self.logger.info("导入管理器统计信息已重置")
 
-        self.logger.info("导入管理器统计信息已重置")
\ No newline at end of file
+    def close(self) -> None:
+        """
+        释放管理器持有的资源
+
+        释放内容：
+        1. 扫描和解析线程池（不等待空闲线程退出）
+        2. 解析结果缓存的数据库连接
+        """
+        self.scanner.close()
+        self._parse_executor.shutdown(wait=False)
+        if self.parse_cache is not None:
+            self.parse_cache.close()
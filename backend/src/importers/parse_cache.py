@@ -0,0 +1,173 @@
+"""
+parse_cache.py - manifest解析结果缓存
+
+设计思路：
+1. 以(文件路径, st_mtime_ns, st_size)判断文件是否变化
+2. 未变化的文件直接复用上次的解析结果，跳过读取和解析
+3. 使用单文件SQLite(WAL模式)持久化，不引入额外依赖
+4. 按最后访问时间淘汰长期未使用的条目
+
+为什么需要解析缓存：
+- 同一目录通常会被反复导入，绝大多数文件没有变化
+- 解析包含文件读取、JSON解析和多轮验证，是导入前半段的主要耗时
+- 命中缓存时整个解析阶段只剩一次stat和一次索引查询
+
+使用示例：
+>>> cache = ParseCache(".import-cache")
+>>> result = cache.get(path, st.st_mtime_ns, st.st_size)
+>>> if result is None:
+>>>     result = await parser.parse_file(path)
+>>>     cache.put(path, st.st_mtime_ns, st.st_size, result)
+"""
+
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.parsers.manifest_parser import ManifestParseResult
+
+
+class ParseCache:
+    """
+    基于SQLite的解析结果缓存
+
+    设计考虑：
+    1. 每个(路径, 解析配置)只保留一行，文件变化后新结果直接覆盖旧结果
+    2. variant区分不同解析配置(strict_mode等)，避免不同配置的结果互相污染
+    3. 读写都在锁内完成，允许从线程池中调用
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_age_days: float = 30.0):
+        """
+        初始化解析缓存
+
+        参数说明：
+        - cache_dir: 缓存目录，缓存数据库文件为其中的parse_cache.db
+        - max_age_days: 超过该天数未访问的条目在evict()时删除
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_days * 86400
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "parse_cache.db"),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 限制WAL文件大小，避免长期运行后日志文件无限增长
+        self._conn.execute("PRAGMA journal_size_limit=67108864")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                path TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                result BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (path, variant)
+            )
+        """)
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        path: str,
+        mtime_ns: int,
+        size: int,
+        variant: str = ""
+    ) -> Optional[ManifestParseResult]:
+        """
+        查询缓存
+
+        返回值：
+        - Optional[ManifestParseResult]: 文件未变化时返回缓存的解析结果，否则返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, result FROM parse_cache WHERE path = ? AND variant = ?",
+                (path, variant)
+            ).fetchone()
+
+            if row is None or row[0] != mtime_ns or row[1] != size:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE parse_cache SET last_access = ? WHERE path = ? AND variant = ?",
+                (time.time(), path, variant)
+            )
+            self.hits += 1
+
+        try:
+            return pickle.loads(row[2])
+        except Exception as e:
+            # 结果类结构变化等原因导致无法反序列化时视为未命中
+            self.logger.warning(f"解析缓存条目损坏 {path}: {e}")
+            return None
+
+    def put(
+        self,
+        path: str,
+        mtime_ns: int,
+        size: int,
+        result: ManifestParseResult,
+        variant: str = ""
+    ) -> None:
+        """写入或覆盖一个文件的解析结果"""
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache "
+                "(path, variant, mtime_ns, size, result, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, variant, mtime_ns, size, blob, time.time())
+            )
+
+    def evict(self) -> int:
+        """
+        删除超过max_age_days未访问的条目
+
+        返回值：
+        - int: 删除的条目数
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM parse_cache WHERE last_access < ?",
+                (time.time() - self.max_age_seconds,)
+            )
+        return cursor.rowcount
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """获取缓存命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) * 100 if lookups else 0.0
+        }
+
+    def reset_statistics(self) -> None:
+        """重置命中统计，不删除缓存数据"""
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """清空缓存和命中统计"""
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """关闭缓存数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -30,16 +30,29 @@
 
 import abc
 import asyncio
+import errno
+import fnmatch
+import json
 import logging
 import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
+from typing import Any, Callable, Dict, List, Optional, Union, TypeVar, Generic
 from datetime import datetime
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+from src.parsers.file_scanner import FileEntry
 from src.exceptions.data_exceptions import (
     DataProcessingError,
     ParseError,
+    RetryableParseError,
     ValidationError,
     ErrorCodes
 )
@@ -47,8 +60,31 @@ from src.exceptions.data_exceptions import (
 
 T = TypeVar('T')
 
+# 重试后可能成功的I/O错误码（资源暂时不可用、被信号中断、设备错误、NFS句柄失效等）
+_TRANSIENT_ERRNOS = frozenset(
+    getattr(errno, name) for name in ("EAGAIN", "EINTR", "EIO", "EBUSY", "ETIMEDOUT", "ESTALE")
+    if hasattr(errno, name)
+)
 
-@dataclass
+# 文件预验证失败的(消息模板, 修复建议)，消息只在需要时格式化
+_FILE_NOT_FOUND = ("文件不存在: {}", "请检查文件路径是否正确")
+_FILE_NOT_READABLE = ("文件不可读: {}", "请检查文件权限")
+_FILE_TOO_LARGE = ("文件过大: {} bytes (限制: {} bytes)", "考虑分片处理大文件或增加大小限制")
+
+# 配置中的日志级别名到级别值的映射，构造解析器时直接查表
+_LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARN,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+
+@dataclass(slots=True)
 class ParseStatistics:
     """
     解析统计信息类
@@ -64,6 +100,11 @@ class ParseStatistics:
     2. 类型提示支持
     3. 比手动定义类更简洁
     4. 支持字段默认值
+    5. slots=True使每个文件都要更新的计数字段不经过实例__dict__
+
+    为什么计数不用array/numpy数组存储：
+    CPython中对数组元素自增要装箱取出、相加再写回，比slots属性自增慢两到三倍；
+    小整数本身有缓存，计数字段也不会产生额外的对象分配
     """
     total_files: int = 0
     successful_parses: int = 0
@@ -91,7 +132,13 @@ class ParseStatistics:
         return self.processed_records / self.parse_time
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
+        """
+        转换为字典格式
+
+        为什么保留字典字面量：
+        键都是编译期常量，字符串已驻留且哈希已缓存，解释器一次构建整个字典；
+        改为dict(zip(键元组, 值元组))或dataclasses.asdict反而更慢
+        """
         return {
             "total_files": self.total_files,
             "successful_parses": self.successful_parses,
@@ -107,8 +154,19 @@ class ParseStatistics:
             "end_time": self.end_time.isoformat() if self.end_time else None
         }
 
+    def merge(self, other: "ParseStatistics") -> None:
+        """将另一份统计的计数累加到当前统计中，起止时间保持不变"""
+        self.total_files += other.total_files
+        self.successful_parses += other.successful_parses
+        self.failed_parses += other.failed_parses
+        self.total_records += other.total_records
+        self.processed_records += other.processed_records
+        self.parse_time += other.parse_time
+        self.error_count += other.error_count
+        self.warning_count += other.warning_count
+
 
-@dataclass
+@dataclass(slots=True)
 class ParserConfig:
     """
     解析器配置类
@@ -125,6 +183,7 @@ class ParserConfig:
     - timeout: 解析超时时间，防止无限等待
     - encoding: 文件编码，统一处理文件编码问题
     - validate_after_parse: 解析后是否进行验证
+    - parse_in_process_pool: 同步解析钩子是否在进程池中执行（CPU密集的解析器绕过GIL）
     """
     strict_mode: bool = False
     max_file_size: int = 50 * 1024 * 1024  # 50MB
@@ -135,6 +194,7 @@ class ParserConfig:
     max_concurrent_tasks: int = 10
     retry_attempts: int = 3
     retry_delay: float = 1.0
+    parse_in_process_pool: bool = False
 
 
 class BaseParser(Generic[T], abc.ABC):
@@ -156,16 +216,33 @@ class BaseParser(Generic[T], abc.ABC):
 
     扩展点：
     - _parse_content(): 解析具体内容的核心逻辑
+    - _parse_content_sync(): 同步解析逻辑，由基类放到执行器中运行；
+      子类必须重写_parse_content或提供_parse_content_sync，定义类时检查
     - _validate_parsed_data(): 验证解析后的数据
     - _process_parsed_data(): 处理解析后的数据
     """
 
-    def __init__(self, config: Optional[ParserConfig] = None):
+    # 日志器名称，每个子类定义时计算一次
+    _logger_name: str = __name__ + ".BaseParser"
+
+    # 子类是否重写了_process_parsed_data；默认实现原样返回数据，未重写时解析流程直接跳过这一步
+    _has_post_processing: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 两个解析钩子都没有时在定义类时报错，而不是等到第一次解析才失败
+        if cls._parse_content is BaseParser._parse_content and not hasattr(cls, '_parse_content_sync'):
+            raise TypeError(f"{cls.__name__}必须重写_parse_content或实现_parse_content_sync")
+        cls._logger_name = cls.__module__ + "." + cls.__name__
+        cls._has_post_processing = cls._process_parsed_data is not BaseParser._process_parsed_data
+
+    def __init__(self, config: Optional[ParserConfig] = None, executor: Optional[Executor] = None):
         """
         初始化解析器
 
         参数说明：
         - config: 解析器配置对象，为None时使用默认配置
+        - executor: 执行_parse_content_sync的执行器，为None时按配置使用进程池或默认线程池
 
         初始化步骤：
         1. 设置配置对象
@@ -176,12 +253,15 @@ class BaseParser(Generic[T], abc.ABC):
         self.config = config or ParserConfig()
         self.logger = self._setup_logger()
         self.statistics = ParseStatistics()
+        # 同步解析钩子的执行器；按配置创建的进程池由解析器自己负责关闭
+        self._executor = executor
+        self._owns_executor = False
 
         # 验证配置
         self._validate_config()
 
-        self.logger.info(f"初始化解析器: {self.__class__.__name__}")
-        self.logger.debug(f"解析器配置: {self.config}")
+        self.logger.info("初始化解析器: %s", self.__class__.__name__)
+        self.logger.debug("解析器配置: %s", self.config)
 
     def _setup_logger(self) -> logging.Logger:
         """
@@ -195,11 +275,10 @@ class BaseParser(Generic[T], abc.ABC):
         返回值：
         - logging.Logger: 配置好的日志记录器
         """
-        logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
+        logger = logging.getLogger(self._logger_name)
 
         # 设置日志级别
-        log_level = getattr(logging, self.config.log_level.upper(), logging.INFO)
-        logger.setLevel(log_level)
+        logger.setLevel(_LOG_LEVELS.get(self.config.log_level.upper(), logging.INFO))
 
         return logger
 
@@ -268,71 +347,106 @@ class BaseParser(Generic[T], abc.ABC):
         5. 验证解析结果
         6. 更新统计信息
         """
-        self.statistics.total_files += 1
-        self.statistics.start_time = datetime.now()
+        return await self._parse_file_with_stats(file_path, self.statistics)
 
-        # 标准化文件路径
-        file_path = Path(file_path)
+    async def _parse_file_with_stats(
+        self,
+        file_path: Union[str, Path, FileEntry],
+        stats: ParseStatistics
+    ) -> Optional[T]:
+        """
+        解析单个文件并把计数记录到指定的统计对象
 
-        try:
-            self.logger.info(f"开始解析文件: {file_path}")
+        参数说明：
+        - file_path: 要解析的文件路径，为FileEntry时预检查复用其缓存的stat结果
+        - stats: 接收计数的统计对象，parse_file传入self.statistics，
+          parse_files为每个解析协程传入各自的局部统计
+        """
+        # 本次调用中多次使用的属性绑定为局部变量
+        config = self.config
+        logger = self.logger
+
+        stats.total_files += 1
+        # 只记录统计周期内第一次解析的开始时间，结束时间在批量解析结束或查询统计时记录
+        if stats.start_time is None:
+            stats.start_time = datetime.now()
+
+        # 标准化文件路径：已是Path时不再重新构造，字符串形式只计算一次，供日志和异常使用
+        entry = None
+        if isinstance(file_path, FileEntry):
+            entry = file_path
+            file_path = entry.path
+        path_str = os.fspath(file_path)
+        if not isinstance(file_path, Path):
+            file_path = Path(path_str)
 
-            # 步骤1: 文件预检查
-            await self._pre_validate_file(file_path)
+        try:
+            logger.info("开始解析文件: %s", path_str)
+
+            # 步骤1: 文件预检查；非严格模式下被拒绝的文件直接计数返回，不构造异常
+            rejection = self._check_file(file_path, entry)
+            if rejection is not None:
+                if config.strict_mode:
+                    raise self._rejection_error(file_path, rejection)
+                template, _, *args = rejection
+                stats.failed_parses += 1
+                stats.error_count += 1
+                logger.error("解析文件失败: %s - %s", path_str, template.format(*args))
+                return None
 
             # 步骤2: 读取文件内容
             content = await self._read_file(file_path)
 
             # 步骤3: 解析文件内容
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.perf_counter()
             parsed_data = await self._parse_content(content, file_path)
-            parse_time = asyncio.get_event_loop().time() - start_time
+            parse_time = time.perf_counter() - start_time
 
             # 步骤4: 验证解析结果
-            if self.config.validate_after_parse:
+            if config.validate_after_parse:
                 await self._validate_parsed_data(parsed_data, file_path)
 
             # 步骤5: 处理解析结果
-            processed_data = await self._process_parsed_data(parsed_data, file_path)
+            if self._has_post_processing:
+                processed_data = await self._process_parsed_data(parsed_data, file_path)
+            else:
+                processed_data = parsed_data
 
             # 更新统计信息
-            self.statistics.successful_parses += 1
-            self.statistics.parse_time += parse_time
-            if hasattr(processed_data, '__len__'):
-                self.statistics.processed_records += len(processed_data)
+            stats.successful_parses += 1
+            stats.parse_time += parse_time
+            stats.processed_records += self._record_count(processed_data)
 
-            self.logger.info(f"成功解析文件: {file_path}, 耗时: {parse_time:.2f}s")
+            logger.info("成功解析文件: %s, 耗时: %.2fs", path_str, parse_time)
 
             return processed_data
 
         except (ParseError, ValidationError) as e:
-            self.statistics.failed_parses += 1
-            self.statistics.error_count += 1
-            self.logger.error(f"解析文件失败: {file_path} - {e}")
+            stats.failed_parses += 1
+            stats.error_count += 1
+            logger.error("解析文件失败: %s - %s", path_str, e)
 
-            if self.config.strict_mode:
+            # 可重试的错误总是抛出，交给parse_file_with_retry处理
+            if config.strict_mode or isinstance(e, RetryableParseError):
                 raise
 
             return None
 
         except Exception as e:
-            self.statistics.failed_parses += 1
-            self.statistics.error_count += 1
-            error_msg = f"解析文件时发生未知错误: {file_path} - {str(e)}"
-            self.logger.error(error_msg, exc_info=True)
+            stats.failed_parses += 1
+            stats.error_count += 1
+            error_msg = f"解析文件时发生未知错误: {path_str} - {str(e)}"
+            logger.error(error_msg, exc_info=True)
 
-            if self.config.strict_mode:
+            if config.strict_mode:
                 raise ParseError(
                     error_msg,
-                    file_path=str(file_path),
+                    file_path=path_str,
                     original_error=e
                 )
 
             return None
 
-        finally:
-            self.statistics.end_time = datetime.now()
-
     async def parse_file_with_retry(self, file_path: Union[str, Path]) -> Optional[T]:
         """
         带重试机制的文件解析
@@ -352,7 +466,8 @@ class BaseParser(Generic[T], abc.ABC):
         重试策略：
         - 默认重试3次，每次延迟1秒
         - 指数退避：第n次重试延迟2^n秒
-        - 只对特定异常类型进行重试
+        - 只对RetryableParseError重试，文件不存在、格式错误等永久性错误直接抛出
+          （非严格模式下parse_file对这些错误返回None）
         """
         last_exception = None
 
@@ -360,11 +475,7 @@ class BaseParser(Generic[T], abc.ABC):
             try:
                 return await self.parse_file(file_path)
 
-            except (FileNotFoundError, PermissionError) as e:
-                # 这些错误通常不会通过重试解决，直接抛出
-                raise
-
-            except Exception as e:
+            except RetryableParseError as e:
                 last_exception = e
                 if attempt < self.config.retry_attempts:
                     delay = self.config.retry_delay * (2 ** attempt)
@@ -386,7 +497,7 @@ class BaseParser(Generic[T], abc.ABC):
 
     async def parse_files(
         self,
-        file_paths: List[Union[str, Path]]
+        file_paths: List[Union[str, Path, FileEntry]]
     ) -> List[T]:
         """
         批量解析多个文件
@@ -398,47 +509,107 @@ class BaseParser(Generic[T], abc.ABC):
         4. 支持取消操作和优雅中断
 
         参数说明：
-        - file_paths: 要解析的文件路径列表
+        - file_paths: 要解析的文件路径列表，也可以是扫描得到的FileEntry
 
         返回值：
         - List[T]: 成功解析的数据对象列表
 
         并发控制：
-        - 使用信号量限制并发数量
-        - 支持可配置的最大并发数
-        - 自动管理任务生命周期
+        - max_concurrent_tasks个解析协程共享同一个路径迭代器，各自取下一个文件解析
+        - 同时存在的协程数量只与并发数相关，而不是为每个文件创建一个协程，也不需要信号量
+        - 解析计数先记在各协程的局部统计中，协程结束时合并，批量解析期间不逐个文件写共享统计
+        - 解析协程运行在TaskGroup中，严格模式下第一个文件失败即取消其余协程并抛出该异常
+        - 结果按原始顺序返回
         """
+        # 先按扩展名过滤，不支持的文件不再调度解析任务，也不会触发stat
+        supported_paths = [file_path for file_path in file_paths if self.supports_file(file_path)]
+        if len(supported_paths) < len(file_paths):
+            self.logger.info(f"跳过 {len(file_paths) - len(supported_paths)} 个不支持的文件")
+        file_paths = supported_paths
+
         self.logger.info(f"开始批量解析 {len(file_paths)} 个文件")
 
-        # 创建信号量控制并发数
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_tasks)
+        # 按位置保存结果，保持与输入相同的顺序
+        results: List[Optional[T]] = [None] * len(file_paths)
+        # 单线程事件循环中next()不会被并发调用，迭代器可以直接在协程间共享
+        pending = iter(enumerate(file_paths))
 
-        async def parse_single_file(file_path: Union[str, Path]) -> Optional[T]:
-            async with semaphore:
-                return await self.parse_file(file_path)
+        strict_mode = self.config.strict_mode
+        if self.statistics.start_time is None:
+            self.statistics.start_time = datetime.now()
 
-        # 创建并发任务
-        tasks = [
-            parse_single_file(file_path)
-            for file_path in file_paths
-        ]
-
-        # 等待所有任务完成
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 处理结果和异常
-        successful_results = []
-        for result in results:
-            if isinstance(result, Exception):
-                self.logger.error(f"批量解析中发生异常: {result}")
-                if self.config.strict_mode:
-                    raise
-            elif result is not None:
-                successful_results.append(result)
+        async def parse_worker() -> None:
+            # 每个解析协程先累加到局部统计，退出时一次性合并到self.statistics
+            local_stats = ParseStatistics()
+            try:
+                for index, file_path in pending:
+                    try:
+                        results[index] = await self._parse_file_with_stats(file_path, local_stats)
+                    except Exception as e:
+                        self.logger.error(f"批量解析中发生异常: {e}")
+                        # 严格模式下抛出，TaskGroup随即取消其余解析协程
+                        if strict_mode:
+                            raise
+            finally:
+                self.statistics.merge(local_stats)
+
+        worker_count = max(1, min(self.config.max_concurrent_tasks, len(file_paths)))
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(worker_count):
+                    task_group.create_task(parse_worker())
+        except* Exception as error_group:
+            # 只有严格模式会走到这里，保持抛出单个解析异常的接口
+            raise error_group.exceptions[0]
+        finally:
+            self.statistics.end_time = datetime.now()
+
+        successful_results = [result for result in results if result is not None]
 
         self.logger.info(f"批量解析完成，成功解析 {len(successful_results)} 个文件")
         return successful_results
 
+    async def parse_directory(
+        self,
+        dir_path: Union[str, Path],
+        pattern: str = "*"
+    ) -> List[T]:
+        """
+        解析目录下（不递归）所有匹配的文件
+
+        参数说明：
+        - dir_path: 目录路径
+        - pattern: 文件名通配符
+
+        返回值：
+        - List[T]: 成功解析的数据对象列表，按文件名排序
+
+        为什么使用os.scandir：
+        1. 目录条目自带文件类型，判断是否为普通文件不需要stat
+        2. 条目包装为FileEntry传给parse_files，预检查时取到的stat结果缓存在条目上，
+           不必再按路径重新stat
+        """
+        def list_entries() -> List[FileEntry]:
+            with os.scandir(dir_path) as it:
+                return [
+                    FileEntry.from_dir_entry(entry)
+                    for entry in sorted(it, key=lambda e: e.name)
+                    if entry.is_file()
+                    and fnmatch.fnmatch(entry.name, pattern)
+                    and self.supports_file(entry.name)
+                ]
+
+        try:
+            entries = await asyncio.to_thread(list_entries)
+        except OSError as e:
+            raise ParseError(
+                f"读取目录失败: {dir_path} - {str(e)}",
+                file_path=str(dir_path),
+                original_error=e
+            )
+
+        return await self.parse_files(entries)
+
     async def parse_content(
         self,
         content: str,
@@ -461,7 +632,7 @@ class BaseParser(Generic[T], abc.ABC):
         - Optional[T]: 解析后的数据对象
         """
         try:
-            self.logger.debug(f"开始解析内容，来源: {source or '内存'}")
+            self.logger.debug("开始解析内容，来源: %s", source or '内存')
 
             # 解析内容
             parsed_data = await self._parse_content(content, source)
@@ -471,9 +642,12 @@ class BaseParser(Generic[T], abc.ABC):
                 await self._validate_parsed_data(parsed_data, source)
 
             # 处理结果
-            processed_data = await self._process_parsed_data(parsed_data, source)
+            if self._has_post_processing:
+                processed_data = await self._process_parsed_data(parsed_data, source)
+            else:
+                processed_data = parsed_data
 
-            self.logger.debug(f"成功解析内容，来源: {source or '内存'}")
+            self.logger.debug("成功解析内容，来源: %s", source or '内存')
             return processed_data
 
         except Exception as e:
@@ -500,41 +674,71 @@ class BaseParser(Generic[T], abc.ABC):
         异常：
         - ParseError: 文件预验证失败时抛出
         """
-        # 检查文件是否存在
-        if not file_path.exists():
-            raise ParseError(
-                f"文件不存在: {file_path}",
-                file_path=str(file_path),
-                suggestion="请检查文件路径是否正确"
-            )
+        rejection = self._check_file(file_path)
+        if rejection is not None:
+            raise self._rejection_error(file_path, rejection)
+
+    def _check_file(self, file_path: Path, entry: Optional[FileEntry] = None) -> Optional[tuple]:
+        """
+        检查文件能否解析，不抛出异常 (可重写)
+
+        参数说明：
+        - file_path: 文件路径
+        - entry: 扫描得到的文件条目，提供时使用其缓存的stat结果
+
+        返回值：
+        - Optional[tuple]: 通过时为None，否则为(消息模板, 修复建议, 模板参数...)
+
+        为什么只调用一次stat：
+        存在性和文件大小都可以从同一个stat结果得到，
+        批量解析大量文件时每个文件少两次系统调用
+
+        为什么不直接抛出异常：
+        大批量被拒绝的文件（例如大量超限文件）在非严格模式下只需计数和记录日志，
+        返回描述可以省去每个文件构造异常、捕获回溯的开销
+        """
+        # 检查文件是否存在（同时取得文件大小）
+        try:
+            st = entry.stat() if entry is not None else os.stat(file_path)
+        except PermissionError:
+            return (*_FILE_NOT_READABLE, file_path)
+        except OSError:
+            return (*_FILE_NOT_FOUND, file_path)
 
         # 检查文件是否可读
         if not os.access(file_path, os.R_OK):
-            raise ParseError(
-                f"文件不可读: {file_path}",
-                file_path=str(file_path),
-                suggestion="请检查文件权限"
-            )
+            return (*_FILE_NOT_READABLE, file_path)
 
         # 检查文件大小
-        file_size = file_path.stat().st_size
-        if file_size > self.config.max_file_size:
-            raise ParseError(
-                f"文件过大: {file_size} bytes (限制: {self.config.max_file_size} bytes)",
-                file_path=str(file_path),
-                suggestion="考虑分片处理大文件或增加大小限制"
-            )
+        if st.st_size > self.config.max_file_size:
+            return (*_FILE_TOO_LARGE, st.st_size, self.config.max_file_size)
+
+        return None
+
+    @staticmethod
+    def _rejection_error(file_path: Path, rejection: tuple) -> ParseError:
+        """把_check_file返回的描述转换为ParseError"""
+        template, suggestion, *args = rejection
+        return ParseError(
+            template.format(*args),
+            file_path=str(file_path),
+            suggestion=suggestion
+        )
 
     async def _read_file(self, file_path: Path) -> str:
         """
         读取文件内容
 
         设计思路：
-        1. 使用异步I/O避免阻塞
+        1. 在线程中一次性读取全部字节，避免阻塞事件循环
         2. 支持多种文件编码
         3. 处理读取超时
         4. 统一的错误处理
 
+        为什么不使用逐块的异步读取：
+        文件大小已受max_file_size限制，一次read_bytes只需一次线程切换和一次解码；
+        异步文件对象的每次分块读取都要经过线程池并做增量解码，纯属额外开销
+
         参数说明：
         - file_path: 要读取的文件路径
 
@@ -544,20 +748,9 @@ class BaseParser(Generic[T], abc.ABC):
         异常：
         - ParseError: 文件读取失败时抛出
         """
+        data = await self._read_bytes(file_path)
         try:
-            async with asyncio.wait_for(
-                aiofiles.open(file_path, 'r', encoding=self.config.encoding),
-                timeout=self.config.timeout
-            ) as file:
-                content = await file.read()
-                return content
-
-        except asyncio.TimeoutError:
-            raise ParseError(
-                f"读取文件超时: {file_path}",
-                file_path=str(file_path),
-                suggestion=f"检查文件大小或增加超时时间 (当前: {self.config.timeout}s)"
-            )
+            return data.decode(self.config.encoding)
         except UnicodeDecodeError as e:
             raise ParseError(
                 f"文件编码错误: {file_path}",
@@ -565,20 +758,44 @@ class BaseParser(Generic[T], abc.ABC):
                 suggestion=f"尝试使用其他编码 (当前: {self.config.encoding})",
                 original_error=e
             )
+
+    async def _read_bytes(self, file_path: Path) -> bytes:
+        """
+        在线程中读取文件的全部字节
+
+        返回值：
+        - bytes: 文件原始内容，可以直接交给接受字节的解析库而不必先解码
+
+        异常：
+        - RetryableParseError: 读取超时或暂时性I/O错误
+        - ParseError: 其他读取失败
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(file_path.read_bytes),
+                timeout=self.config.timeout
+            )
+
+        except asyncio.TimeoutError:
+            raise RetryableParseError(
+                f"读取文件超时: {file_path}",
+                file_path=str(file_path),
+                suggestion=f"检查文件大小或增加超时时间 (当前: {self.config.timeout}s)"
+            )
         except OSError as e:
-            raise ParseError(
+            error_class = RetryableParseError if e.errno in _TRANSIENT_ERRNOS else ParseError
+            raise error_class(
                 f"读取文件失败: {file_path} - {str(e)}",
                 file_path=str(file_path),
                 original_error=e
             )
 
-    @abc.abstractmethod
     async def _parse_content(self, content: str, source: Optional[Union[str, Path]] = None) -> T:
         """
-        解析文件内容的核心逻辑 (抽象方法)
+        解析文件内容的核心逻辑 (可重写)
 
         设计思路：
-        1. 子类必须实现的具体解析逻辑
+        1. 子类实现的具体解析逻辑
         2. 将字符串内容转换为结构化数据
         3. 处理解析过程中的异常
         4. 返回解析后的数据对象
@@ -590,12 +807,41 @@ class BaseParser(Generic[T], abc.ABC):
         返回值：
         - T: 解析后的数据对象
 
+        默认实现：
+        - 在执行器中运行_parse_content_sync，事件循环不被解析阻塞
+
         注意事项：
-        - 这个方法是抽象的，子类必须实现
+        - 子类重写本方法或实现_parse_content_sync之一，__init_subclass__保证至少有一个
+        - 解析是CPU密集的同步代码时应实现_parse_content_sync，
+          直接写在async方法中会阻塞事件循环，parse_files的并发形同虚设
+        - _parse_content_sync在执行器中运行：配置parse_in_process_pool时为进程池，
+          解析器实例会被序列化到子进程，因此实现中不应修改实例状态（包括统计信息）
         - 可以抛出特定类型的解析异常
         - 异常会被基类统一处理
         """
-        pass
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._parse_content_sync, content, source)
+
+    def _get_executor(self) -> Optional[Executor]:
+        """获取同步解析钩子的执行器，按配置首次使用时创建进程池"""
+        if self._executor is None and self.config.parse_in_process_pool:
+            self._executor = ProcessPoolExecutor(max_workers=self.config.max_concurrent_tasks)
+            self._owns_executor = True
+        return self._executor
+
+    def close(self) -> None:
+        """关闭解析器自己创建的进程池"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._owns_executor = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 进程池中执行同步钩子时实例会被序列化，执行器本身不可序列化也不需要传给子进程
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_owns_executor'] = False
+        return state
 
     async def _validate_parsed_data(self, data: T, source: Optional[Union[str, Path]] = None) -> None:
         """
@@ -645,13 +891,36 @@ class BaseParser(Generic[T], abc.ABC):
         """
         return data
 
+    def _record_count(self, data: T) -> int:
+        """
+        统计处理结果包含的记录数 (可重写)
+
+        参数说明：
+        - data: _process_parsed_data的返回值
+
+        返回值：
+        - int: 记录数，结果不支持len()时为0
+
+        默认实现：
+        - 直接调用len()，不支持时按0条计算；子类知道结果类型时可以重写为直接取长度
+        """
+        try:
+            return len(data)
+        except TypeError:
+            return 0
+
     def get_statistics(self) -> ParseStatistics:
         """
         获取解析统计信息
 
         返回值：
         - ParseStatistics: 包含详细统计信息的对象
+
+        结束时间：
+        parse_file不再逐个文件记录时间戳，查询时以当前时间作为统计周期的结束时间
         """
+        if self.statistics.start_time is not None:
+            self.statistics.end_time = datetime.now()
         return self.statistics
 
     def reset_statistics(self) -> None:
@@ -697,11 +966,18 @@ class BaseParser(Generic[T], abc.ABC):
         - 如果支持列表为空，支持所有文件
         - 否则检查扩展名
         """
-        if not self.get_supported_extensions():
-            return True
+        supported = self._supported_extension_set
+        return not supported or Path(file_path).suffix.lower() in supported
 
-        file_ext = Path(file_path).suffix.lower()
-        return file_ext in [ext.lower() for ext in self.get_supported_extensions()]
+    @cached_property
+    def _supported_extension_set(self) -> frozenset:
+        """
+        小写扩展名集合，首次使用时计算一次
+
+        为什么延迟计算：
+        子类可能在调用基类__init__之后才设置get_supported_extensions依赖的属性
+        """
+        return frozenset(ext.lower() for ext in self.get_supported_extensions())
 
     async def validate_file(self, file_path: Union[str, Path]) -> bool:
         """
@@ -724,4 +1000,99 @@ class BaseParser(Generic[T], abc.ABC):
             return self.supports_file(file_path)
         except Exception as e:
             self.logger.warning(f"文件验证失败: {file_path} - {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+class JSONBaseParser(BaseParser[T]):
+    """
+    JSON文件解析器基类
+
+    设计思路：
+    1. 读取文件时直接保留字节，由C实现的解析库解析，省去先解码为str的一步
+    2. 解析后端按注册顺序尝试，前一个失败时回退到下一个
+    3. 所有后端都失败时用标准库按配置的编码解析，错误信息带行列号
+    4. 子类只需重写_from_json，把解析出的对象转换为T
+
+    为什么需要后端注册：
+    - orjson等库比标准库json快数倍，但属于可选依赖
+    - 不同部署环境可用的库不同，子类可以注册自己的后端而不修改基类
+
+    使用示例：
+    >>> class SignatureParser(JSONBaseParser[dict]):
+    ...     def _from_json(self, data, source=None):
+    ...         return data["signatures"]
+    >>> SignatureParser.register_backend("rapidjson", rapidjson.loads)
+    """
+
+    # 后端名称到loads函数的映射，按插入顺序尝试；loads需接受bytes，解析失败时抛出ValueError
+    _backends: Dict[str, Callable[[bytes], Any]] = {}
+
+    @classmethod
+    def register_backend(cls, name: str, loads: Callable[[bytes], Any]) -> None:
+        """
+        为当前类及其子类注册解析后端
+
+        参数说明：
+        - name: 后端名称，重复注册时替换原有函数
+        - loads: 接受bytes返回解析结果的函数
+        """
+        # 首次在子类上注册时复制一份，不影响父类和兄弟类
+        if '_backends' not in cls.__dict__:
+            cls._backends = dict(cls._backends)
+        cls._backends[name] = loads
+
+    def get_supported_extensions(self) -> List[str]:
+        return ['.json']
+
+    async def _read_file(self, file_path: Path) -> bytes:
+        """保留原始字节，解码交给解析后端"""
+        return await self._read_bytes(file_path)
+
+    def _parse_content_sync(self, content: Union[str, bytes], source: Optional[Union[str, Path]] = None) -> T:
+        """
+        依次尝试已注册的后端，全部失败时使用标准库解析
+
+        只有解码放在回退逻辑中：_from_json抛出的异常属于转换错误，
+        换一个后端重新解码也不会成功，因此解码成功后只调用一次_from_json
+        """
+        if isinstance(content, str):
+            content = content.encode(self.config.encoding)
+
+        for loads in self._backends.values():
+            try:
+                data = loads(content)
+            except ValueError:
+                continue
+            return self._from_json(data, source)
+
+        try:
+            data = json.loads(content.decode(self.config.encoding))
+        except UnicodeDecodeError as e:
+            raise ParseError(
+                f"文件编码错误: {source}",
+                file_path=str(source) if source else None,
+                suggestion=f"尝试使用其他编码 (当前: {self.config.encoding})",
+                original_error=e
+            )
+        except json.JSONDecodeError as e:
+            raise ParseError(
+                f"JSON格式错误: {e.msg}",
+                file_path=str(source) if source else None,
+                line_number=e.lineno,
+                column_number=e.colno,
+                original_error=e
+            )
+        return self._from_json(data, source)
+
+    def _from_json(self, data: Any, source: Optional[Union[str, Path]] = None) -> T:
+        """
+        把解析出的JSON对象转换为结果类型 (可重写)
+
+        默认实现：
+        - 直接返回解析出的对象
+        """
+        return data
+
+
+if orjson is not None:
+    JSONBaseParser.register_backend("orjson", orjson.loads)
@@ -21,20 +21,117 @@ file_scanner.py - 文件系统扫描器
 """
 
 import os
+import re
 import asyncio
+import fnmatch
 import logging
+import time
+from contextlib import aclosing
 from pathlib import Path
-from typing import List, Set, Dict, Any, Optional, Callable, Iterator, Union
+from stat import S_ISDIR, S_ISREG
+from typing import List, Set, Dict, Any, Optional, Callable, Iterator, Tuple, Union, AsyncIterator
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 import concurrent.futures
 import threading
-from collections import defaultdict
+from collections import OrderedDict
 
-from src.exceptions.data_exceptions import (
-    ParseError,
-    ErrorCodes
-)
+
+@dataclass
+class FileEntry:
+    """
+    扫描到的文件条目
+
+    设计思路：
+    1. 保存扫描时得到的文件状态或os.DirEntry，后续取状态无需额外系统调用
+    2. stat()最多执行一次并缓存结果，后续解析缓存等环节直接复用
+    3. 也可以只由路径构造，用于文件列表等不经过扫描的输入
+
+    为什么不直接传递Path：
+    - Path.is_file()/is_dir()/stat()每次都会重新执行stat系统调用
+    - 扫描、缓存校验、解析各取一次文件状态，大目录下系统调用数量成倍增加
+    """
+    path: Path
+    dir_entry: Optional[os.DirEntry] = field(default=None, repr=False, compare=False)
+    _stat: Optional[os.stat_result] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry) -> 'FileEntry':
+        """由os.scandir()产出的目录条目构造"""
+        return cls(Path(entry.path), entry)
+
+    @classmethod
+    def from_stat(cls, path: Path, st: os.stat_result) -> 'FileEntry':
+        """由遍历时已取得的文件状态构造，stat()直接返回该结果"""
+        entry = cls(path)
+        entry._stat = st
+        return entry
+
+    @property
+    def name(self) -> str:
+        """文件名"""
+        return self.path.name
+
+    def stat(self) -> os.stat_result:
+        """获取文件状态，只在首次调用时执行系统调用"""
+        if self._stat is None:
+            source = self.dir_entry if self.dir_entry is not None else self.path
+            self._stat = source.stat()
+        return self._stat
+
+    @property
+    def mtime_ns(self) -> int:
+        """修改时间（纳秒）"""
+        return self.stat().st_mtime_ns
+
+    @property
+    def size(self) -> int:
+        """文件大小（字节）"""
+        return self.stat().st_size
+
+    @property
+    def inode(self) -> int:
+        """inode编号，来自scandir时无需stat"""
+        if self.dir_entry is not None:
+            return self.dir_entry.inode()
+        return self.stat().st_ino
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def __fspath__(self) -> str:
+        """支持os.fspath()/Path()，可以直接传给接受路径的函数"""
+        return os.fspath(self.path)
+
+
+# find_related_files按扩展名归类的文件，其余文件只收录与manifest同名的
+_RELATED_CATEGORIES = {'.cpp': 'cpp', '.h': 'header', '.hpp': 'header'}
+
+# 目录遍历产出项：(目录路径, 匹配文件的(路径, 文件状态)列表, 警告列表)
+WalkItem = Tuple[Optional[str], List[Tuple[str, os.stat_result]], List[str]]
+
+
+class _VisitedDirectories:
+    """
+    跟随符号链接时已遍历目录的(设备号, inode)集合
+
+    为什么需要锁：
+    并行遍历时多个线程共享同一集合，判断与加入必须是一个原子操作，
+    否则两个线程可能同时认领同一目录，其中的文件被重复产出
+    """
+
+    def __init__(self):
+        self._keys: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, dir_stat: os.stat_result) -> bool:
+        """认领目录，目录此前未被遍历过时返回True"""
+        key = (dir_stat.st_dev, dir_stat.st_ino)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
 
 
 @dataclass
@@ -62,6 +159,7 @@ class ScanResult:
     warnings: List[str] = field(default_factory=list)
     scan_start_time: Optional[datetime] = None
     scan_end_time: Optional[datetime] = None
+    _seen: Set[Path] = field(default_factory=set, init=False, repr=False, compare=False)
 
     def add_file(self, file_path: Path) -> None:
         """
@@ -74,8 +172,14 @@ class ScanResult:
         1. 可以进行重复检查
         2. 可以触发统计更新
         3. 便于扩展其他功能
+
+        重复检查使用集合，不在列表中线性查找；
+        files被直接修改过（与集合大小不一致）时先按当前列表重建集合
         """
-        if file_path not in self.files:
+        if len(self._seen) != len(self.files):
+            self._seen = set(self.files)
+        if file_path not in self._seen:
+            self._seen.add(file_path)
             self.files.append(file_path)
             self.files_found += 1
 
@@ -88,8 +192,8 @@ class ScanResult:
         self.warnings.append(warning_msg)
 
     def get_file_count(self) -> int:
-        """获取文件数量"""
-        return len(self.files)
+        """获取文件数量（流式扫描时files为空，以files_found计数为准）"""
+        return self.files_found
 
     def get_summary(self) -> str:
         """
@@ -138,12 +242,19 @@ class ScanResult:
         filtered.scan_time = self.scan_time
         filtered.directories_scanned = self.directories_scanned
 
-        # 标准化扩展名格式
-        normalized_exts = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in extensions]
+        # 标准化扩展名格式，只计算一次
+        normalized_exts = frozenset(
+            ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in extensions
+        )
 
-        for file_path in self.files:
-            if file_path.suffix.lower() in normalized_exts:
-                filtered.add_file(file_path)
+        # 按文件名最后一个点之后的部分比较，与Path.suffix一致，
+        # 但不经过Path.suffix的解析；files本身无重复，不逐个调用add_file去重
+        filtered.files = [
+            file_path for file_path in self.files
+            if (dot := file_path.name.rfind('.')) > 0
+            and file_path.name[dot:].lower() in normalized_exts
+        ]
+        filtered.files_found = len(filtered.files)
 
         return filtered
 
@@ -190,12 +301,25 @@ class FileScanner:
     4. 支持复杂的过滤和匹配逻辑
     """
 
+    # 每次线程池调用最多遍历的目录数，目录多而每个目录文件少时摊薄线程切换开销
+    WALK_BATCH_DIRECTORIES = 64
+
+    # 支持的预定义文件模式，所有实例共用
+    SUPPORTED_PATTERNS: Dict[str, str] = {
+        'manifest': 'manifest.json',
+        'cpp': '*.cpp',
+        'header': '*.h',
+        'all': '*'
+    }
+
     def __init__(
         self,
         max_workers: int = 4,
         max_depth: Optional[int] = None,
         follow_symlinks: bool = False,
-        timeout: float = 300.0
+        timeout: float = 300.0,
+        parallel: bool = False,
+        related_cache_size: int = 4096
     ):
         """
         初始化文件扫描器
@@ -205,12 +329,15 @@ class FileScanner:
         - max_depth: 最大扫描深度，None表示无限制
         - follow_symlinks: 是否跟随符号链接
         - timeout: 扫描超时时间（秒）
+        - parallel: 是否并行遍历根目录下的各子目录树，适用于目录读取延迟高的网络存储
+        - related_cache_size: find_related_files缓存的目录列表数上限，0表示不缓存
 
         设计考虑：
         1. max_workers: 平衡CPU使用率和扫描速度
         2. max_depth: 避免无限递归
         3. follow_symlinks: 安全性考虑，默认不跟随
         4. timeout: 防止扫描无限期运行
+        5. parallel: 本地磁盘上顺序遍历更快，并行遍历默认关闭
 
         性能考虑：
         1. 线程池大小影响并发性能
@@ -221,8 +348,21 @@ class FileScanner:
         self.max_depth = max_depth
         self.follow_symlinks = follow_symlinks
         self.timeout = timeout
+        self.parallel = parallel
+        self.related_cache_size = related_cache_size
         self.logger = logging.getLogger(__name__)
 
+        # find_related_files的目录列表缓存：目录路径 -> (目录st_mtime_ns, ((文件名, 是否为文件), ...))
+        # 在扫描线程池中读写，访问时加锁
+        self._related_cache: 'OrderedDict[str, Tuple[int, Tuple[Tuple[str, bool], ...]]]' = OrderedDict()
+        self._related_cache_lock = threading.Lock()
+
+        # 扫描专用线程池，目录遍历不与解析时的文件读取等共用默认线程池
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="scan"
+        )
+
         # 扫描统计信息
         self.stats = {
             'total_scans': 0,
@@ -233,14 +373,6 @@ class FileScanner:
             'scan_errors': 0
         }
 
-        # 支持的文件模式
-        self.supported_patterns = {
-            'manifest': '*.json',
-            'cpp': '*.cpp',
-            'header': '*.h',
-            'all': '*'
-        }
-
     async def scan_directory(
         self,
         root_path: Union[str, Path],
@@ -273,8 +405,90 @@ class FileScanner:
         2. 批量文件处理
         3. 智能缓存和去重
         """
-        start_time = asyncio.get_event_loop().time()
         result = ScanResult()
+
+        try:
+            async with aclosing(
+                self._iter_scan_batches(root_path, pattern, recursive, filter_func, result)
+            ) as batches:
+                async for batch in batches:
+                    # 批次已计入files_found，这里只收集路径
+                    result.files.extend(entry_path for entry_path, _ in batch)
+
+        except asyncio.TimeoutError:
+            error_msg = f"扫描超时: {self.timeout}秒"
+            result.add_error(error_msg)
+            self.logger.error(error_msg)
+
+        except Exception as e:
+            error_msg = f"扫描过程中发生错误: {str(e)}"
+            result.add_error(error_msg)
+            self.logger.error(error_msg, exc_info=True)
+
+        return result
+
+    async def iter_scan_directory(
+        self,
+        root_path: Union[str, Path],
+        pattern: str = "manifest",
+        recursive: bool = True,
+        filter_func: Optional[Callable[[Path], bool]] = None,
+        result: Optional[ScanResult] = None
+    ) -> AsyncIterator[FileEntry]:
+        """
+        流式扫描目录，边发现边产出匹配的文件
+
+        参数说明：
+        - root_path: 根目录路径
+        - pattern: 文件模式，同scan_directory
+        - recursive: 是否递归扫描子目录
+        - filter_func: 自定义过滤函数
+        - result: 可选的扫描结果对象，扫描过程中增量更新计数、错误和警告，
+          但不保存文件路径
+
+        产出值：
+        - FileEntry: 匹配的文件条目，携带遍历时取得的文件状态
+
+        为什么使用异步生成器：
+        1. 调用方可以在扫描进行中就开始处理文件，不必等待整个目录树扫描完成
+        2. 不需要在内存中保存完整的文件列表，内存占用与文件数无关
+        3. 调用方处理较慢时扫描自动暂停
+
+        遍历策略：
+        目录树由os.fwalk()在线程池中遍历，每次线程池调用推进WALK_BATCH_DIRECTORIES个目录，
+        不阻塞事件循环。模式匹配在线程中按文件名完成，只为匹配的文件构造Path。
+        启用parallel时根目录下的各子目录树并行遍历，产出顺序不变
+        """
+        async with aclosing(
+            self._iter_scan_batches(root_path, pattern, recursive, filter_func, result)
+        ) as batches:
+            async for batch in batches:
+                for entry_path, st in batch:
+                    yield FileEntry.from_stat(entry_path, st)
+
+    async def _iter_scan_batches(
+        self,
+        root_path: Union[str, Path],
+        pattern: str,
+        recursive: bool,
+        filter_func: Optional[Callable[[Path], bool]],
+        result: Optional[ScanResult]
+    ) -> AsyncIterator[List[Tuple[Path, os.stat_result]]]:
+        """
+        流式扫描目录，每次线程池遍历调用（最多WALK_BATCH_DIRECTORIES个目录）
+        产出一批通过过滤的(文件路径, 文件状态)
+
+        参数说明同iter_scan_directory
+
+        为什么成批产出：
+        1. scan_directory只需要路径列表，整批extend到结果中，
+           不必为每个文件经过一次异步生成器切换和FileEntry构造
+        2. 每个目录通常只有一两个匹配文件，按线程池调用而不是按目录成批，
+           异步生成器各层之间的切换次数随之减少
+        """
+        if result is None:
+            result = ScanResult()
+        start_ns = time.perf_counter_ns()
         result.scan_start_time = datetime.now()
 
         # 标准化路径
@@ -282,40 +496,252 @@ class FileScanner:
 
         # 验证根目录
         if not await self._validate_root_directory(root_path, result):
-            return result
+            return
 
         # 解析文件模式
         file_pattern = self._parse_file_pattern(pattern)
         self.logger.info(f"开始扫描目录: {root_path}, 模式: {file_pattern}")
 
+        # 并行遍历时根目录的子目录树交给_iter_subtrees，这里只遍历根目录本身
+        subtrees: Optional[List[Tuple[str, int]]] = (
+            [] if self.parallel and recursive and self.max_workers > 1 else None
+        )
+        # 跟随符号链接时按(设备号, inode)记录已遍历的目录，避免链接成环时无限遍历
+        visited = _VisitedDirectories() if self.follow_symlinks else None
+        walker = self._walk_directories(
+            str(root_path), file_pattern, recursive, subtrees=subtrees, visited=visited
+        )
         try:
-            if recursive:
-                # 递归扫描
-                await self._scan_recursive(root_path, file_pattern, filter_func, result, 0)
-            else:
-                # 仅扫描当前目录
-                await self._scan_single_directory(root_path, file_pattern, filter_func, result)
-
-            # 计算扫描时间
-            result.scan_time = asyncio.get_event_loop().time() - start_time
+            async with aclosing(self._iter_walk(walker, subtrees, file_pattern, visited)) as walk_batches:
+                async for walk_batch in walk_batches:
+                    batch = []
+                    for dirpath, matched, warnings in walk_batch:
+                        if dirpath is not None:
+                            result.directories_scanned += 1
+                        for warning in warnings:
+                            result.add_warning(warning)
+
+                        if filter_func is None:
+                            batch.extend((Path(path_str), st) for path_str, st in matched)
+                        else:
+                            for path_str, st in matched:
+                                entry_path = Path(path_str)
+                                if self._accept_file(entry_path, filter_func, result):
+                                    batch.append((entry_path, st))
+
+                    if batch:
+                        result.files_found += len(batch)
+                        yield batch
+
+        finally:
+            # 计算扫描时间并更新统计信息（调用方提前结束迭代时同样执行）
+            result.scan_time = (time.perf_counter_ns() - start_ns) / 1e9
             result.scan_end_time = datetime.now()
-
-            # 更新统计信息
             self._update_statistics(result)
 
             self.logger.info(f"扫描完成: {result.get_summary()}")
 
-        except asyncio.TimeoutError:
-            error_msg = f"扫描超时: {self.timeout}秒"
-            result.add_error(error_msg)
-            self.logger.error(error_msg)
+    async def _iter_walk(
+        self,
+        walker: Iterator[WalkItem],
+        subtrees: Optional[List[Tuple[str, int]]],
+        file_pattern: str,
+        visited: Optional[_VisitedDirectories] = None
+    ) -> AsyncIterator[List[WalkItem]]:
+        """
+        在扫描线程池中推进遍历生成器，按线程池调用成批产出目录遍历结果
 
-        except Exception as e:
-            error_msg = f"扫描过程中发生错误: {str(e)}"
-            result.add_error(error_msg)
-            self.logger.error(error_msg, exc_info=True)
+        参数说明：
+        - walker: 根目录的遍历生成器
+        - subtrees: 根目录遍历完成后收集到的子目录树，None表示不并行遍历
+        - file_pattern: 文件匹配模式
+        - visited: 已遍历目录的集合，与子目录树的遍历共享
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = await loop.run_in_executor(self._executor, self._next_walk_batch, walker)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            self._close_walker(walker)
+
+        if subtrees:
+            async with aclosing(self._iter_subtrees(subtrees, file_pattern, visited)) as batches:
+                async for batch in batches:
+                    yield batch
+
+    async def _iter_subtrees(
+        self,
+        subtrees: List[Tuple[str, int]],
+        file_pattern: str,
+        visited: Optional[_VisitedDirectories] = None
+    ) -> AsyncIterator[List[WalkItem]]:
+        """
+        并行遍历多个子目录树，按子目录顺序成批产出结果
 
-        return result
+        参数说明：
+        - subtrees: (子目录路径, 深度)列表
+
+        设计思路：
+        1. 每个子目录树由一个生产者任务在扫描线程池中遍历，结果放入该子树自己的队列
+        2. 同时进行的生产者不超过max_workers个，当前子树读完后才启动下一个
+        3. 消费端按子目录顺序读取队列，产出顺序与顺序遍历完全相同
+        4. 队列有界，调用方处理较慢时各生产者随之暂停
+
+        为什么不是一个共享的目录队列：
+        - 共享队列的产出顺序取决于线程调度，同一目录树每次导入的顺序都可能不同
+        - 每个目录单独提交线程池又回到了逐目录切换线程的开销，
+          按子树分配可以继续在一次线程池调用中推进多个目录
+        """
+        loop = asyncio.get_running_loop()
+
+        async def produce(top: str, depth: int, queue: asyncio.Queue) -> None:
+            walker = self._walk_directories(top, file_pattern, True, depth=depth, visited=visited)
+            try:
+                while True:
+                    batch = await loop.run_in_executor(self._executor, self._next_walk_batch, walker)
+                    await queue.put(batch)
+                    if not batch:
+                        return
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                self._close_walker(walker)
+
+        pending = iter(subtrees)
+        running: List[Tuple[asyncio.Task, asyncio.Queue]] = []
+
+        def start_next() -> None:
+            for top, depth in pending:
+                queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+                running.append((asyncio.create_task(produce(top, depth, queue)), queue))
+                return
+
+        for _ in range(self.max_workers):
+            start_next()
+
+        try:
+            while running:
+                _, queue = running[0]
+                while True:
+                    batch = await queue.get()
+                    if isinstance(batch, Exception):
+                        raise batch
+                    if not batch:
+                        break
+                    yield batch
+                running.pop(0)
+                start_next()
+        finally:
+            for task, _ in running:
+                task.cancel()
+
+    @staticmethod
+    def _close_walker(walker: Iterator[WalkItem]) -> None:
+        """关闭遍历生成器，释放其持有的目录文件描述符"""
+        try:
+            walker.close()
+        except ValueError:
+            # 被取消时线程池中的遍历可能仍在执行，结束后生成器由垃圾回收关闭目录句柄
+            pass
+
+    def _walk_directories(
+        self,
+        top: str,
+        file_pattern: str,
+        recursive: bool,
+        depth: int = 0,
+        subtrees: Optional[List[Tuple[str, int]]] = None,
+        visited: Optional[_VisitedDirectories] = None
+    ) -> Iterator[WalkItem]:
+        """
+        同步遍历目录树，在线程池中执行
+
+        参数说明：
+        - top: 遍历起点目录
+        - file_pattern: 文件匹配模式
+        - recursive: 是否进入子目录
+        - depth: 起点目录相对扫描根目录的深度
+        - subtrees: 不为None时只遍历起点目录本身，其子目录以(路径, 深度)追加到该列表
+        - visited: 不为None时跳过已被认领的目录
+
+        产出值：
+        - (目录路径, 匹配文件的(路径, 文件状态)列表, 警告列表)，每个目录一项；
+          最后一个目录之后才出现的警告以目录路径为None的一项产出
+
+        为什么使用os.fwalk()：
+        1. 遍历持有目录文件描述符，文件状态通过相对目录的fstatat获取，
+           不必为每个条目重新解析完整路径
+        2. 文件名列表先做模式匹配，未匹配的条目不构造任何路径对象
+        3. 匹配文件的stat结果随条目返回，解析阶段预检查不再重复stat
+        """
+        filter_names = self._pattern_filter(file_pattern)
+        warnings: List[str] = []
+
+        def on_error(error: OSError) -> None:
+            warnings.append(f"无法访问 {error.filename}: {error}")
+
+        # 目录深度，扫描根目录为0
+        depths = {top: depth}
+        # 逐条目循环中使用的属性和函数先取到局部变量
+        follow_symlinks = self.follow_symlinks
+        stat_entry = os.stat
+        sep = os.sep
+        for dirpath, dirnames, filenames, dirfd in os.fwalk(
+            top, onerror=on_error, follow_symlinks=follow_symlinks
+        ):
+            depth = depths.pop(dirpath, 0)
+            # 与os.path.join结果相同，逐条目拼接时省去join的参数检查
+            prefix = dirpath if dirpath.endswith(sep) else dirpath + sep
+
+            if visited is not None and not visited.claim(os.fstat(dirfd)):
+                warnings.append(f"跳过已扫描的目录（符号链接重复或成环）: {dirpath}")
+                dirnames[:] = []
+                continue
+
+            if dirnames:
+                if not recursive:
+                    dirnames[:] = []
+                elif self.max_depth is not None and depth + 1 >= self.max_depth:
+                    warnings.append(f"达到最大深度限制: {self.max_depth}")
+                    dirnames[:] = []
+                elif subtrees is not None:
+                    subtrees.extend((prefix + name, depth + 1) for name in dirnames)
+                    dirnames[:] = []
+                else:
+                    for name in dirnames:
+                        depths[prefix + name] = depth + 1
+
+            matched = []
+            for name in filter_names(dirpath, filenames):
+                path_str = prefix + name
+                try:
+                    st = stat_entry(name, dir_fd=dirfd, follow_symlinks=follow_symlinks)
+                except OSError as e:
+                    warnings.append(f"无法访问 {path_str}: {str(e)}")
+                    continue
+                if S_ISREG(st.st_mode):
+                    matched.append((path_str, st))
+
+            yield dirpath, matched, warnings
+            warnings = []
+
+        if warnings:
+            yield None, [], warnings
+
+    def _next_walk_batch(
+        self,
+        walker: Iterator[WalkItem]
+    ) -> List[WalkItem]:
+        """从遍历生成器取下一批目录，遍历结束时返回空列表"""
+        batch = []
+        for item in walker:
+            batch.append(item)
+            if len(batch) >= self.WALK_BATCH_DIRECTORIES:
+                break
+        return batch
 
     async def _validate_root_directory(self, root_path: Path, result: ScanResult) -> bool:
         """
@@ -328,14 +754,21 @@ class FileScanner:
 
         返回值：
         - bool: 验证是否通过
+
+        只执行一次stat，存在性和目录类型都由同一个结果判断
         """
         # 检查目录是否存在
-        if not root_path.exists():
+        try:
+            st = root_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
             result.add_error(f"根目录不存在: {root_path}")
             return False
+        except OSError as e:
+            result.add_error(f"无法访问根目录 {root_path}: {e}")
+            return False
 
         # 检查是否为目录
-        if not root_path.is_dir():
+        if not S_ISDIR(st.st_mode):
             result.add_error(f"路径不是目录: {root_path}")
             return False
 
@@ -357,190 +790,94 @@ class FileScanner:
         - str: 标准化的文件模式
 
         支持的模式：
-        - manifest: *.json
+        - manifest: manifest.json
         - cpp: *.cpp
         - header: *.h
         - all: *
         - 自定义模式: 如*.txt, **/*.py等
         """
-        # 预定义模式
-        if pattern in self.supported_patterns:
-            return self.supported_patterns[pattern]
-
-        # 自定义模式直接返回
-        return pattern
-
-    async def _scan_recursive(
-        self,
-        directory: Path,
-        pattern: str,
-        filter_func: Optional[Callable[[Path], bool]],
-        result: ScanResult,
-        current_depth: int
-    ) -> None:
-        """
-        递归扫描目录
+        # 预定义模式映射为通配符，自定义模式直接返回
+        return self.SUPPORTED_PATTERNS.get(pattern, pattern)
 
-        参数说明：
-        - directory: 当前目录路径
-        - pattern: 文件匹配模式
-        - filter_func: 自定义过滤函数
-        - result: 扫描结果对象
-        - current_depth: 当前深度
-
-        递归策略：
-        1. 广度优先遍历
-        2. 控制最大深度
-        3. 处理符号链接
-        4. 并行处理子目录
-
-        性能考虑：
-        1. 避免过深的递归
-        2. 合理控制并行度
-        3. 及时处理异常情况
-        """
-        # 检查深度限制
-        if self.max_depth is not None and current_depth >= self.max_depth:
-            result.add_warning(f"达到最大深度限制: {self.max_depth}")
-            return
-
-        try:
-            # 获取目录内容
-            entries = await self._get_directory_entries(directory)
-            result.directories_scanned += 1
-
-            # 分离文件和子目录
-            files = []
-            subdirectories = []
-
-            for entry in entries:
-                entry_path = directory / entry
-
-                try:
-                    if entry_path.is_file():
-                        files.append(entry_path)
-                    elif entry_path.is_dir():
-                        subdirectories.append(entry_path)
-                except (OSError, PermissionError) as e:
-                    result.add_warning(f"无法访问 {entry_path}: {str(e)}")
-
-            # 处理当前目录中的文件
-            await self._process_files(files, pattern, filter_func, result)
-
-            # 并行处理子目录
-            if subdirectories and self.max_workers > 1:
-                await self._scan_subdirectories_parallel(
-                    subdirectories, pattern, filter_func, result, current_depth
-                )
-            else:
-                # 顺序处理子目录
-                for subdir in subdirectories:
-                    await self._scan_recursive(subdir, pattern, filter_func, result, current_depth + 1)
-
-        except (OSError, PermissionError) as e:
-            result.add_error(f"无法扫描目录 {directory}: {str(e)}")
-
-    async def _scan_single_directory(
-        self,
-        directory: Path,
-        pattern: str,
-        filter_func: Optional[Callable[[Path], bool]],
-        result: ScanResult
-    ) -> None:
+    def _list_directory(self, directory: str) -> Tuple[Tuple[str, bool], ...]:
         """
-        扫描单个目录（非递归）
+        获取目录中的(条目名, 是否为文件)列表，在扫描线程池中执行
 
         参数说明：
         - directory: 目录路径
-        - pattern: 文件匹配模式
-        - filter_func: 自定义过滤函数
-        - result: 扫描结果对象
-        """
-        try:
-            entries = await self._get_directory_entries(directory)
-            result.directories_scanned += 1
 
-            files = [directory / entry for entry in entries if (directory / entry).is_file()]
-            await self._process_files(files, pattern, filter_func, result)
+        返回值：
+        - Tuple[Tuple[str, bool], ...]: 目录条目列表，目录无法读取时为空
 
-        except (OSError, PermissionError) as e:
-            result.add_error(f"无法扫描目录 {directory}: {str(e)}")
+        为什么使用os.scandir()：
+        目录条目自带文件类型，is_file()通常不需要stat
 
-    async def _get_directory_entries(self, directory: Path) -> List[str]:
+        为什么缓存：
+        批量处理时每个manifest都会调用find_related_files，同一目录下的多个manifest
+        不必重复读取目录；以目录的st_mtime_ns校验，目录中增删、重命名条目时
+        修改时间随之变化，缓存自动失效，命中时只需一次stat
         """
-        获取目录条目列表
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return ()
 
-        参数说明：
-        - directory: 目录路径
+        if self.related_cache_size > 0:
+            with self._related_cache_lock:
+                cached = self._related_cache.get(directory)
+                if cached is not None and cached[0] == mtime_ns:
+                    self._related_cache.move_to_end(directory)
+                    return cached[1]
 
-        返回值：
-        - List[str]: 目录条目名称列表
-
-        为什么异步化：
-        1. 避免阻塞事件循环
-        2. 对于大型目录，扫描可能耗时
-        3. 支持超时控制
+        try:
+            with os.scandir(directory) as it:
+                listing = tuple(
+                    (entry.name, entry.is_file(follow_symlinks=self.follow_symlinks))
+                    for entry in it
+                )
+        except OSError:
+            return ()
 
-        性能考虑：
-        1. 使用线程池执行阻塞操作
-        2. 控制超时时间
-        3. 处理权限问题
-        """
-        loop = asyncio.get_event_loop()
+        if self.related_cache_size > 0:
+            with self._related_cache_lock:
+                self._related_cache[directory] = (mtime_ns, listing)
+                self._related_cache.move_to_end(directory)
+                if len(self._related_cache) > self.related_cache_size:
+                    self._related_cache.popitem(last=False)
 
-        def sync_get_entries():
-            try:
-                return os.listdir(directory)
-            except (OSError, PermissionError):
-                return []
+        return listing
 
-        try:
-            return await loop.run_in_executor(None, sync_get_entries)
-        except Exception as e:
-            self.logger.warning(f"获取目录条目失败 {directory}: {e}")
-            return []
+    def clear_related_cache(self) -> None:
+        """清空find_related_files的目录列表缓存"""
+        with self._related_cache_lock:
+            self._related_cache.clear()
 
-    async def _process_files(
+    def _accept_file(
         self,
-        files: List[Path],
-        pattern: str,
+        file_path: Path,
         filter_func: Optional[Callable[[Path], bool]],
         result: ScanResult
-    ) -> None:
+    ) -> bool:
         """
-        处理文件列表
+        判断已匹配模式的文件是否应被收录
 
         参数说明：
-        - files: 文件路径列表
-        - pattern: 文件匹配模式
+        - file_path: 文件路径
         - filter_func: 自定义过滤函数
-        - result: 扫描结果对象
-
-        处理流程：
-        1. 模式匹配
-        2. 自定义过滤
-        3. 添加到结果
+        - result: 扫描结果对象，过滤函数出错时记录错误
 
-        性能优化：
-        1. 批量处理
-        2. 早期过滤
-        3. 避免重复操作
+        为什么模式匹配不在这里：
+        模式匹配在遍历线程中按文件名完成，这里只执行调用方的过滤函数，
+        过滤函数始终在事件循环线程中调用，不要求线程安全
         """
-        for file_path in files:
-            try:
-                # 模式匹配
-                if not self._match_pattern(file_path, pattern):
-                    continue
-
-                # 自定义过滤
-                if filter_func and not filter_func(file_path):
-                    continue
+        if filter_func is None:
+            return True
 
-                # 添加到结果
-                result.add_file(file_path)
-
-            except Exception as e:
-                result.add_error(f"处理文件失败 {file_path}: {str(e)}")
+        try:
+            return bool(filter_func(file_path))
+        except Exception as e:
+            result.add_error(f"处理文件失败 {file_path}: {str(e)}")
+            return False
 
     def _match_pattern(self, file_path: Path, pattern: str) -> bool:
         """
@@ -552,65 +889,59 @@ class FileScanner:
 
         返回值：
         - bool: 是否匹配
-
-        匹配策略：
-        1. 使用fnmatch进行通配符匹配
-        2. 支持简单的正则表达式
-        3. 大小写不敏感
-
-        为什么使用fnmatch：
-        1. 标准库功能
-        2. 性能较好
-        3. 支持常见的通配符模式
         """
-        import fnmatch
-
-        # 转换为字符串进行匹配
-        file_str = str(file_path)
-
-        # 支持文件名匹配和完整路径匹配
-        return (
-            fnmatch.fnmatch(file_path.name, pattern) or
-            fnmatch.fnmatch(file_str, pattern) or
-            fnmatch.fnmatch(file_str, f"**/{pattern}")
-        )
+        return bool(self._pattern_filter(pattern)(str(file_path.parent), [file_path.name]))
 
-    async def _scan_subdirectories_parallel(
-        self,
-        subdirectories: List[Path],
-        pattern: str,
-        filter_func: Optional[Callable[[Path], bool]],
-        result: ScanResult,
-        current_depth: int
-    ) -> None:
+    @staticmethod
+    def _pattern_filter(pattern: str) -> Callable[[str, List[str]], List[str]]:
         """
-        并行扫描子目录
+        构造文件模式过滤函数
 
         参数说明：
-        - subdirectories: 子目录列表
-        - pattern: 文件匹配模式
-        - filter_func: 自定义过滤函数
-        - result: 扫描结果对象
-        - current_depth: 当前深度
+        - pattern: 匹配模式
 
-        并行策略：
-        1. 使用线程池控制并发度
-        2. 每个子目录独立处理
-        3. 合并扫描结果
+        返回值：
+        - Callable[[str, List[str]], List[str]]: 接受(所在目录, 文件名列表)，
+          返回匹配的文件名列表
 
-        性能考虑：
-        1. 控制并发数量避免系统过载
-        2. 合理分配工作负载
-        3. 及时处理异常
+        匹配策略：
+        1. 使用fnmatch通配符语法，模式只编译一次，大小写不敏感
+        2. 模式不含路径分隔符时只匹配文件名，整个目录的文件名一次过滤，不拼接完整路径
+        3. 不含通配符的模式（如manifest.json）按文件名直接比较，不经过正则
+        4. 含路径分隔符时匹配完整路径，支持**/*.py等带目录的模式
+
+        为什么按目录过滤而不是逐个文件调用：
+        目录中绝大多数文件通常不匹配，一次列表推导完成过滤，
+        省去逐个文件的函数调用，未匹配的文件名不会再被处理
         """
-        # 创建任务列表
-        tasks = []
-        for subdir in subdirectories:
-            task = self._scan_recursive(subdir, pattern, filter_func, result, current_depth + 1)
-            tasks.append(task)
-
-        # 并行执行（实际中由于共享result对象，会自动同步）
-        await asyncio.gather(*tasks, return_exceptions=True)
+        if '/' not in pattern and os.sep not in pattern:
+            if not any(char in pattern for char in '*?['):
+                # 先比较长度，长度不同的文件名不做大小写转换
+                target = pattern.lower()
+                target_len = len(target)
+                return lambda directory, names: [
+                    name for name in names
+                    if len(name) == target_len and name.lower() == target
+                ]
+
+            match_name = re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+            return lambda directory, names: [name for name in names if match_name(name)]
+
+        normcase = os.path.normcase
+        match_path = re.compile(fnmatch.translate(normcase(pattern)), re.IGNORECASE).match
+        match_nested = re.compile(fnmatch.translate(normcase(f"**/{pattern}")), re.IGNORECASE).match
+
+        def filter_names(directory: str, names: List[str]) -> List[str]:
+            # 目录前缀每个目录只处理一次，逐个文件只做字符串拼接
+            prefix = normcase(directory if directory.endswith(os.sep) else directory + os.sep)
+            matched = []
+            for name in names:
+                path_str = prefix + normcase(name)
+                if match_path(path_str) or match_nested(path_str):
+                    matched.append(name)
+            return matched
+
+        return filter_names
 
     def _update_statistics(self, result: ScanResult) -> None:
         """
@@ -681,33 +1012,36 @@ class FileScanner:
             'other': []
         }
 
-        if not manifest_path.exists() or manifest_path.suffix != '.json':
+        if manifest_path.suffix != '.json':
             return related_files
 
         # 获取manifest所在目录
         parent_dir = manifest_path.parent
+        manifest_name = manifest_path.name
         base_name = manifest_path.stem
 
         try:
-            entries = await self._get_directory_entries(parent_dir)
+            loop = asyncio.get_running_loop()
+            listing = await loop.run_in_executor(self._executor, self._list_directory, str(parent_dir))
 
-            for entry in entries:
-                entry_path = parent_dir / entry
+            # manifest是否存在直接从目录列表判断，不单独stat
+            if not any(name == manifest_name for name, _ in listing):
+                return related_files
 
-                if not entry_path.is_file():
+            for name, is_file in listing:
+                if not is_file:
                     continue
 
-                # 查找CPP文件
-                if entry_path.suffix == '.cpp':
-                    related_files['cpp'].append(entry_path)
+                # 先按文件名判断，只为命中的文件构造Path；
+                # 扩展名查表分类，不经过os.path.splitext
+                dot = name.rfind('.')
+                category = _RELATED_CATEGORIES.get(name[dot:]) if dot > 0 else None
+                if category is None:
+                    if (name[:dot] if dot > 0 else name) != base_name:
+                        continue
+                    category = 'other'
 
-                # 查找头文件
-                elif entry_path.suffix in ['.h', '.hpp']:
-                    related_files['header'].append(entry_path)
-
-                # 查找其他相关文件（同名的其他类型）
-                elif entry_path.stem == base_name:
-                    related_files['other'].append(entry_path)
+                related_files[category].append(parent_dir / name)
 
         except Exception as e:
             self.logger.warning(f"查找相关文件失败 {manifest_path}: {e}")
@@ -785,4 +1119,8 @@ class FileScanner:
             'average_scan_time': 0.0,
             'scan_errors': 0
         }
-        self.logger.info("文件扫描器统计信息已重置")
\ No newline at end of file
+        self.logger.info("文件扫描器统计信息已重置")
+
+    def close(self) -> None:
+        """释放扫描线程池（不等待空闲线程退出）"""
+        self._executor.shutdown(wait=False)
@@ -20,6 +20,7 @@ manifest_parser.py - MalFocus manifest.json解析器
 >>>     print(f"成功解析: {result.data['alias']}")
 >>> else:
 >>>     print(f"解析失败: {result.get_error_summary()}")
+>>> results = await parser.parse_files(paths, concurrency=32)
 """
 
 import asyncio
@@ -28,16 +29,31 @@ import logging
 import os
 import re
 import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
-from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
 
 from src.exceptions.data_exceptions import (
     ParseError,
-    ValidationError,
-    ErrorCodes
+    ValidationError
 )
+from src.parsers.file_scanner import FileEntry
+
+# 合法的status取值：元组保持提示信息中的顺序，frozenset使成员检查为O(1)哈希查找
+_VALID_STATUS_VALUES = ('ok', 'error', 'pending', 'generated', 'failed')
+_VALID_STATUSES = frozenset(_VALID_STATUS_VALUES)
+
+# 结构验证中表示字段缺失的哨兵，与字段值为None区分
+_MISSING = object()
 
 
 @dataclass
@@ -136,7 +152,8 @@ class ManifestParseResult:
         info_parts = [status]
 
         if self.source_file:
-            info_parts.append(f"文件: {Path(self.source_file).name}")
+            # source_file来自str(Path)，不含末尾分隔符，basename与Path.name结果相同且不必构造Path
+            info_parts.append(f"文件: {os.path.basename(self.source_file)}")
 
         if self.parse_time > 0:
             info_parts.append(f"耗时: {self.parse_time:.2f}s")
@@ -147,6 +164,24 @@ class ManifestParseResult:
         return " | ".join(info_parts)
 
 
+@dataclass(slots=True)
+class ManifestParseStatistics:
+    """
+    manifest解析器的累计计数
+
+    为什么不用字典：
+    每个文件都要更新多个计数，slots属性自增不需要对键名做哈希查找，
+    与BaseParser的ParseStatistics相同；对外仍由get_statistics()返回字典
+    """
+    total_files: int = 0
+    successful_parses: int = 0
+    failed_parses: int = 0
+    total_errors: int = 0
+    total_warnings: int = 0
+    content_memo_hits: int = 0
+    parse_cache_hits: int = 0
+
+
 class ManifestParser:
     """
     MalFocus manifest.json解析器
@@ -171,7 +206,7 @@ class ManifestParser:
     """
 
     # 必需字段定义 - 为什么定义常量：便于维护和统一修改
-    REQUIRED_FIELDS = ['status', 'alias', 'summary', 'attck']
+    REQUIRED_FIELDS = ('status', 'alias', 'summary', 'attck')
 
     # 可选字段及其默认值
     OPTIONAL_FIELDS = {
@@ -184,11 +219,31 @@ class ManifestParser:
         'manifest_json': '',
         'hash_id': ''
     }
+    # 补全可选字段时遍历的(字段, 默认值)元组，类定义时生成一次
+    _OPTIONAL_FIELD_ITEMS = tuple(OPTIONAL_FIELDS.items())
 
     # ATT&CK技术ID格式验证正则表达式
     ATTACK_PATTERN = re.compile(r'^T\d{4}(\.\d{3})?(:.+)?$', re.IGNORECASE)
-
-    def __init__(self, strict_mode: bool = False, validate_attack_ids: bool = True):
+    # attck数组元素编号前缀（Txxxx 或 Txxxx.xxx），结构验证时使用
+    ATTACK_PREFIX_PATTERN = re.compile(r'^T\d{4}(\.\d+)?')
+    # 修复建议与自动修复使用的正则，同样只编译一次
+    _LEADING_NUMBER_PATTERN = re.compile(r'([Tt]*)(\d+)')
+    _ANY_NUMBER_PATTERN = re.compile(r'\d+')
+    _FIXABLE_ATTACK_PATTERN = re.compile(r'^([Tt]\d{4})')
+
+    # 小于该大小的文件直接在协程中读取和解码，线程池调度的开销比读取本身还大
+    INLINE_READ_LIMIT = 64 * 1024
+
+    # CPP文件缺失警告的前缀，复用缓存结果时据此找出需要重新检查的警告
+    CPP_MISSING_WARNING = "CPP文件不存在: "
+
+    def __init__(
+        self,
+        strict_mode: bool = False,
+        validate_attack_ids: bool = True,
+        executor: Optional[Executor] = None,
+        content_memo_size: int = 10000
+    ):
         """
         初始化解析器
 
@@ -196,6 +251,8 @@ class ManifestParser:
         - strict_mode: 严格模式，True时任何错误都导致解析失败
                            False时尝试修复数据并继续处理
         - validate_attack_ids: 是否验证ATT&CK技术ID的有效性
+        - executor: 文件读取和JSON解码使用的线程池，None时使用事件循环的默认线程池
+        - content_memo_size: 按文件内容摘要缓存的解析结果数上限，0表示不缓存
 
         为什么有strict_mode：
         1. 开发阶段使用strict_mode快速发现数据问题
@@ -209,23 +266,22 @@ class ManifestParser:
         """
         self.strict_mode = strict_mode
         self.validate_attack_ids = validate_attack_ids
+        self.executor = executor
         self.logger = logging.getLogger(__name__)
 
+        # 内容摘要 -> 与路径无关部分的解析结果，按LRU淘汰
+        self.content_memo_size = content_memo_size
+        self._content_memo: 'OrderedDict[bytes, ManifestParseResult]' = OrderedDict()
+
         # 统计信息
-        self.stats = {
-            'total_files': 0,
-            'successful_parses': 0,
-            'failed_parses': 0,
-            'total_errors': 0,
-            'total_warnings': 0
-        }
+        self.stats = ManifestParseStatistics()
 
-    async def parse_file(self, file_path: Union[str, Path]) -> ManifestParseResult:
+    async def parse_file(self, file_path: Union[str, Path, FileEntry]) -> ManifestParseResult:
         """
         解析manifest.json文件
 
         参数说明：
-        - file_path: manifest.json文件的完整路径
+        - file_path: manifest.json文件的完整路径，为FileEntry时预检查复用其缓存的stat结果
 
         返回值：
         - ManifestParseResult: 包含解析结果和错误信息
@@ -237,71 +293,124 @@ class ManifestParser:
 
         算法步骤：
         1. 文件预检查（存在性、大小、权限）
-        2. 读取文件内容
-        3. 解析JSON格式
-        4. 验证必需字段
-        5. 标准化数据格式
-        6. 验证ATT&CK技术ID
-        7. 最终数据清理
-        8. 返回解析结果
+        2. 读取文件内容并计算摘要
+        3. 解析JSON格式、验证必需字段、标准化数据格式、验证ATT&CK技术ID
+           （与路径无关，内容相同的文件复用同一份结果）
+        4. 补充路径相关信息
+        5. 最终验证
+        6. 返回解析结果
 
         性能考虑：
         1. 异步文件读取，避免阻塞
         2. 文件大小限制，防止内存问题
         3. 错误恢复机制，避免单点失败
         """
-        start_time = asyncio.get_event_loop().time()
-        self.stats['total_files'] += 1
-
-        # 标准化文件路径
-        file_path = Path(file_path)
+        start_time = time.perf_counter()
+        self.stats.total_files += 1
+
+        # 标准化文件路径，扫描得到的条目保留下来供预检查使用
+        entry = None
+        if isinstance(file_path, FileEntry):
+            entry = file_path
+            file_path = entry.path
+        else:
+            file_path = Path(file_path)
         result = ManifestParseResult(source_file=str(file_path))
 
         try:
-            self.logger.info(f"开始解析manifest文件: {file_path}")
+            self.logger.info("开始解析manifest文件: %s", file_path)
 
             # 步骤1: 文件预检查
-            await self._pre_validate_file(file_path)
+            file_size = await self._pre_validate_file(file_path, entry)
 
-            # 步骤2: 读取文件内容
-            raw_data = await self._read_json_file(file_path)
+            # 步骤2: 读取文件内容，内容已缓存时不再解码
+            digest, raw_data = await self._read_json_file(file_path, file_size=file_size)
 
-            # 步骤3: 基础结构验证
-            if not await self._validate_basic_structure(raw_data, result):
+            # 步骤3: 与路径无关的解析和验证，内容相同的文件只执行一次
+            content = self._content_memo.get(digest)
+            if content is not None:
+                self._content_memo.move_to_end(digest)
+                self.stats.content_memo_hits += 1
+            else:
+                if raw_data is None:
+                    # 读取时内容已缓存，之后又被其他文件的结果淘汰，重新读取并解码
+                    digest, raw_data = await self._read_json_file(
+                        file_path, skip_known=False, file_size=file_size
+                    )
+                content = self._parse_content(raw_data)
+                self._remember_content(digest, content)
+
+            result.errors.extend(content.errors)
+            result.warnings.extend(content.warnings)
+            if not content.is_valid:
                 return result
 
-            # 步骤4: 数据标准化和清理
-            cleaned_data = await self._clean_and_normalize_data(raw_data, result, file_path)
-
-            # 步骤5: ATT&CK技术验证
-            if self.validate_attack_ids:
-                if not await self._validate_attack_techniques(cleaned_data, result):
-                    return result
+            # 步骤4: 补充路径相关信息（只替换顶层键，缓存中的数据保持不变）
+            cleaned_data = dict(content.data)
+            self._apply_path_info(cleaned_data, result, file_path)
 
-            # 步骤6: 最终验证
-            if not await self._final_validation(cleaned_data, result):
+            # 步骤5: 最终验证
+            if not self._final_validation(cleaned_data, result):
                 return result
 
             # 成功解析
             result.is_valid = True
             result.data = cleaned_data
-            result.parse_time = asyncio.get_event_loop().time() - start_time
+            result.parse_time = time.perf_counter() - start_time
 
-            self.stats['successful_parses'] += 1
-            self.logger.info(f"成功解析manifest文件: {file_path} (耗时: {result.parse_time:.2f}s)")
+            self.stats.successful_parses += 1
+            self.logger.info("成功解析manifest文件: %s (耗时: %.2fs)", file_path, result.parse_time)
 
         except Exception as e:
             # 统一异常处理 - 捕获所有异常，确保不会因为单个文件失败而中断整个处理流程
             self._handle_parse_exception(e, file_path, result)
-            self.stats['failed_parses'] += 1
-            self.stats['total_errors'] += 1
+            self.stats.failed_parses += 1
+            self.stats.total_errors += 1
 
         # 更新统计信息
-        self.stats['total_warnings'] += len(result.warnings)
+        self.stats.total_warnings += len(result.warnings)
 
         return result
 
-    async def _pre_validate_file(self, file_path: Path) -> None:
+    async def parse_files(
+        self,
+        file_paths: List[Union[str, Path, FileEntry]],
+        concurrency: int = 32
+    ) -> List[ManifestParseResult]:
+        """
+        并发解析多个manifest文件
+
+        参数说明：
+        - file_paths: manifest.json文件路径列表，也可以是扫描得到的FileEntry
+        - concurrency: 同时解析的文件数上限
+
+        返回值：
+        - List[ManifestParseResult]: 与输入顺序一致的解析结果，失败的文件同样返回结果对象
+
+        并发控制：
+        - 与BaseParser.parse_files相同，concurrency个协程共享同一个路径迭代器，
+          各自取下一个文件解析，不为每个文件创建协程，也不需要信号量
+        - 一个文件在线程池中读取时，其他协程可以继续解析已读取的文件
+
+        为什么统计不需要额外同步：
+        parse_file只在两次await之间修改self.stats，单线程事件循环中这些修改不会交错
+        """
+        results: List[Optional[ManifestParseResult]] = [None] * len(file_paths)
+        # 单线程事件循环中next()不会被并发调用，迭代器可以直接在协程间共享
+        pending = iter(enumerate(file_paths))
+
+        async def parse_worker() -> None:
+            for index, file_path in pending:
+                results[index] = await self.parse_file(file_path)
+
+        worker_count = max(1, min(concurrency, len(file_paths)))
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(worker_count):
+                task_group.create_task(parse_worker())
+
+        return results
+
+    async def _pre_validate_file(self, file_path: Path, entry: Optional[FileEntry] = None) -> int:
         """
         文件预验证
 
@@ -311,6 +420,13 @@ class ManifestParser:
         3. 文件是否可读
         4. 文件扩展名是否正确
 
+        参数说明：
+        - file_path: 文件路径
+        - entry: 扫描得到的文件条目，提供时使用其缓存的stat结果，不再执行系统调用
+
+        返回值：
+        - int: 文件大小，读取时据此决定是否交给线程池
+
         异常：
         - ParseError: 文件预验证失败时抛出
 
@@ -319,8 +435,10 @@ class ManifestParser:
         2. 提供更友好的错误信息
         3. 保护系统资源（内存、CPU）
         """
-        # 检查文件是否存在
-        if not file_path.exists():
+        # 检查文件是否存在，同一次stat同时得到文件大小
+        try:
+            file_size = entry.stat().st_size if entry is not None else file_path.stat().st_size
+        except FileNotFoundError:
             raise ParseError(
                 f"manifest文件不存在: {file_path}",
                 file_path=str(file_path),
@@ -328,7 +446,6 @@ class ManifestParser:
             )
 
         # 检查文件大小（避免读取超大文件导致内存问题）
-        file_size = file_path.stat().st_size
         max_size = 10 * 1024 * 1024  # 10MB限制
 
         if file_size > max_size:
@@ -353,10 +470,25 @@ class ManifestParser:
                 suggestion="manifest文件应该是.json格式"
             )
 
-    async def _read_json_file(self, file_path: Path) -> Dict[str, Any]:
+        return file_size
+
+    async def _read_json_file(
+        self,
+        file_path: Path,
+        skip_known: bool = True,
+        file_size: Optional[int] = None
+    ) -> Tuple[bytes, Optional[Dict[str, Any]]]:
         """
         异步读取JSON文件内容
 
+        参数说明：
+        - file_path: 文件路径
+        - skip_known: 内容摘要已在缓存中时跳过JSON解码
+        - file_size: 预验证得到的文件大小，None时总是交给线程池
+
+        返回值：
+        - Tuple[bytes, Optional[Dict[str, Any]]]: (内容摘要, 解码后的数据)，跳过解码时数据为None
+
         设计思路：
         1. 使用异步IO避免阻塞
         2. 统一的文件编码处理
@@ -369,25 +501,29 @@ class ManifestParser:
 
         性能考虑：
         1. 文件大小在预验证中已检查
-        2. 使用异步读取，避免阻塞
-        3. 统一的编码处理
+        2. 读取、摘要和JSON解码在同一次线程池调用中完成，解码不占用事件循环
+        3. 安装了orjson时直接解码UTF-8字节，省去str解码和json模块的开销
+        4. 摘要计算远快于JSON解码，重复内容只需读取和计算摘要
+        5. 小于INLINE_READ_LIMIT的文件直接在协程中读取解码：几十微秒的工作
+           不值得一次线程切换，也不需要超时保护
         """
         try:
-            # 异步读取文件内容，使用UTF-8编码
-            loop = asyncio.get_event_loop()
+            def sync_read_and_decode():
+                with open(file_path, 'rb') as f:
+                    content = f.read()
+                digest = hashlib.blake2b(content, digest_size=16).digest()
+                # 只读的成员检查，不修改缓存，可以在线程中执行
+                if skip_known and digest in self._content_memo:
+                    return digest, None
+                return digest, self.decode_json(content)
 
-            def sync_read_file():
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    return f.read()
-
-            content = await asyncio.wait_for(
-                loop.run_in_executor(None, sync_read_file),
-                timeout=30  # 30秒超时
-            )
-
-            # 解析JSON
             try:
-                return json.loads(content)
+                if file_size is not None and file_size < self.INLINE_READ_LIMIT:
+                    return sync_read_and_decode()
+                return await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(self.executor, sync_read_and_decode),
+                    timeout=30  # 30秒超时
+                )
             except json.JSONDecodeError as e:
                 # 提供更详细的JSON错误信息
                 error_info = {
@@ -410,7 +546,32 @@ class ManifestParser:
                 suggestion="检查文件大小或磁盘性能"
             )
 
-    async def _validate_basic_structure(self, data: Dict[str, Any], result: ManifestParseResult) -> bool:
+    @staticmethod
+    def decode_json(content: bytes) -> Any:
+        """
+        解码JSON字节内容
+
+        文件导入和上传校验共用这一解码逻辑，两条路径对同一内容的判断保持一致。
+        orjson解码失败（包括非法UTF-8）时回退到标准库：
+        1. 标准库直接解析字节，编码由其自动识别，带BOM的UTF-8文件也能解析
+        2. 只有出现非法UTF-8时才按替换字符重新解码，正常文件不多做一次解码
+        3. 语法错误由标准库给出带行列号的异常
+        """
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            return json.loads(content)
+        except UnicodeDecodeError:
+            return json.loads(content.decode('utf-8', errors='replace'))
+
+    def _validate_basic_structure(
+        self,
+        data: Dict[str, Any],
+        result: ManifestParseResult
+    ) -> Optional[List[Tuple[str, str, bool]]]:
         """
         验证基础数据结构
 
@@ -424,8 +585,12 @@ class ManifestParser:
         - result: 解析结果对象，用于收集错误和警告
 
         返回值：
-        - True: 基础验证通过
-        - False: 验证失败（错误信息已添加到result）
+        - List[Tuple[str, str, bool]]: 验证通过，返回_process_attck得到的attck元素信息
+        - None: 验证失败（错误信息已添加到result）
+
+        为什么返回attck编号：
+        验证时已经拆分出每个元素的编号并完成格式匹配，标准化和ATT&CK验证阶段直接使用，
+        不必再遍历拆分一次
 
         验证策略：
         1. 严格验证必需字段
@@ -435,76 +600,170 @@ class ManifestParser:
         # 检查数据是否为字典类型
         if not isinstance(data, dict):
             result.add_error("manifest数据必须是JSON对象（字典）")
-            return False
+            return None
+
+        # 每个字段只查找一次，缺失用_MISSING表示，以区分缺失和值为None
+        get = data.get
+        add_error = result.add_error
 
         # 检查必需字段
         for field in self.REQUIRED_FIELDS:
-            if field not in data:
-                result.add_error(f"缺少必需字段: {field}")
-            elif data[field] is None:
-                result.add_error(f"必需字段为空: {field}")
+            value = get(field, _MISSING)
+            if value is _MISSING:
+                add_error(f"缺少必需字段: {field}")
+            elif value is None:
+                add_error(f"必需字段为空: {field}")
 
         # 验证status字段
-        if 'status' in data:
-            valid_statuses = ['ok', 'error', 'pending', 'generated', 'failed']
-            if data['status'] not in valid_statuses:
-                result.add_warning(f"未知的status值: {data['status']}，应为: {valid_statuses}")
+        status = get('status', _MISSING)
+        if status is not _MISSING:
+            # 非字符串（包括列表等不可哈希的值）不可能是合法取值，不做集合查找
+            if not isinstance(status, str) or status not in _VALID_STATUSES:
+                result.add_warning(f"未知的status值: {status}，应为: {list(_VALID_STATUS_VALUES)}")
 
         # 验证alias字段（严格模式：必须存在且非空）
-        if 'alias' not in data:
-            result.add_error("缺少必需字段: alias")
-        elif not data['alias']:
-            result.add_error("alias字段不能为空")
-        else:
-            alias = data['alias']
-            if not isinstance(alias, str):
-                result.add_error("alias字段必须是字符串")
-            elif len(alias.strip()) == 0:
-                result.add_error("alias字段不能为空字符串")
-            elif len(alias) > 255:
-                result.add_error("alias字段长度超过255字符")
+        alias = get('alias', _MISSING)
+        if alias is _MISSING:
+            add_error("缺少必需字段: alias")
+        elif not alias:
+            add_error("alias字段不能为空")
+        elif not isinstance(alias, str):
+            add_error("alias字段必须是字符串")
+        elif len(alias.strip()) == 0:
+            add_error("alias字段不能为空字符串")
+        elif len(alias) > 255:
+            add_error("alias字段长度超过255字符")
 
         # 验证summary字段（严格模式：必须存在且非空）
-        if 'summary' not in data:
-            result.add_error("缺少必需字段: summary")
-        elif not data['summary'] or len(str(data['summary']).strip()) == 0:
-            result.add_error("summary字段不能为空，必须提供功能描述")
+        summary = get('summary', _MISSING)
+        if summary is _MISSING:
+            add_error("缺少必需字段: summary")
+        elif not summary or len(str(summary).strip()) == 0:
+            add_error("summary字段不能为空，必须提供功能描述")
 
         # 验证attck字段（严格模式：必须存在且非空）
-        if 'attck' not in data:
-            result.add_error("缺少必需字段: attck")
-        elif not data['attck']:
-            result.add_error("attck字段不能为空")
-        elif not isinstance(data['attck'], list):
-            result.add_error("attck字段必须是数组")
-        elif len(data['attck']) == 0:
-            result.add_error("attck字段至少需要包含一个ATT&CK技术ID")
+        attack_ids = []
+        attck = get('attck', _MISSING)
+        if attck is _MISSING:
+            add_error("缺少必需字段: attck")
+        elif not attck:
+            add_error("attck字段不能为空")
+        elif not isinstance(attck, list):
+            add_error("attck字段必须是数组")
         else:
-            # 检查每个元素的类型和内容
-            import re
-            attck_pattern = re.compile(r'^T\d{4}(\.\d+)?')  # Txxxx 或 Txxxx.xxx 格式
-
-            for i, technique in enumerate(data['attck']):
-                if not isinstance(technique, str):
-                    result.add_error(f"attck数组第{i}个元素必须是字符串，当前类型: {type(technique).__name__}")
-                elif len(technique.strip()) == 0:
-                    result.add_error(f"attck数组第{i}个元素不能为空字符串")
-                else:
-                    # 提取ATT&CK编号（支持 Txxxx 或 Txxxx.xxx:[name] 格式）
-                    tech_str = str(technique).strip()
-                    # 如果包含冒号，只取冒号前的部分
-                    if ':' in tech_str:
-                        tech_id = tech_str.split(':')[0].strip()
-                    else:
-                        tech_id = tech_str
-
-                    # 验证编号格式（Txxxx 或 Txxxx.xxx）
-                    if not attck_pattern.match(tech_id.upper()):
-                        result.add_error(f"attck数组第{i}个元素格式无效: '{technique}'，应为 'Txxxx' 或 'Txxxx.xxx:[名称]' 格式")
+            attack_ids = self._process_attck(attck, result)
 
-        return len(result.errors) == 0
+        return attack_ids if not result.errors else None
 
-    async def _clean_and_normalize_data(self, raw_data: Dict[str, Any], result: ManifestParseResult, file_path: Path) -> Dict[str, Any]:
+    def _process_attck(self, raw_list: List[Any], result: ManifestParseResult) -> List[Tuple[str, str, bool]]:
+        """
+        一次遍历完成attck数组的类型检查、编号提取和格式匹配
+
+        参数说明：
+        - raw_list: 原始attck数组
+        - result: 解析结果对象，结构错误直接添加到其中
+
+        返回值：
+        - List[Tuple[str, str, bool]]: 通过结构检查的元素(原始值, 大写编号, 编号是否符合ATTACK_PATTERN)
+
+        为什么在这里完成ATTACK_PATTERN匹配：
+        标准化和ATT&CK验证原先各自再遍历一次数组，这里顺带记录匹配结果，
+        后两步只读取结果；错误和警告仍在原来的步骤中按原顺序添加
+
+        为什么先做下标检查：
+        规范编号不需要进入正则引擎，下标比较和isdecimal()的开销约为正则匹配的一半
+        """
+        attack_ids = []
+        append = attack_ids.append
+        add_error = result.add_error
+        prefix_match = self.ATTACK_PREFIX_PATTERN.match
+        full_match = self.ATTACK_PATTERN.match
+
+        for i, technique in enumerate(raw_list):
+            if not isinstance(technique, str):
+                add_error(f"attck数组第{i}个元素必须是字符串，当前类型: {type(technique).__name__}")
+                continue
+
+            tech_str = technique.strip()
+            if not tech_str:
+                add_error(f"attck数组第{i}个元素不能为空字符串")
+                continue
+
+            # 提取ATT&CK编号（支持 Txxxx 或 Txxxx.xxx:[name] 格式），如果包含冒号，只取冒号前的部分；
+            # partition不构造列表，比split(':', 1)[0]快
+            tech_id = tech_str.partition(':')[0].strip().upper()
+
+            # 绝大多数编号是规范的Txxxx或Txxxx.xxx，用下标和isdecimal()判断即可，
+            # 与正则的\d同样按Unicode十进制数字判断；其余情况仍交给正则
+            id_len = len(tech_id)
+            if (
+                (id_len == 5 or (id_len == 9 and tech_id[5] == '.' and tech_id[6:].isdecimal()))
+                and tech_id[0] == 'T' and tech_id[1:5].isdecimal()
+            ):
+                append((technique, tech_id, True))
+            # 验证编号格式（Txxxx 或 Txxxx.xxx）
+            elif prefix_match(tech_id):
+                append((technique, tech_id, full_match(tech_id) is not None))
+            else:
+                add_error(f"attck数组第{i}个元素格式无效: '{technique}'，应为 'Txxxx' 或 'Txxxx.xxx:[名称]' 格式")
+
+        return attack_ids
+
+    def _parse_content(self, raw_data: Dict[str, Any]) -> ManifestParseResult:
+        """
+        执行与文件路径无关的解析步骤
+
+        参数说明：
+        - raw_data: 解码后的JSON数据
+
+        返回值：
+        - ManifestParseResult: 内容解析结果，错误和警告由parse_file合并到文件的结果中
+
+        处理步骤：
+        1. 基础结构验证，同时拆分出attck编号
+        2. 数据标准化和清理
+        3. ATT&CK技术验证
+
+        为什么各步骤都是同步方法：
+        这些步骤只做内存中的计算，没有I/O；同步调用省去每个文件多个协程对象的创建和调度
+
+        为什么与路径相关的步骤分开：
+        这些步骤的结果只取决于文件内容，内容相同的文件（镜像目录、重复样本）可以直接复用
+        """
+        content = ManifestParseResult()
+
+        attack_ids = self._validate_basic_structure(raw_data, content)
+        if attack_ids is None:
+            return content
+
+        cleaned_data = self._clean_and_normalize_data(raw_data, content, attack_ids)
+
+        if self.validate_attack_ids:
+            if not self._validate_attack_techniques(cleaned_data, content, attack_ids):
+                return content
+
+        content.is_valid = True
+        content.data = cleaned_data
+        return content
+
+    def _remember_content(self, digest: bytes, content: ManifestParseResult) -> None:
+        """缓存内容解析结果，超过content_memo_size时淘汰最久未使用的条目"""
+        if self.content_memo_size <= 0:
+            return
+        self._content_memo[digest] = content
+        if len(self._content_memo) > self.content_memo_size:
+            self._content_memo.popitem(last=False)
+
+    def clear_content_memo(self) -> None:
+        """清空内容缓存，释放缓存的解析数据"""
+        self._content_memo.clear()
+
+    def _clean_and_normalize_data(
+        self,
+        raw_data: Dict[str, Any],
+        result: ManifestParseResult,
+        attack_ids: List[Tuple[str, str, bool]]
+    ) -> Dict[str, Any]:
         """
         清理和标准化数据
 
@@ -513,12 +772,11 @@ class ManifestParser:
         2. 标准化字符串格式（去除空白、统一大小写等）
         3. 清理无效数据
         4. 类型转换
-        5. 提取文件路径相关信息
 
         参数说明：
         - raw_data: 原始解析数据
         - result: 解析结果对象，用于收集警告
-        - file_path: 文件路径，用于提取相关信息
+        - attack_ids: 结构验证时拆分出的attck元素(原始值, 编号, 格式是否有效)
 
         返回值：
         - Dict[str, Any]: 清理后的数据
@@ -536,11 +794,13 @@ class ManifestParser:
         """
         cleaned = raw_data.copy()
 
-        # 补全可选字段
-        for field, default_value in self.OPTIONAL_FIELDS.items():
-            if field not in cleaned:
-                cleaned[field] = default_value
-                self.logger.debug(f"补全字段 {field} = {default_value}")
+        # 补全可选字段，逐字段的调试日志只在DEBUG级别开启时生成
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for field, default_value in self._OPTIONAL_FIELD_ITEMS:
+                if field not in cleaned:
+                    self.logger.debug("补全字段 %s = %s", field, default_value)
+        for field, default_value in self._OPTIONAL_FIELD_ITEMS:
+            cleaned.setdefault(field, default_value)
 
         # 标准化字符串字段
         string_fields = ['alias', 'summary', 'root_function', 'generated_cpp']
@@ -554,40 +814,18 @@ class ManifestParser:
                     cleaned[field] = str(cleaned[field]).strip()
                     result.add_warning(f"字段{field}类型转换: {type(raw_data[field]).__name__} -> str")
 
-        # 标准化attck数组（支持 Txxxx:[name] 或 Txxxx.xxx:[name] 格式）
-        if 'attck' in cleaned and isinstance(cleaned['attck'], list):
-            import re
-            attck_pattern = re.compile(r'^T\d{4}(\.\d+)?')  # Txxxx 或 Txxxx.xxx 格式
-
-            normalized_attck = []
-            for i, technique in enumerate(cleaned['attck']):
-                if technique and str(technique).strip():
-                    # 转为字符串并去除空白
-                    tech_str = str(technique).strip()
-
-                    # 提取ATT&CK编号（支持 Txxxx:[name] 或 Txxxx.xxx:[name] 格式）
-                    if ':' in tech_str:
-                        # 包含冒号，提取冒号前的编号部分
-                        tech_id = tech_str.split(':')[0].strip().upper()
-                    else:
-                        # 不包含冒号，直接使用
-                        tech_id = tech_str.upper()
-
-                    # 验证编号格式
-                    if attck_pattern.match(tech_id):
-                        normalized_attck.append(tech_id)
-                    else:
-                        # 格式无效，记录警告但保留原始值（后续在验证阶段会报错）
-                        result.add_warning(f"ATT&CK技术ID格式可能无效: {technique} -> {tech_id}")
-                        normalized_attck.append(tech_id)
-
-                    # 记录格式变化（仅当实际发生转换时）
-                    if tech_id != tech_str and ':' in tech_str:
-                        original_name = tech_str.split(':', 1)[1].strip() if ':' in tech_str else ''
-                        result.add_warning(f"ATT&CK技术ID已提取: '{technique}' -> '{tech_id}'" +
-                                          (f" (忽略描述: {original_name})" if original_name else ''))
-
-            cleaned['attck'] = normalized_attck
+        # 标准化attck数组（支持 Txxxx:[name] 或 Txxxx.xxx:[name] 格式），编号已在结构验证时提取
+        normalized_attck = []
+        for technique, tech_id, _ in attack_ids:
+            normalized_attck.append(tech_id)
+
+            # 记录格式变化（仅当去掉了描述部分时）
+            _, colon, original_name = technique.partition(':')
+            if colon:
+                original_name = original_name.strip()
+                result.add_warning(f"ATT&CK技术ID已提取: '{technique}' -> '{tech_id}'" +
+                                   (f" (忽略描述: {original_name})" if original_name else ''))
+        cleaned['attck'] = normalized_attck
 
         # 标准化tries字段为整数
         if 'tries' in cleaned:
@@ -600,32 +838,46 @@ class ManifestParser:
                 cleaned['tries'] = 1
                 result.add_warning(f"tries字段类型转换失败，已设为默认值1")
 
-        # 提取文件路径相关信息
-        if file_path:
-            # 从文件路径提取hash_id和alias
-            path_parts = file_path.parts
-
-            # 假设路径结构: files/{hash_id}/{alias}/manifest.json
-            if len(path_parts) >= 4:
-                extracted_hash = path_parts[-3]  # hash_id
-                extracted_alias = path_parts[-2]  # alias目录名
-
-                # 如果数据中没有hash_id，从路径提取
-                if not cleaned.get('hash_id'):
-                    cleaned['hash_id'] = extracted_hash
-                    result.add_warning(f"从路径提取hash_id: {extracted_hash}")
-
-                # 验证alias的一致性
-                if cleaned.get('alias') and cleaned['alias'] != extracted_alias:
-                    result.add_warning(f"alias不一致: 数据中='{cleaned['alias']}', 路径中='{extracted_alias}'")
+        return cleaned
 
-                # 设置文件路径信息
-                cleaned['manifest_path'] = str(file_path)
-                cleaned['cpp_filepath'] = str(file_path.parent / f"{extracted_alias}.cpp")
+    def _apply_path_info(self, data: Dict[str, Any], result: ManifestParseResult, file_path: Path) -> None:
+        """
+        提取文件路径相关信息
 
-        return cleaned
+        参数说明：
+        - data: 清理后的数据，原地补充路径相关字段
+        - result: 解析结果对象，用于收集警告
+        - file_path: 文件路径
 
-    async def _validate_attack_techniques(self, data: Dict[str, Any], result: ManifestParseResult) -> bool:
+        路径约定：
+        files/{hash_id}/{alias}/manifest.json
+        """
+        # 从文件路径提取hash_id和alias
+        path_parts = file_path.parts
+
+        if len(path_parts) >= 4:
+            extracted_hash = path_parts[-3]  # hash_id
+            extracted_alias = path_parts[-2]  # alias目录名
+
+            # 如果数据中没有hash_id，从路径提取
+            if not data.get('hash_id'):
+                data['hash_id'] = extracted_hash
+                result.add_warning(f"从路径提取hash_id: {extracted_hash}")
+
+            # 验证alias的一致性
+            if data.get('alias') and data['alias'] != extracted_alias:
+                result.add_warning(f"alias不一致: 数据中='{data['alias']}', 路径中='{extracted_alias}'")
+
+            # 设置文件路径信息
+            data['manifest_path'] = str(file_path)
+            data['cpp_filepath'] = str(file_path.parent / f"{extracted_alias}.cpp")
+
+    def _validate_attack_techniques(
+        self,
+        data: Dict[str, Any],
+        result: ManifestParseResult,
+        attack_ids: List[Tuple[str, str, bool]]
+    ) -> bool:
         """
         验证ATT&CK技术ID
 
@@ -638,6 +890,7 @@ class ManifestParser:
         参数说明：
         - data: 清理后的数据
         - result: 解析结果对象
+        - attack_ids: 结构验证时得到的attck元素信息，格式匹配已在其中完成
 
         返回值：
         - bool: 验证是否通过
@@ -658,8 +911,8 @@ class ManifestParser:
         invalid_techniques = []
         valid_techniques = []
 
-        for technique in data['attck']:
-            if self.ATTACK_PATTERN.match(technique):
+        for _, technique, is_valid in attack_ids:
+            if is_valid:
                 valid_techniques.append(technique)
             else:
                 invalid_techniques.append(technique)
@@ -667,29 +920,33 @@ class ManifestParser:
                 suggestion = self._generate_attack_id_suggestion(technique)
                 result.add_error(f"无效的ATT&CK技术ID: {technique} (建议: {suggestion})")
 
-        # 如果有无效ID，在非严格模式下尝试修复
-        if invalid_techniques and not self.strict_mode:
-            fixed_techniques = []
-            for technique in invalid_techniques:
-                fixed = self._try_fix_attack_id(technique)
-                if fixed:
-                    fixed_techniques.append(fixed)
-                    result.add_warning(f"ATT&CK技术ID自动修复: {technique} -> {fixed}")
-
-            # 更新数据，使用修复后的ID
-            if fixed_techniques:
-                data['attck'] = valid_techniques + fixed_techniques
-                result.add_warning(f"已修复{len(fixed_techniques)}个ATT&CK技术ID")
+        if not invalid_techniques:
+            return len(result.errors) == 0
+
+        # 每个无效ID只尝试修复一次：非严格模式使用修复结果，严格模式只统计无法修复的数量
+        fixed_techniques = []
+        unfixable_count = 0
+        for technique in invalid_techniques:
+            fixed = self._try_fix_attack_id(technique)
+            if not fixed:
+                unfixable_count += 1
+            elif not self.strict_mode:
+                fixed_techniques.append(fixed)
+                result.add_warning(f"ATT&CK技术ID自动修复: {technique} -> {fixed}")
+
+        # 非严格模式下更新数据，使用修复后的ID
+        if fixed_techniques:
+            data['attck'] = valid_techniques + fixed_techniques
+            result.add_warning(f"已修复{len(fixed_techniques)}个ATT&CK技术ID")
 
         # 如果仍有无效ID且在严格模式下，验证失败
-        remaining_invalid = len(invalid_techniques) - len([t for t in invalid_techniques if self._try_fix_attack_id(t)])
-        if remaining_invalid > 0 and self.strict_mode:
-            result.add_error(f"严格模式下，{remaining_invalid}个ATT&CK技术ID格式无效")
+        if unfixable_count > 0 and self.strict_mode:
+            result.add_error(f"严格模式下，{unfixable_count}个ATT&CK技术ID格式无效")
             return False
 
         return len(result.errors) == 0
 
-    async def _final_validation(self, data: Dict[str, Any], result: ManifestParseResult) -> bool:
+    def _final_validation(self, data: Dict[str, Any], result: ManifestParseResult) -> bool:
         """
         最终验证步骤
 
@@ -735,15 +992,44 @@ class ManifestParser:
                 result.add_warning("status为ok但attck字段为空")
 
         # 检查文件路径的一致性
+        self._check_cpp_file(data, result)
+
+        return len(result.errors) == 0
+
+    def _check_cpp_file(self, data: Dict[str, Any], result: ManifestParseResult) -> None:
+        """检查CPP文件是否存在；结果取决于文件系统而非manifest内容，复用缓存结果时需要重新检查"""
         if 'manifest_path' in data and 'cpp_filepath' in data:
-            manifest_path = Path(data['manifest_path'])
             cpp_path = Path(data['cpp_filepath'])
-
-            # 检查CPP文件是否存在
             if not cpp_path.exists():
-                result.add_warning(f"CPP文件不存在: {cpp_path}")
+                result.add_warning(f"{self.CPP_MISSING_WARNING}{cpp_path}")
 
-        return len(result.errors) == 0
+    def record_cached_result(self, result: ManifestParseResult) -> ManifestParseResult:
+        """
+        登记一个从解析缓存取出的结果
+
+        参数说明：
+        - result: 缓存中的解析结果，只有解析成功的结果会被缓存
+
+        返回值：
+        - ManifestParseResult: 更新了文件系统相关检查的结果
+
+        为什么需要登记：
+        1. 缓存只以manifest文件本身的状态为键，CPP文件的增删不会使缓存失效，
+           因此丢弃缓存中的CPP警告并按当前文件系统重新检查
+        2. 命中缓存的文件同样计入解析统计，热缓存下的成功数不会偏低；
+           命中次数另外记录在parse_cache_hits中
+        """
+        result.warnings = [
+            warning for warning in result.warnings
+            if not warning.startswith(self.CPP_MISSING_WARNING)
+        ]
+        self._check_cpp_file(result.data, result)
+
+        self.stats.total_files += 1
+        self.stats.successful_parses += 1
+        self.stats.parse_cache_hits += 1
+        self.stats.total_warnings += len(result.warnings)
+        return result
 
     def _handle_parse_exception(self, exception: Exception, file_path: Path, result: ManifestParseResult) -> None:
         """
@@ -763,31 +1049,33 @@ class ManifestParser:
         if isinstance(exception, (ParseError, ValidationError)):
             # 自定义异常，直接使用其信息
             result.add_error(str(exception))
-            self.logger.error(f"解析失败 ({file_path.name}): {exception}")
+            self.logger.error("解析失败 (%s): %s", file_path.name, exception)
 
         elif isinstance(exception, FileNotFoundError):
             result.add_error(f"文件不存在: {file_path}")
-            self.logger.error(f"文件不存在: {file_path}")
+            self.logger.error("文件不存在: %s", file_path)
 
         elif isinstance(exception, json.JSONDecodeError):
             result.add_error(f"JSON格式错误: {str(exception)}")
-            self.logger.error(f"JSON格式错误 ({file_path.name}): {exception}")
+            self.logger.error("JSON格式错误 (%s): %s", file_path.name, exception)
 
         elif isinstance(exception, PermissionError):
             result.add_error(f"文件权限不足: {file_path}")
-            self.logger.error(f"权限不足，无法读取文件: {file_path}")
+            self.logger.error("权限不足，无法读取文件: %s", file_path)
 
         elif isinstance(exception, asyncio.TimeoutError):
             result.add_error(f"读取文件超时: {file_path}")
-            self.logger.error(f"读取文件超时: {file_path}")
+            self.logger.error("读取文件超时: %s", file_path)
 
         else:
             # 其他未知异常
             error_msg = f"未知错误: {type(exception).__name__}: {str(exception)}"
             result.add_error(error_msg)
-            self.logger.error(f"解析文件时发生未知异常 ({file_path.name}): {exception}", exc_info=True)
+            self.logger.error("解析文件时发生未知异常 (%s): %s", file_path.name, exception, exc_info=True)
 
-    def _generate_attack_id_suggestion(self, invalid_id: str) -> str:
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _generate_attack_id_suggestion(cls, invalid_id: str) -> str:
         """
         生成ATT&CK技术ID修复建议
 
@@ -801,6 +1089,10 @@ class ManifestParser:
         1. 补全T前缀：1027 -> T1027
         2. 修正格式：t1027 -> T1027
         3. 移除多余字符：T1027ABC -> T1027
+
+        为什么缓存：
+        结果只取决于ID字符串，同样的笔误会在大量manifest中重复出现；
+        使用classmethod使缓存键不包含解析器实例，缓存不会延长实例的生命周期
         """
         invalid_id = str(invalid_id).strip()
 
@@ -813,19 +1105,20 @@ class ManifestParser:
             return f"T{invalid_id[1:]}"
 
         # 策略3: 提取开头的数字部分
-        import re
-        match = re.match(r'([Tt]*)(\d+)', invalid_id)
+        match = cls._LEADING_NUMBER_PATTERN.match(invalid_id)
         if match:
             return f"T{match.group(2)}"
 
-        # 策略4: 提取所有数字
-        numbers = re.findall(r'\d+', invalid_id)
-        if numbers:
-            return f"T{numbers[0]}"
+        # 策略4: 提取第一段数字
+        number = cls._ANY_NUMBER_PATTERN.search(invalid_id)
+        if number:
+            return f"T{number.group()}"
 
         return "T#### (请填写正确的ATT&CK技术ID)"
 
-    def _try_fix_attack_id(self, invalid_id: str) -> Optional[str]:
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _try_fix_attack_id(cls, invalid_id: str) -> Optional[str]:
         """
         尝试自动修复ATT&CK技术ID
 
@@ -840,7 +1133,8 @@ class ManifestParser:
         2. 常见拼写错误修正
         3. 标准化处理
 
-        注意：只在非严格模式下使用
+        注意：修复结果只在非严格模式下使用，严格模式只用来统计无法修复的ID；
+        与_generate_attack_id_suggestion相同，按ID字符串缓存结果
         """
         # 转为字符串并去除空白
         tech_str = str(invalid_id).strip()
@@ -854,8 +1148,7 @@ class ManifestParser:
             return tech_str.upper()
 
         # 策略3: 移除多余后缀
-        import re
-        match = re.match(r'^([Tt]\d{4})', tech_str)
+        match = cls._FIXABLE_ATTACK_PATTERN.match(tech_str)
         if match:
             return match.group(1).upper()
 
@@ -874,7 +1167,7 @@ class ManifestParser:
         3. 问题诊断
         4. 进度跟踪
         """
-        total = self.stats['total_files']
+        total = self.stats.total_files
         if total == 0:
             return {
                 'total_files': 0,
@@ -886,14 +1179,16 @@ class ManifestParser:
 
         return {
             'total_files': total,
-            'successful_parses': self.stats['successful_parses'],
-            'failed_parses': self.stats['failed_parses'],
-            'total_errors': self.stats['total_errors'],
-            'total_warnings': self.stats['total_warnings'],
-            'success_rate': (self.stats['successful_parses'] / total) * 100,
-            'error_rate': (self.stats['failed_parses'] / total) * 100,
-            'average_errors_per_file': self.stats['total_errors'] / total,
-            'average_warnings_per_file': self.stats['total_warnings'] / total
+            'successful_parses': self.stats.successful_parses,
+            'failed_parses': self.stats.failed_parses,
+            'total_errors': self.stats.total_errors,
+            'total_warnings': self.stats.total_warnings,
+            'success_rate': (self.stats.successful_parses / total) * 100,
+            'error_rate': (self.stats.failed_parses / total) * 100,
+            'average_errors_per_file': self.stats.total_errors / total,
+            'average_warnings_per_file': self.stats.total_warnings / total,
+            'content_memo_hits': self.stats.content_memo_hits,
+            'parse_cache_hits': self.stats.parse_cache_hits
         }
 
     def reset_statistics(self) -> None:
@@ -905,11 +1200,5 @@ class ManifestParser:
         2. 清理统计数据
         3. 避免内存累积
         """
-        self.stats = {
-            'total_files': 0,
-            'successful_parses': 0,
-            'failed_parses': 0,
-            'total_errors': 0,
-            'total_warnings': 0
-        }
+        self.stats = ManifestParseStatistics()
         self.logger.info("解析器统计信息已重置")
\ No newline at end of file
@@ -2,7 +2,7 @@
 MITRE ATT&CK官方API服务（基础框架，预留接口）
 
 该模块提供从MITRE ATT&CK官方API获取技术详情的基础框架。
-当前版本为预留实现，后续可根据需要扩展。
+批量缓存更新已实现，单个技术的查询仍为预留接口。
 
 功能规划：
 - 从MITRE ATT&CK REST API获取技术详情
@@ -14,9 +14,21 @@ MITRE ATT&CK官方API服务（基础框架，预留接口）
     service = MITREAPIService(cache_days=30)
     details = await service.fetch_technique_details("T1055", session)
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:  # h2为可选依赖，未安装时使用HTTP/1.1连接池
+    _HTTP2_AVAILABLE = False
 
 from src.utils.logger import setup_logger
 
@@ -28,12 +40,41 @@ class MITREAPIService:
 
     BASE_URL = "https://attack.mitre.org/api"
 
-    def __init__(self, cache_days: int = 30):
+    # 批量更新时同时进行的请求数上限，避免触发限流
+    MAX_CONCURRENCY = 32
+    # 单个技术的最大请求次数（含首次请求）
+    MAX_ATTEMPTS = 3
+    # 需要退避重试的状态码：限流和服务端临时错误
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    # Retry-After的最大等待秒数
+    MAX_RETRY_DELAY = 60.0
+
+    # 写入缓存时每条语句包含的行数，每块提交一次
+    WRITE_CHUNK_SIZE = 500
+
+    # 支持INSERT ... ON CONFLICT DO UPDATE的方言
+    UPSERT_INSERTS = {
+        'postgresql': pg_insert,
+        'sqlite': sqlite_insert,
+    }
+
+    # 缓存写入的MITRE字段，冲突时只更新这些列
+    MITRE_CACHE_COLUMNS = (
+        'mitre_description',
+        'mitre_url',
+        'mitre_detection',
+        'mitre_mitigation',
+        'mitre_data_sources',
+        'mitre_updated_at',
+    )
+
+    def __init__(self, cache_days: int = 30, concurrency: int = MAX_CONCURRENCY):
         """
         初始化MITRE API服务
 
         参数说明：
             cache_days: 缓存天数，默认30天
+            concurrency: 批量更新时的并发请求数
 
         为什么需要缓存：
             1. 减少API调用次数
@@ -42,8 +83,9 @@ class MITREAPIService:
             4. 离线可用
         """
         self.cache_days = cache_days
-        # TODO: 后续实现httpx.AsyncClient
-        self.client = None
+        self.concurrency = max(1, concurrency)
+        # 在__aenter__中创建，所有请求复用同一个连接池
+        self.client: Optional[httpx.AsyncClient] = None
 
     async def fetch_technique_details(self, technique_id: str, session) -> Optional[Dict[str, Any]]:
         """
@@ -95,12 +137,78 @@ class MITREAPIService:
             - 提取缓解措施
             - 提取数据源
         """
-        # TODO: 解析STIX格式数据
-        return {}
+        technique = data
+        if data.get('type') == 'bundle':
+            technique = next(
+                (obj for obj in data.get('objects', ()) if obj.get('type') == 'attack-pattern'),
+                None
+            )
+            if technique is None:
+                return {}
+
+        technique_id = None
+        url = None
+        for reference in technique.get('external_references', ()):
+            if reference.get('source_name') == 'mitre-attack':
+                technique_id = reference.get('external_id')
+                url = reference.get('url')
+                break
+
+        data_sources = technique.get('x_mitre_data_sources')
+        return {
+            'technique_id': technique_id,
+            'technique_name': technique.get('name'),
+            'description': technique.get('description'),
+            'url': url,
+            'detection': technique.get('x_mitre_detection'),
+            # 缓解措施在STIX中是独立的course-of-action对象，单个技术的响应中不包含
+            'mitigation': None,
+            'data_sources': ', '.join(data_sources) if data_sources else None
+        }
+
+    async def _fetch_with_retry(self, technique_id: str) -> Dict[str, Any]:
+        """
+        请求单个技术的详情，对限流和服务端临时错误进行退避重试
+
+        参数说明：
+            technique_id: 技术ID（如T1055或T1055.001）
+
+        返回值：
+            解析后的技术详情字典
+
+        为什么需要退避：
+            批量更新会在短时间内发出数百个请求，收到429时立即重试只会继续被限流。
+            等待时间优先使用响应中的Retry-After，否则按2的指数增长
+        """
+        url = f"{self.BASE_URL}/techniques/{technique_id.replace('.', '/')}/"
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            last_attempt = attempt + 1 >= self.MAX_ATTEMPTS
+            try:
+                response = await self.client.get(url)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                delay = float(2 ** attempt)
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or last_attempt:
+                    response.raise_for_status()
+                    return self._parse_mitre_response(response.json())
+                delay = self._retry_delay(response, attempt)
+
+            logger.debug(f"请求 {technique_id} 失败，{delay:.1f}秒后重试 ({attempt + 1}/{self.MAX_ATTEMPTS})")
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """计算重试等待时间：优先使用Retry-After秒数，否则指数退避"""
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), self.MAX_RETRY_DELAY)
+        return float(2 ** attempt)
 
     async def batch_update_cache(self, session, technique_ids: Optional[list] = None) -> Dict[str, int]:
         """
-        批量更新MITRE缓存（预留接口）
+        批量更新MITRE缓存
 
         参数说明：
             session: 数据库会话
@@ -112,24 +220,136 @@ class MITREAPIService:
             - success: 成功数
             - failed: 失败数
 
+        设计思路：
+            1. 所有请求共享__aenter__中创建的AsyncClient，复用连接池
+            2. 用Semaphore限制同时进行的请求数，其余任务排队等待
+            3. 单个技术失败不影响其他技术，失败数计入统计
+            4. 请求全部完成后统一写入数据库
+
         TODO:
-            - 实现批量更新逻辑
             - 添加进度显示
-            - 实现速率限制（避免被限流）
-            - 添加并发控制
         """
-        logger.info("MITRE批量缓存更新暂未实现")
-        return {'total': 0, 'success': 0, 'failed': 0}
+        if technique_ids is None:
+            from src.database.models import AttackTechnique
+            from sqlalchemy import select
+
+            result = await session.execute(select(AttackTechnique.technique_id))
+            technique_ids = result.scalars().all()
+
+        if not technique_ids:
+            return {'total': 0, 'success': 0, 'failed': 0}
+
+        owns_client = self.client is None
+        if owns_client:
+            await self.__aenter__()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(technique_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._fetch_with_retry(technique_id)
+
+        try:
+            results = await asyncio.gather(
+                *(fetch_one(technique_id) for technique_id in technique_ids),
+                return_exceptions=True
+            )
+        finally:
+            if owns_client:
+                await self.__aexit__(None, None, None)
+
+        rows = []
+        for technique_id, details in zip(technique_ids, results):
+            if isinstance(details, BaseException):
+                logger.warning(f"获取 {technique_id} 的MITRE数据失败: {details}")
+                continue
+            if not details:
+                continue
+            details['technique_id'] = technique_id
+            rows.append(details)
+
+        await self._write_cache(session, rows)
+
+        return {
+            'total': len(technique_ids),
+            'success': len(rows),
+            'failed': len(technique_ids) - len(rows)
+        }
+
+    async def _write_cache(self, session, rows: List[Dict[str, Any]]) -> None:
+        """
+        将解析后的MITRE数据写入attack_techniques表的mitre_*字段
+
+        为什么使用INSERT ... ON CONFLICT DO UPDATE：
+            逐条UPDATE每个技术都需要一次数据库往返，这里按WRITE_CHUNK_SIZE分块，
+            每块一条语句、一次提交。冲突时只更新mitre_*列，技术名称等导入数据保持不变。
+            不使用SQLite的INSERT OR REPLACE，它会先删除旧行，丢失其他列和关联数据
+        """
+        from src.database.models import AttackTechnique
+
+        if not rows:
+            return
+
+        updated_at = datetime.now(timezone.utc)
+        records = [
+            {
+                'technique_id': row['technique_id'],
+                # 仅在插入时使用，技术记录已存在时不会覆盖
+                'technique_name': row.get('technique_name') or row['technique_id'],
+                'mitre_description': row['description'],
+                'mitre_url': row['url'],
+                'mitre_detection': row['detection'],
+                'mitre_mitigation': row['mitigation'],
+                'mitre_data_sources': row['data_sources'],
+                'mitre_updated_at': updated_at
+            }
+            for row in rows
+        ]
+
+        dialect_name = (await session.connection()).dialect.name
+        insert_factory = self.UPSERT_INSERTS.get(dialect_name)
+
+        if insert_factory is not None:
+            stmt = insert_factory(AttackTechnique)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['technique_id'],
+                set_={column: stmt.excluded[column] for column in self.MITRE_CACHE_COLUMNS}
+            )
+        else:
+            # 其他方言没有通用的UPSERT语法，按technique_id批量UPDATE
+            stmt = (
+                update(AttackTechnique.__table__)
+                .where(AttackTechnique.__table__.c.technique_id == bindparam('b_technique_id'))
+                .values({column: bindparam(column) for column in self.MITRE_CACHE_COLUMNS})
+            )
+            # 参数中出现的列名都会进入SET子句，只保留mitre_*列和条件参数
+            records = [
+                {'b_technique_id': record['technique_id'],
+                 **{column: record[column] for column in self.MITRE_CACHE_COLUMNS}}
+                for record in records
+            ]
+
+        for start in range(0, len(records), self.WRITE_CHUNK_SIZE):
+            await session.execute(stmt, records[start:start + self.WRITE_CHUNK_SIZE])
+            await session.commit()
 
     async def __aenter__(self):
-        """异步上下文管理器入口"""
-        # TODO: 初始化httpx.AsyncClient
+        """异步上下文管理器入口：创建共享的HTTP连接池"""
+        self.client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=max(1, self.concurrency // 2)
+            ),
+            timeout=10.0
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """异步上下文管理器出口"""
-        # TODO: 关闭httpx.AsyncClient
-        pass
+        """异步上下文管理器出口：关闭连接池"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
 
 
 # 便捷函数
@@ -173,7 +393,7 @@ async def batch_update_all_techniques() -> Dict[str, int]:
         async with async_session_factory() as session:
             # 获取所有技术ID
             result = await session.execute(select(AttackTechnique.technique_id))
-            technique_ids = [row[0] for row in result.fetchall()]
+            technique_ids = result.scalars().all()
 
             logger.info(f"开始批量更新 {len(technique_ids)} 个技术的MITRE缓存")
             stats = await service.batch_update_cache(session, technique_ids)
@@ -1,15 +1,32 @@
 """
 STIX ATT&CK 数据服务
 
-使用 stix2 库从本地 attack-stix-data Git 子模块加载和查询 ATT&CK 数据。
+从本地 attack-stix-data Git 子模块加载和查询 ATT&CK 数据。
 替代原有的 MITREAPIService，提供本地化的 STIX 数据访问。
 
+为什么不使用 stix2 的 MemoryStore:
+- MemoryStore 加载时为 bundle 中的每个对象构造并校验 STIX 类实例，是初始化的主要耗时
+- 这里只读取数据，不创建或修改 STIX 对象，不需要这些校验
+- 对象保留为 JSON 解码得到的字典，按类型分桶后用列表推导筛选，查询不经过 Filter 的反射匹配
+
 参考文档: attack-stix-data/USAGE.md
 """
-from stix2 import MemoryStore, Filter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AbstractSet
+import asyncio
+import json
 import logging
+import threading
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson为可选依赖，未安装时只保留类型时仍整体解码后筛选
+    ijson = None
 
 from src.utils.logger import setup_logger
 
@@ -19,12 +36,18 @@ logger = setup_logger(__name__)
 class STIXDataService:
     """STIX ATT&CK 数据服务"""
 
-    def __init__(self, stix_file_path: Optional[Path] = None):
+    def __init__(
+        self,
+        stix_file_path: Optional[Path] = None,
+        keep_types: Optional[AbstractSet[str]] = None
+    ):
         """
         初始化 STIX 数据服务
 
         参数说明:
             stix_file_path: STIX JSON 文件路径，默认为最新版本
+            keep_types: 只保留这些 STIX 类型的对象（如 {'attack-pattern', 'x-mitre-tactic'}），
+                None 表示保留全部；查询依赖的类型未保留时对应查询返回空结果
 
         数据源:
             attack-stix-data/enterprise-attack/enterprise-attack.json
@@ -40,12 +63,71 @@ class STIXDataService:
         if not self.stix_file_path.exists():
             raise FileNotFoundError(f"STIX 文件不存在: {self.stix_file_path}")
 
-        # 加载 STIX 数据到 MemoryStore
-        self.store = MemoryStore()
-        self.store.load_from_file(str(self.stix_file_path))
+        # 加载 STIX bundle，按 id 和类型建立对象表
+        self._objects_by_id: Dict[str, Dict[str, Any]] = {}
+        self._objects_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for obj in self._iter_bundle_objects(keep_types):
+            self._objects_by_id[obj['id']] = obj
+            self._objects_by_type.setdefault(obj['type'], []).append(obj)
 
         logger.info(f"已加载 STIX 数据: {self.stix_file_path}")
 
+        # 全量查询结果缓存: (方法名, 参数...) -> 过滤后的对象列表
+        # 数据在加载后不再变化，每种全量查询只需遍历一次对应类型的对象
+        self._cache: Dict[Tuple, List] = {}
+
+        # 单对象查询索引，加载时遍历一次建立，之后每次查询只需一次字典查找
+        self._build_indexes()
+
+    def _iter_bundle_objects(self, keep_types: Optional[AbstractSet[str]]) -> Iterator[Dict[str, Any]]:
+        """
+        逐个产出 bundle 中需要保留的对象
+
+        加载方式:
+        1. 保留全部类型时整体解码，orjson 解码整个文件比逐个对象的流式解析快得多
+        2. 只保留部分类型且安装了 ijson 时流式解析，丢弃的对象解析后立即释放，
+           峰值内存只与保留的对象相关，不需要同时持有整棵 JSON 树
+        """
+        if keep_types is not None and ijson is not None:
+            with open(self.stix_file_path, 'rb') as f:
+                for obj in ijson.items(f, 'objects.item', use_float=True):
+                    if obj['type'] in keep_types:
+                        yield obj
+            return
+
+        content = self.stix_file_path.read_bytes()
+        bundle = orjson.loads(content) if orjson is not None else json.loads(content)
+        # 解码结果只在这里持有，筛选完成后整棵树随生成器结束释放
+        for obj in bundle.get('objects', []):
+            if keep_types is None or obj['type'] in keep_types:
+                yield obj
+
+    def _build_indexes(self) -> None:
+        """
+        建立按 ATT&CK ID、战术 shortname 和子技术关系查找的索引
+
+        只收录未撤销、未弃用的对象；同一个键对应多个对象时保留第一个，
+        与原先 query 结果过滤后取第一个的行为一致
+        """
+        self._techniques_by_external_id: Dict[str, Any] = {}
+        for tech in self.get_all_techniques():
+            for ref in tech.get('external_references', []):
+                external_id = ref.get('external_id')
+                if external_id:
+                    self._techniques_by_external_id.setdefault(external_id, tech)
+
+        self._tactics_by_shortname: Dict[str, Any] = {}
+        for tactic in self.get_all_tactics():
+            shortname = tactic.get('x_mitre_shortname')
+            if shortname:
+                self._tactics_by_shortname.setdefault(shortname, tactic)
+
+        # subtechnique-of 关系按 source_ref 分组，get_subtechniques_of 不再每次扫描全部关系
+        self._subtechnique_refs: Dict[str, List[str]] = {}
+        for rel in self._objects_by_type.get('relationship', []):
+            if rel.get('relationship_type') == 'subtechnique-of' and not rel.get('revoked', False):
+                self._subtechnique_refs.setdefault(rel.get('source_ref'), []).append(rel['target_ref'])
+
     def _filter_revoked_deprecated(self, objects: List) -> List:
         """
         过滤已撤销和已弃用的对象
@@ -58,11 +140,12 @@ class STIXDataService:
         返回:
             过滤后的对象列表
         """
-        return [
-            obj for obj in objects
-            if not obj.get('x_mitre_deprecated', False)
-            and not obj.get('revoked', False)
-        ]
+        return [obj for obj in objects if self._is_active(obj)]
+
+    @staticmethod
+    def _is_active(obj: Dict[str, Any]) -> bool:
+        """对象是否既未撤销也未弃用"""
+        return not obj.get('x_mitre_deprecated', False) and not obj.get('revoked', False)
 
     # ===== 战术相关 =====
 
@@ -73,10 +156,12 @@ class STIXDataService:
         返回:
             战术对象列表
         """
-        tactics = self.store.query([
-            Filter('type', '=', 'x-mitre-tactic')
-        ])
-        return self._filter_revoked_deprecated(tactics)
+        key = ('tactics',)
+        if key not in self._cache:
+            tactics = self._objects_by_type.get('x-mitre-tactic', [])
+            self._cache[key] = self._filter_revoked_deprecated(tactics)
+        # 返回副本，调用方修改列表不会影响缓存
+        return list(self._cache[key])
 
     def get_tactic_by_shortname(self, shortname: str) -> Optional[Dict]:
         """
@@ -88,12 +173,7 @@ class STIXDataService:
         返回:
             战术对象或 None
         """
-        results = self.store.query([
-            Filter('type', '=', 'x-mitre-tactic'),
-            Filter('x_mitre_shortname', '=', shortname)
-        ])
-        filtered = self._filter_revoked_deprecated(results)
-        return filtered[0] if filtered else None
+        return self._tactics_by_shortname.get(shortname)
 
     # ===== 技术相关 =====
 
@@ -107,14 +187,18 @@ class STIXDataService:
         返回:
             技术对象列表
         """
-        if include_subtechniques:
-            techniques = self.store.query([Filter('type', '=', 'attack-pattern')])
-        else:
-            techniques = self.store.query([
-                Filter('type', '=', 'attack-pattern'),
-                Filter('x_mitre_is_subtechnique', '=', False)
-            ])
-        return self._filter_revoked_deprecated(techniques)
+        key = ('techniques', include_subtechniques)
+        if key not in self._cache:
+            techniques = self._objects_by_type.get('attack-pattern', [])
+            if not include_subtechniques:
+                # 与 Filter('x_mitre_is_subtechnique', '=', False) 相同，缺少该属性的对象不算技术
+                techniques = [
+                    tech for tech in techniques
+                    if tech.get('x_mitre_is_subtechnique') is False
+                ]
+            self._cache[key] = self._filter_revoked_deprecated(techniques)
+        # 返回副本，调用方修改列表不会影响缓存
+        return list(self._cache[key])
 
     def get_technique_by_attack_id(self, attack_id: str) -> Optional[Dict]:
         """
@@ -126,12 +210,7 @@ class STIXDataService:
         返回:
             技术对象或 None
         """
-        results = self.store.query([
-            Filter('type', '=', 'attack-pattern'),
-            Filter('external_references.external_id', '=', attack_id)
-        ])
-        filtered = self._filter_revoked_deprecated(results)
-        return filtered[0] if filtered else None
+        return self._techniques_by_external_id.get(attack_id)
 
     def get_techniques_by_tactic(self, tactic_shortname: str) -> List[Dict]:
         """
@@ -143,11 +222,14 @@ class STIXDataService:
         返回:
             技术对象列表
         """
-        techniques = self.store.query([
-            Filter('type', '=', 'attack-pattern'),
-            Filter('kill_chain_phases.phase_name', '=', tactic_shortname),
-            Filter('kill_chain_phases.kill_chain_name', '=', 'mitre-attack')
-        ])
+        techniques = [
+            tech for tech in self._objects_by_type.get('attack-pattern', [])
+            if any(
+                phase.get('phase_name') == tactic_shortname
+                and phase.get('kill_chain_name') == 'mitre-attack'
+                for phase in tech.get('kill_chain_phases', [])
+            )
+        ]
         return self._filter_revoked_deprecated(techniques)
 
     def get_techniques_by_platform(self, platform: str) -> List[Dict]:
@@ -160,10 +242,10 @@ class STIXDataService:
         返回:
             技术对象列表
         """
-        techniques = self.store.query([
-            Filter('type', '=', 'attack-pattern'),
-            Filter('x_mitre_platforms', '=', platform)
-        ])
+        techniques = [
+            tech for tech in self._objects_by_type.get('attack-pattern', [])
+            if platform in tech.get('x_mitre_platforms', [])
+        ]
         return self._filter_revoked_deprecated(techniques)
 
     def get_subtechniques_of(self, technique_id: str) -> List[Dict]:
@@ -176,15 +258,11 @@ class STIXDataService:
         返回:
             子技术对象列表
         """
-        # 使用关系查询
-        relationships = self.store.query([
-            Filter('type', '=', 'relationship'),
-            Filter('relationship_type', '=', 'subtechnique-of'),
-            Filter('source_ref', '=', technique_id)
-        ])
-
-        subtechnique_ids = [r.target_ref for r in relationships if not r.revoked]
-        return [self.store.get(stix_id) for stix_id in subtechnique_ids if self.store.get(stix_id)]
+        objects_by_id = self._objects_by_id
+        return [
+            objects_by_id[stix_id] for stix_id in self._subtechnique_refs.get(technique_id, ())
+            if stix_id in objects_by_id
+        ]
 
     # ===== 数据统计 =====
 
@@ -194,26 +272,68 @@ class STIXDataService:
 
         返回:
             统计信息字典
+
+        对 attack-pattern 只遍历一次，直接计数而不构造中间列表；
+        与 get_all_techniques(include_subtechniques=False) 相同，
+        只有 x_mitre_is_subtechnique 明确为 False 的才计为技术
         """
-        stats = {
-            'tactics': len(self.get_all_tactics()),
-            'techniques': len(self.get_all_techniques(include_subtechniques=False)),
-            'subtechniques': len(self.get_all_techniques()) - len(self.get_all_techniques(include_subtechniques=False)),
-        }
+        is_active = self._is_active
+        stats = {'tactics': 0, 'techniques': 0, 'subtechniques': 0}
+
+        for tactic in self._objects_by_type.get('x-mitre-tactic', []):
+            if is_active(tactic):
+                stats['tactics'] += 1
+
+        for tech in self._objects_by_type.get('attack-pattern', []):
+            if not is_active(tech):
+                continue
+            if tech.get('x_mitre_is_subtechnique') is False:
+                stats['techniques'] += 1
+            else:
+                stats['subtechniques'] += 1
 
         logger.info(f"STIX 数据统计: {stats}")
         return stats
 
 
 # 便捷函数
+# 全局单例，首次使用时才加载STIX数据
+_instance: Optional[STIXDataService] = None
+_instance_lock = threading.Lock()
+_async_instance_lock = asyncio.Lock()
+
+
 def get_stix_service() -> STIXDataService:
     """
     获取 STIX 服务实例（单例模式）
 
+    加载需要数秒，使用双重检查锁，避免多个线程同时触发初始化时重复加载
+
+    返回:
+        STIXDataService 实例
+    """
+    global _instance
+    instance = _instance
+    if instance is None:
+        with _instance_lock:
+            instance = _instance
+            if instance is None:
+                instance = _instance = STIXDataService()
+    return instance
+
+
+async def get_stix_service_async() -> STIXDataService:
+    """
+    在异步上下文中获取 STIX 服务实例
+
+    首次加载在线程池中执行，不阻塞事件循环；并发的协程在asyncio锁上等待同一次加载
+
     返回:
         STIXDataService 实例
     """
-    # 使用模块级变量实现单例
-    if not hasattr(get_stix_service, '_instance'):
-        get_stix_service._instance = STIXDataService()
-    return get_stix_service._instance
+    if _instance is not None:
+        return _instance
+    async with _async_instance_lock:
+        if _instance is not None:
+            return _instance
+        return await asyncio.to_thread(get_stix_service)
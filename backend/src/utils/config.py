@@ -2,7 +2,8 @@
 应用配置管理
 """
 
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 import os
 
@@ -61,18 +62,17 @@ class Settings(BaseSettings):
     cost_per_token_gpt4: float = 0.00003  # GPT-4每token成本
     cost_per_token_gpt35: float = 0.000002  # GPT-3.5每token成本
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    # 配置在进程内只读，冻结后可以安全地缓存派生属性
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, frozen=True)
 
-    @property
+    @cached_property
     def database_url_sync(self) -> str:
         """同步数据库URL"""
         if self.database_url.startswith("sqlite"):
             return self.database_url
         return f"postgresql://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
 
-    @property
+    @cached_property
     def database_url_async(self) -> str:
         """异步数据库URL"""
         if self.database_url.startswith("sqlite"):
@@ -80,5 +80,15 @@ class Settings(BaseSettings):
         return f"postgresql+asyncpg://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取全局配置实例
+
+    只在第一次调用时读取.env并校验字段，之后返回同一个实例
+    """
+    return Settings()
+
+
 # 全局配置实例
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
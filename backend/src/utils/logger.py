@@ -2,13 +2,36 @@
 日志配置工具
 """
 
+import json
 import sys
+import traceback
 from loguru import logger
 from src.utils.config import settings
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+# 全局sink是否已经配置，各模块导入时都会调用setup_logger，只需配置一次
+_configured = False
+
 
 def setup_logger(name: str = None):
     """设置日志配置"""
+    global _configured
+    if not _configured:
+        _configure_sinks()
+        _configured = True
+
+    # 返回指定名称的logger
+    if name:
+        return logger.bind(name=name)
+    return logger
+
+
+def _configure_sinks() -> None:
+    """替换loguru默认处理器为控制台和文件输出"""
     # 移除默认的处理器
     logger.remove()
 
@@ -21,18 +44,44 @@ def setup_logger(name: str = None):
         colorize=True
     )
 
-    # 添加文件输出
+    # 添加文件输出：每条记录一行JSON，文件写入在后台线程中完成
     if settings.log_file:
         logger.add(
             settings.log_file,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+            format=_json_line_format,
             level=settings.log_level.upper(),
             rotation="10 MB",
             retention="30 days",
-            compression="zip"
+            compression="zip",
+            enqueue=True
         )
 
-    # 返回指定名称的logger
-    if name:
-        return logger.bind(name=name)
-    return logger
\ No newline at end of file
+
+def _json_line_format(record) -> str:
+    """
+    将日志记录序列化为一行JSON
+
+    设计思路：
+    1. loguru把format函数的返回值当作模板再格式化，JSON中的花括号会被解析，
+       因此先把序列化结果放入extra，模板只引用这个字段
+    2. 保留loguru文件sink，按大小轮转、过期清理和压缩的行为不变
+    """
+    payload = {
+        'ts': record['time'].isoformat(),
+        'lvl': record['level'].name,
+        'mod': record['name'],
+        'fn': record['function'],
+        'line': record['line'],
+        'msg': record['message']
+    }
+    exception = record['exception']
+    if exception is not None:
+        payload['exc'] = ''.join(
+            traceback.format_exception(exception.type, exception.value, exception.traceback)
+        )
+
+    if orjson is not None:
+        record['extra']['_json'] = orjson.dumps(payload).decode()
+    else:
+        record['extra']['_json'] = json.dumps(payload, ensure_ascii=False)
+    return "{extra[_json]}\n"
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+add_function_unique_constraint迁移脚本测试
+"""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+MIGRATION_PATH = Path(__file__).resolve().parent.parent / "scripts" / "migrations" / "add_function_unique_constraint.py"
+
+
+@pytest.fixture
+def migration(tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location("add_function_unique_constraint", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "DB_PATH", tmp_path / "malapi.db")
+    return module
+
+
+def _create_legacy_table(db_path, rows) -> None:
+    """迁移前的表结构：没有(hash_id, alias)唯一约束"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE malapi_functions ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, hash_id VARCHAR(40) NOT NULL, alias VARCHAR(255) NOT NULL)"
+        )
+        conn.executemany("INSERT INTO malapi_functions (hash_id, alias) VALUES (?, ?)", rows)
+
+
+def _index_names(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {row[1] for row in conn.execute("PRAGMA index_list(malapi_functions)")}
+
+
+def test_migration_creates_unique_index_and_is_idempotent(migration):
+    _create_legacy_table(migration.DB_PATH, [("a" * 40, "MalAPI_A"), ("a" * 40, "MalAPI_B")])
+
+    assert migration.migrate() is True
+    assert migration.migrate() is True
+    assert "unique_function" in _index_names(migration.DB_PATH)
+
+    with sqlite3.connect(migration.DB_PATH) as conn, pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO malapi_functions (hash_id, alias) VALUES (?, ?)", ("a" * 40, "MalAPI_A"))
+
+
+def test_migration_refuses_existing_duplicates(migration):
+    _create_legacy_table(migration.DB_PATH, [("a" * 40, "MalAPI_A"), ("a" * 40, "MalAPI_A")])
+
+    assert migration.migrate() is False
+    assert "unique_function" not in _index_names(migration.DB_PATH)
+
+
+def test_migration_requires_existing_database(migration):
+    assert migration.migrate() is False
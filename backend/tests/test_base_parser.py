@@ -0,0 +1,208 @@
+"""
+BaseParser解析钩子约定的测试
+"""
+
+import asyncio
+import errno
+import json
+from pathlib import Path
+
+import pytest
+
+from src.exceptions.data_exceptions import ParseError, RetryableParseError
+from src.parsers.base_parser import BaseParser, JSONBaseParser, ParserConfig
+
+
+class DictParser(JSONBaseParser[dict]):
+    pass
+
+
+def _write_json(path: Path, data) -> Path:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def _failing_read_bytes(monkeypatch, error_numbers):
+    """让Path.read_bytes依次抛出给定errno的OSError，用完后恢复正常读取，返回调用计数"""
+    calls = []
+    original = Path.read_bytes
+
+    def read_bytes(self):
+        calls.append(self)
+        if len(calls) <= len(error_numbers):
+            code = error_numbers[len(calls) - 1]
+            raise OSError(code, errno.errorcode[code])
+        return original(self)
+
+    monkeypatch.setattr(Path, "read_bytes", read_bytes)
+    return calls
+
+
+def test_subclass_without_parse_hook_is_rejected():
+    with pytest.raises(TypeError, match="_parse_content"):
+        class IncompleteParser(BaseParser[dict]):
+            def get_supported_extensions(self):
+                return ['.txt']
+
+
+@pytest.mark.asyncio
+async def test_sync_hook_runs_in_executor():
+    class UpperParser(BaseParser[str]):
+        def _parse_content_sync(self, content, source=None):
+            return content.upper()
+
+    assert await UpperParser()._parse_content("abc") == "ABC"
+
+
+@pytest.mark.asyncio
+async def test_async_hook_overrides_default():
+    class EchoParser(BaseParser[str]):
+        async def _parse_content(self, content, source=None):
+            return content
+
+    assert await EchoParser()._parse_content("abc") == "abc"
+
+
+def test_json_base_parser_subclass_needs_no_hook():
+    class SignatureParser(JSONBaseParser[dict]):
+        pass
+
+    assert SignatureParser()._parse_content_sync(b'{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_transient_read_error_is_retried(tmp_path, monkeypatch):
+    manifest = _write_json(tmp_path / "a.json", {"alias": "a"})
+    calls = _failing_read_bytes(monkeypatch, [errno.EIO, errno.EAGAIN])
+    parser = DictParser(ParserConfig(retry_attempts=3, retry_delay=0))
+
+    assert await parser.parse_file_with_retry(manifest) == {"alias": "a"}
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_after_retry_attempts(tmp_path, monkeypatch):
+    manifest = _write_json(tmp_path / "a.json", {"alias": "a"})
+    calls = _failing_read_bytes(monkeypatch, [errno.EIO] * 10)
+    parser = DictParser(ParserConfig(retry_attempts=2, retry_delay=0))
+
+    with pytest.raises(ParseError) as exc_info:
+        await parser.parse_file_with_retry(manifest)
+
+    assert not isinstance(exc_info.value, RetryableParseError)
+    assert isinstance(exc_info.value.original_error, RetryableParseError)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_permanent_read_error_is_not_retried(tmp_path, monkeypatch):
+    """永久性错误只尝试一次：非严格模式返回None，严格模式直接抛出"""
+    manifest = _write_json(tmp_path / "a.json", {"alias": "a"})
+    calls = _failing_read_bytes(monkeypatch, [errno.EACCES] * 10)
+
+    lenient = DictParser(ParserConfig(retry_attempts=3, retry_delay=0))
+    assert await lenient.parse_file_with_retry(manifest) is None
+    assert len(calls) == 1
+
+    strict = DictParser(ParserConfig(retry_attempts=3, retry_delay=0, strict_mode=True))
+    with pytest.raises(ParseError) as exc_info:
+        await strict.parse_file_with_retry(manifest)
+    assert not isinstance(exc_info.value, RetryableParseError)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_files_keeps_input_order_and_skips_failures(tmp_path):
+    paths = [_write_json(tmp_path / f"{index}.json", {"index": index}) for index in range(20)]
+    (tmp_path / "7.json").write_text("{broken", encoding="utf-8")
+    parser = DictParser(ParserConfig(max_concurrent_tasks=4))
+
+    results = await parser.parse_files(paths)
+
+    assert [result["index"] for result in results] == [index for index in range(20) if index != 7]
+    assert parser.statistics.total_files == 20
+    assert parser.statistics.failed_parses == 1
+
+
+@pytest.mark.asyncio
+async def test_strict_parse_files_cancels_remaining_workers(tmp_path):
+    """严格模式下第一个失败立即抛出原始异常，仍在解析的协程被取消而不是等到完成"""
+    class BlockingParser(DictParser):
+        async def _parse_content(self, content, source=None):
+            if Path(source).name == "bad.json":
+                raise ParseError("bad content", file_path=str(source))
+            await asyncio.Event().wait()
+
+    paths = [_write_json(tmp_path / f"{index}.json", {}) for index in range(5)]
+    paths.append(_write_json(tmp_path / "bad.json", {}))
+    parser = BlockingParser(ParserConfig(strict_mode=True, max_concurrent_tasks=6))
+
+    with pytest.raises(ParseError, match="bad content"):
+        await asyncio.wait_for(parser.parse_files(paths), timeout=5)
+
+    assert parser.statistics.total_files == 6
+    assert parser.statistics.failed_parses == 1
+    assert parser.statistics.end_time is not None
+
+
+def test_backends_are_tried_in_order_with_fallback():
+    class ChainParser(JSONBaseParser[dict]):
+        _backends = {}
+
+    def rejecting_loads(content):
+        raise ValueError("unsupported")
+
+    ChainParser.register_backend("rejecting", rejecting_loads)
+    ChainParser.register_backend("tagging", lambda content: {"backend": "tagging"})
+
+    assert ChainParser()._parse_content_sync(b'{"a": 1}') == {"backend": "tagging"}
+
+
+def test_register_backend_does_not_leak_to_parent_or_siblings():
+    class FirstParser(JSONBaseParser[dict]):
+        pass
+
+    class SecondParser(JSONBaseParser[dict]):
+        pass
+
+    parent_backends = dict(JSONBaseParser._backends)
+    FirstParser.register_backend("custom", json.loads)
+
+    assert "custom" in FirstParser._backends
+    assert "custom" not in SecondParser._backends
+    assert JSONBaseParser._backends == parent_backends
+
+
+def test_stdlib_fallback_reports_line_and_column():
+    class StdlibParser(JSONBaseParser[dict]):
+        _backends = {}
+
+    parser = StdlibParser()
+    assert parser._parse_content_sync('{"alias": "测试"}') == {"alias": "测试"}
+
+    with pytest.raises(ParseError) as exc_info:
+        parser._parse_content_sync(b'{\n  "alias": }', "broken.json")
+    assert (exc_info.value.line_number, exc_info.value.column_number) == (2, 12)
+    assert exc_info.value.file_path == "broken.json"
+
+
+def test_orjson_backend_is_registered_when_installed():
+    pytest.importorskip("orjson")
+
+    assert "orjson" in JSONBaseParser._backends
+
+
+def test_from_json_error_is_not_retried_with_other_backends():
+    """_from_json的转换错误不触发后端回退，只调用一次并原样抛出"""
+    calls = []
+
+    class ConvertingParser(JSONBaseParser[int]):
+        _backends = {"first": json.loads, "second": json.loads}
+
+        def _from_json(self, data, source=None):
+            calls.append(data)
+            return int(data["count"])
+
+    with pytest.raises(ValueError, match="invalid literal"):
+        ConvertingParser()._parse_content_sync(b'{"count": "many"}')
+    assert calls == [{"count": "many"}]
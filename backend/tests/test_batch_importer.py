@@ -0,0 +1,112 @@
+"""
+BatchImporter单元测试
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from src.database.models import AttCKMapping, FunctionChild, MalAPIFunction
+from src.importers.batch_importer import BatchImporter
+
+
+def _record(index: int) -> dict:
+    return {
+        "status": "ok",
+        "root_function": f"sub_{index:x}",
+        "alias": f"MalAPI_Func{index}",
+        "summary": "test function",
+        "attck": ["T1055"],
+        "children_aliases": {}
+    }
+
+
+async def _count(session_factory, model) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+def _compile_postgresql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def test_unnest_insert_renders_column_aliases():
+    """多数组unnest必须带列别名，否则PostgreSQL中所有输出列都名为unnest"""
+    columns = BatchImporter.ATTACK_MAPPING_COLUMNS
+    rows = [dict.fromkeys(columns, None)]
+
+    sql = _compile_postgresql(BatchImporter._build_unnest_insert(AttCKMapping, columns, rows))
+
+    assert f"AS anon_1({', '.join(columns)})" in sql
+    for column in columns:
+        assert f"anon_1.{column}" in sql
+
+
+def test_unnest_insert_uses_one_array_parameter_per_column():
+    """无论行数多少，每列只绑定一个数组参数"""
+    columns = BatchImporter.CHILD_MAPPING_COLUMNS
+    rows = [dict.fromkeys(columns, None) for _ in range(50)]
+
+    statement = BatchImporter._build_unnest_insert(FunctionChild, columns, rows)
+    compiled = statement.compile(dialect=postgresql.asyncpg.dialect())
+
+    assert len(compiled.params) == len(columns)
+    assert all(len(value) == len(rows) for value in compiled.params.values())
+
+
+@pytest.mark.asyncio
+async def test_reimport_skips_existing_functions(session_factory):
+    """重复导入由ON CONFLICT DO NOTHING跳过，不产生重复的函数和映射"""
+    importer = BatchImporter(session_factory, batch_size=4, max_concurrent_batches=1)
+    records = [_record(index) for index in range(10)]
+
+    first = await importer.import_records(records)
+    second = await importer.import_records(records)
+
+    assert first.successful_imports == 10
+    assert second.successful_imports == 0
+    assert second.duplicate_imports == 10
+    assert await _count(session_factory, MalAPIFunction) == 10
+    assert await _count(session_factory, AttCKMapping) == 10
+
+
+@pytest.mark.asyncio
+async def test_duplicates_within_one_batch_get_a_single_id(session_factory):
+    importer = BatchImporter(session_factory, max_concurrent_batches=1)
+    row = {"hash_id": "a" * 40, "alias": "MalAPI_Dup", "summary": "dup"}
+
+    async with session_factory() as session, session.begin():
+        function_ids, duplicates = await importer._insert_functions(session, [row, dict(row)], [])
+
+    assert function_ids[0] is not None and function_ids[1] is None
+    assert duplicates == 1
+
+
+@pytest.mark.asyncio
+async def test_bisecting_retry_isolates_the_failing_row(session_factory):
+    """非唯一键的约束错误只让出错的那一条失败，同批次其余记录照常插入"""
+    importer = BatchImporter(session_factory, max_concurrent_batches=1)
+    rows = [{"hash_id": f"{index:040x}", "alias": f"MalAPI_Func{index}"} for index in range(7)]
+    rows[5]["hash_id"] = None
+    errors = []
+
+    async with session_factory() as session, session.begin():
+        function_ids, duplicates = await importer._insert_functions(session, rows, errors)
+
+    assert [function_id is None for function_id in function_ids] == [index == 5 for index in range(7)]
+    assert duplicates == 0
+    assert len(errors) == 1 and "MalAPI_Func5" in errors[0]
+    assert await _count(session_factory, MalAPIFunction) == 6
+
+
+@pytest.mark.asyncio
+async def test_unique_function_constraint_rejects_plain_duplicate_insert(session_factory):
+    """模型上的unique_function约束与ON CONFLICT的冲突目标一致"""
+    async with session_factory() as session:
+        session.add_all([
+            MalAPIFunction(hash_id="b" * 40, alias="MalAPI_Same"),
+            MalAPIFunction(hash_id="b" * 40, alias="MalAPI_Same"),
+        ])
+        with pytest.raises(IntegrityError, match="UNIQUE"):
+            await session.commit()
@@ -0,0 +1,33 @@
+"""
+数据处理异常类测试
+"""
+
+from src.exceptions.data_exceptions import DataProcessingError, ParseError, ValidationError
+
+
+def test_str_without_details():
+    error = DataProcessingError("出错了", error_code="CUSTOM")
+
+    assert str(error) == "[CUSTOM] 出错了"
+
+
+def test_str_includes_first_detail():
+    error = ValidationError("字段验证失败", field_name="alias", field_value="x")
+
+    assert str(error) == "[VALIDATION_ERROR] 字段验证失败 - field_name: alias"
+
+
+def test_str_reflects_details_added_after_construction():
+    error = ParseError("解析失败")
+    assert str(error).endswith("解析失败")
+
+    error.details["file_path"] = "manifest.json"
+
+    assert str(error) == f"[{error.error_code}] 解析失败 - file_path: manifest.json"
+
+
+def test_str_reflects_error_code_changed_after_construction():
+    error = ParseError("解析失败")
+    error.error_code = "PARSE_JSON_ERROR"
+
+    assert str(error) == "[PARSE_JSON_ERROR] 解析失败"
@@ -0,0 +1,165 @@
+"""
+ImportManager解析导入流水线测试
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.importers.import_manager import ImportManager, ImportProcessResult
+
+
+def _write_manifests(root, count: int) -> None:
+    for index in range(count):
+        function_dir = root / f"sample{index // 10}" / f"MalAPI_Func{index}"
+        function_dir.mkdir(parents=True)
+        (function_dir / "manifest.json").write_text(json.dumps({
+            "status": "ok",
+            "root_function": f"sub_{index:x}",
+            "alias": f"MalAPI_Func{index}",
+            "summary": "test function",
+            "attck": ["T1055"],
+            "children_aliases": {}
+        }), encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_import_failure_with_full_queues_does_not_hang(tmp_path, session_factory):
+    """导入阶段失败时，阻塞在已满队列上的扫描和解析任务必须被取消，而不是永远等待"""
+    _write_manifests(tmp_path, 40)
+    manager = ImportManager(
+        session_factory,
+        parser_config={'queue_size': 2, 'max_concurrency': 2, 'validate_attack_ids': False},
+        importer_config={'batch_size': 2}
+    )
+
+    async def failing_import_records(records, connection=None):
+        raise RuntimeError("database unavailable")
+
+    manager.importer.import_records = failing_import_records
+
+    result = await asyncio.wait_for(manager.import_from_directory(str(tmp_path)), timeout=10)
+
+    assert result.import_result is None
+
+
+@pytest.mark.asyncio
+async def test_scan_failure_is_raised_instead_of_hanging(tmp_path, session_factory):
+    """扫描阶段的异常应原样抛出，解析和导入任务随之取消"""
+    _write_manifests(tmp_path, 10)
+    manager = ImportManager(
+        session_factory,
+        parser_config={'queue_size': 2, 'max_concurrency': 2, 'validate_attack_ids': False},
+        importer_config={'batch_size': 2}
+    )
+
+    async def failing_scan():
+        for manifest in sorted(tmp_path.rglob("manifest.json"))[:3]:
+            yield manifest
+        raise OSError("scan interrupted")
+
+    with pytest.raises(OSError, match="scan interrupted"):
+        await asyncio.wait_for(
+            manager._parse_and_import(failing_scan(), ImportProcessResult()), timeout=10
+        )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_imports_all_files(tmp_path, session_factory):
+    _write_manifests(tmp_path, 25)
+    manager = ImportManager(
+        session_factory,
+        parser_config={'queue_size': 2, 'max_concurrency': 2, 'validate_attack_ids': False},
+        importer_config={'batch_size': 2}
+    )
+
+    result = await asyncio.wait_for(manager.import_from_directory(str(tmp_path)), timeout=10)
+
+    assert result.successful_parses == 25
+    assert result.failed_parses == 0
+    assert result.import_result.successful_imports == 25
+
+
+@pytest.mark.asyncio
+async def test_statistics_are_live_during_import(tmp_path, session_factory):
+    """导入进行中get_statistics不能返回导入开始前缓存的快照"""
+    _write_manifests(tmp_path, 5)
+    manager = ImportManager(
+        session_factory,
+        parser_config={'queue_size': 2, 'max_concurrency': 2, 'validate_attack_ids': False},
+        importer_config={'batch_size': 10}
+    )
+    before = manager.get_statistics()
+    assert manager.get_statistics() is before
+
+    seen_during_import = []
+    import_records = manager.importer.import_records
+
+    async def observing_import_records(records, connection=None):
+        seen_during_import.append(manager.get_statistics().parser['total_files'])
+        return await import_records(records, connection)
+
+    manager.importer.import_records = observing_import_records
+
+    await asyncio.wait_for(manager.import_from_directory(str(tmp_path)), timeout=10)
+
+    assert seen_during_import and seen_during_import[0] > 0
+    after = manager.get_statistics()
+    assert after is not before
+    assert after.parser['total_files'] == 5
+    assert manager.get_statistics() is after
+
+
+@pytest.mark.asyncio
+async def test_reimport_reuses_parse_cache(tmp_path, session_factory):
+    """未变化的文件第二次导入直接命中解析缓存，重复记录由数据库跳过"""
+    source = tmp_path / "source"
+    _write_manifests(source, 12)
+    manager = ImportManager(
+        session_factory,
+        parser_config={'queue_size': 4, 'max_concurrency': 2, 'validate_attack_ids': False},
+        importer_config={'batch_size': 5, 'cache_dir': str(tmp_path / "cache")}
+    )
+    try:
+        await asyncio.wait_for(manager.import_from_directory(str(source)), timeout=10)
+        second = await asyncio.wait_for(manager.import_from_directory(str(source)), timeout=10)
+    finally:
+        manager.close()
+
+    assert manager.parse_cache.hits == 12
+    assert second.successful_parses == 12
+    assert second.import_result.duplicate_imports == 12
+    parser_stats = manager.parser.get_statistics()
+    assert parser_stats['total_files'] == 24
+    assert parser_stats['successful_parses'] == 24
+    assert parser_stats['parse_cache_hits'] == 12
+
+
+@pytest.mark.asyncio
+async def test_cached_result_rechecks_cpp_file(tmp_path, session_factory):
+    """CPP文件的增删不改变manifest，命中缓存时仍需按当前文件系统给出警告"""
+    source = tmp_path / "source"
+    _write_manifests(source, 1)
+    manifest = next(source.rglob("manifest.json"))
+    cpp_file = manifest.parent / "MalAPI_Func0.cpp"
+    manager = ImportManager(
+        session_factory,
+        parser_config={'validate_attack_ids': False},
+        importer_config={'cache_dir': str(tmp_path / "cache")}
+    )
+    try:
+        first = await manager._parse_file(manifest)
+        cpp_file.write_text("int main() {}", encoding="utf-8")
+        second = await manager._parse_file(manifest)
+        cpp_file.unlink()
+        third = await manager._parse_file(manifest)
+    finally:
+        manager.close()
+
+    assert manager.parse_cache.hits == 2
+    assert any(warning.startswith("CPP文件不存在") for warning in first.warnings)
+    assert not any(warning.startswith("CPP文件不存在") for warning in second.warnings)
+    assert [warning for warning in third.warnings if warning.startswith("CPP文件不存在")] == [
+        f"CPP文件不存在: {cpp_file}"
+    ]
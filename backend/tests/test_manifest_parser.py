@@ -0,0 +1,51 @@
+"""
+ManifestParser单元测试
+"""
+
+import json
+
+import pytest
+
+from src.parsers.manifest_parser import ManifestParser
+
+
+def _write_manifest(path, data) -> str:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_invalid_manifest_result_data_is_a_dict(tmp_path):
+    """验证失败的结果仍可直接对data调用get，调用方不必先检查is_valid"""
+    parser = ManifestParser(validate_attack_ids=True)
+    manifest = _write_manifest(tmp_path / "manifest.json", {
+        "status": "ok",
+        "alias": "MalAPI_Bad",
+        "summary": "bad attck",
+        "attck": ["X1234"]
+    })
+
+    result = await parser.parse_file(manifest)
+
+    assert isinstance(result.data, dict)
+    assert isinstance(result.data.get('attck', []), list)
+
+
+@pytest.mark.asyncio
+async def test_unreadable_manifest_result_data_is_empty_dict(tmp_path):
+    parser = ManifestParser()
+
+    result = await parser.parse_file(str(tmp_path / "missing" / "manifest.json"))
+
+    assert not result.is_valid
+    assert result.data == {}
+
+
+def test_decode_json_accepts_bom_and_invalid_utf8():
+    assert ManifestParser.decode_json('﻿{"alias": "a"}'.encode("utf-8")) == {"alias": "a"}
+    assert ManifestParser.decode_json(b'{"alias": "\xff"}') == {"alias": "�"}
+
+
+def test_decode_json_raises_json_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        ManifestParser.decode_json(b'{"alias": ')
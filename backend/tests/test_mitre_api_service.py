@@ -0,0 +1,110 @@
+"""
+MITREAPIService缓存写入测试
+"""
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from src.database.models import AttackTechnique
+from src.services.mitre_api_service import MITREAPIService
+
+
+def _details(technique_id: str) -> dict:
+    return {
+        'technique_id': technique_id,
+        'description': f"desc {technique_id}",
+        'url': f"https://attack.mitre.org/techniques/{technique_id}",
+        'detection': "detect",
+        'mitigation': None,
+        'data_sources': "Process, File",
+    }
+
+
+async def _seed_techniques(session_factory, *technique_ids) -> None:
+    async with session_factory() as session:
+        session.add_all(
+            AttackTechnique(technique_id=technique_id, technique_name=f"name {technique_id}")
+            for technique_id in technique_ids
+        )
+        await session.commit()
+
+
+async def _techniques(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(AttackTechnique).order_by(AttackTechnique.technique_id))
+        return {technique.technique_id: technique for technique in result.scalars()}
+
+
+@pytest.mark.asyncio
+async def test_write_cache_upserts_in_chunks(session_factory):
+    """已有技术只更新mitre_*列，不存在的技术以technique_id为名称插入"""
+    await _seed_techniques(session_factory, "T1001", "T1002", "T1003")
+    service = MITREAPIService()
+    service.WRITE_CHUNK_SIZE = 2
+
+    async with session_factory() as session:
+        await service._write_cache(session, [_details(t) for t in ("T1001", "T1002", "T1003", "T1999")])
+
+    techniques = await _techniques(session_factory)
+    assert techniques["T1001"].technique_name == "name T1001"
+    assert techniques["T1003"].mitre_description == "desc T1003"
+    assert techniques["T1003"].mitre_updated_at is not None
+    assert techniques["T1999"].technique_name == "T1999"
+
+
+@pytest.mark.asyncio
+async def test_write_cache_fallback_updates_existing_rows_only(session_factory):
+    """不支持ON CONFLICT的方言按technique_id批量UPDATE"""
+    await _seed_techniques(session_factory, "T1001", "T1002")
+    service = MITREAPIService()
+    service.UPSERT_INSERTS = {}
+
+    async with session_factory() as session:
+        await service._write_cache(session, [_details("T1002"), _details("T1999")])
+
+    techniques = await _techniques(session_factory)
+    assert set(techniques) == {"T1001", "T1002"}
+    assert techniques["T1001"].mitre_description is None
+    assert techniques["T1002"].mitre_description == "desc T1002"
+    assert techniques["T1002"].technique_name == "name T1002"
+
+
+@pytest.mark.asyncio
+async def test_batch_update_cache_retries_and_counts_failures(session_factory, monkeypatch):
+    await _seed_techniques(session_factory, "T1001", "T1002", "T1003", "T1004")
+    calls = {}
+
+    async def handler(request):
+        technique_id = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+        calls[technique_id] = calls.get(technique_id, 0) + 1
+        if technique_id == "T1002" and calls[technique_id] == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if technique_id == "T1003":
+            return httpx.Response(503)
+        if technique_id == "T1004":
+            return httpx.Response(404)
+        return httpx.Response(200, json={
+            "type": "attack-pattern",
+            "name": technique_id,
+            "description": f"desc {technique_id}",
+            "x_mitre_data_sources": ["Process"],
+            "external_references": [
+                {"source_name": "mitre-attack", "external_id": technique_id, "url": f"u/{technique_id}"}
+            ]
+        })
+
+    service = MITREAPIService(concurrency=2)
+    monkeypatch.setattr(service, "_retry_delay", lambda response, attempt: 0)
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        async with session_factory() as session:
+            stats = await service.batch_update_cache(session)
+    finally:
+        await service.client.aclose()
+
+    assert stats == {'total': 4, 'success': 2, 'failed': 2}
+    assert calls == {"T1001": 1, "T1002": 2, "T1003": service.MAX_ATTEMPTS, "T1004": 1}
+    techniques = await _techniques(session_factory)
+    assert techniques["T1002"].mitre_url == "u/T1002"
+    assert techniques["T1003"].mitre_description is None
@@ -0,0 +1,86 @@
+"""
+ParseCache解析结果缓存测试
+"""
+
+import time
+
+import pytest
+
+from src.importers.parse_cache import ParseCache
+from src.parsers.manifest_parser import ManifestParseResult
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    yield cache
+    cache.close()
+
+
+def _result(alias: str) -> ManifestParseResult:
+    return ManifestParseResult(is_valid=True, data={"alias": alias}, source_file=f"{alias}/manifest.json")
+
+
+def test_hit_requires_unchanged_mtime_and_size(cache):
+    cache.put("a/manifest.json", 100, 10, _result("MalAPI_A"))
+
+    assert cache.get("a/manifest.json", 100, 10).data == {"alias": "MalAPI_A"}
+    assert cache.get("a/manifest.json", 101, 10) is None
+    assert cache.get("a/manifest.json", 100, 11) is None
+    assert cache.get("b/manifest.json", 100, 10) is None
+    assert cache.get_statistics() == {'hits': 1, 'misses': 3, 'hit_rate': 25.0}
+
+
+def test_put_overwrites_previous_result_for_same_path(cache):
+    cache.put("a/manifest.json", 100, 10, _result("MalAPI_Old"))
+    cache.put("a/manifest.json", 200, 12, _result("MalAPI_New"))
+
+    assert cache.get("a/manifest.json", 100, 10) is None
+    assert cache.get("a/manifest.json", 200, 12).data == {"alias": "MalAPI_New"}
+
+
+def test_variants_are_isolated(cache):
+    cache.put("a/manifest.json", 100, 10, _result("MalAPI_Strict"), variant="strict")
+
+    assert cache.get("a/manifest.json", 100, 10) is None
+    assert cache.get("a/manifest.json", 100, 10, variant="strict").data == {"alias": "MalAPI_Strict"}
+
+
+def test_results_persist_across_instances(tmp_path):
+    first = ParseCache(tmp_path / "cache")
+    first.put("a/manifest.json", 100, 10, _result("MalAPI_A"))
+    first.close()
+
+    second = ParseCache(tmp_path / "cache")
+    try:
+        assert second.get("a/manifest.json", 100, 10).data == {"alias": "MalAPI_A"}
+    finally:
+        second.close()
+
+
+def test_evict_removes_only_stale_entries(cache, monkeypatch):
+    cache.put("old/manifest.json", 100, 10, _result("MalAPI_Old"))
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + cache.max_age_seconds + 1)
+    cache.put("new/manifest.json", 100, 10, _result("MalAPI_New"))
+
+    assert cache.evict() == 1
+    assert cache.get("old/manifest.json", 100, 10) is None
+    assert cache.get("new/manifest.json", 100, 10) is not None
+
+
+def test_corrupt_entry_is_treated_as_miss(cache):
+    cache.put("a/manifest.json", 100, 10, _result("MalAPI_A"))
+    cache._conn.execute("UPDATE parse_cache SET result = ?", (b"not a pickle",))
+
+    assert cache.get("a/manifest.json", 100, 10) is None
+
+
+def test_clear_drops_entries_and_statistics(cache):
+    cache.put("a/manifest.json", 100, 10, _result("MalAPI_A"))
+    cache.get("a/manifest.json", 100, 10)
+
+    cache.clear()
+
+    assert cache.get_statistics()['hits'] == 0
+    assert cache.get("a/manifest.json", 100, 10) is None
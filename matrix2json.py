@@ -10,27 +10,33 @@ import sys
 import json
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup, Tag
-
-def is_top_level(cell: Tag) -> bool:
-    """判断该 technique-cell 是否是最外层（祖先里再无同类）"""
-    parent = cell.parent
-    while parent:
-        if parent.name == 'div':
-            cls = parent.get('class', [])
-            if 'subtechniques' in cls:
-                return False
-        parent = parent.parent
-    return True
-
-
-
-def extract_id_name(a_tag: Tag) -> tuple[str, str]:
+from lxml import etree
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json输出
+    orjson = None
+
+# 技术名称中的连续空白字符，模块加载时编译一次
+_WS_RE = re.compile(r'\s+')
+
+# 预编译XPath，查找在C层完成，不再为每个节点构建BeautifulSoup包装对象
+# 类名按子串匹配，与原先 'technique-cell' in class 的判断一致
+_TECHNIQUE_CELLS = etree.XPath(".//div[contains(@class, 'technique-cell')]")
+# 最外层technique-cell：祖先中没有class包含subtechniques的div
+_TOP_LEVEL_CELLS = etree.XPath(
+    "//div[contains(@class, 'technique-cell')]"
+    "[not(ancestor::div[contains(concat(' ', normalize-space(@class), ' '), ' subtechniques ')])]"
+)
+# 锚点中除<sub>计数标记以外的文本节点
+_NAME_TEXTS = etree.XPath(".//text()[not(ancestor::sub)]")
+
+def extract_id_name(a_tag: etree._Element) -> tuple[str, str]:
     """
     从锚点标签中提取技术ID和名称
 
     Args:
-        a_tag: BeautifulSoup锚点标签
+        a_tag: lxml锚点元素
 
     Returns:
         tuple: (技术ID, 名称) 或 (None, None)
@@ -49,41 +55,25 @@ def extract_id_name(a_tag: Tag) -> tuple[str, str]:
     if len(parts) >= 3:
         technique_id += '.' + parts[-1]
 
-    # 清理名称文本：移除<sub>标签内容并规范化空白字符
-    cleaned_tag = a_tag.__copy__()
-
-    # 删除所有子标签（如计数标记）
-    for sub_element in cleaned_tag.select('sub'):
-        sub_element.decompose()
+    # 清理名称文本：跳过<sub>标签内的计数标记并规范化空白字符
+    raw_text = ''.join(_NAME_TEXTS(a_tag))
 
-    # 规范化文本
-    raw_text = cleaned_tag.get_text() or ''
-
-    # 使用正则表达式清理空白字符
-    # 换行符+空白 -> 单个空格
-    cleaned_text = re.sub(r'\n\s+', ' ', raw_text)
-    # 多个空白字符 -> 单个空格
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-    # 移除首尾空白
-    technique_name = cleaned_text.strip()
+    # 连续空白字符(含换行) -> 单个空格，并移除首尾空白
+    technique_name = _WS_RE.sub(' ', raw_text).strip()
 
     return technique_id, technique_name
 
 def parse_html(html: str):
-    soup = BeautifulSoup(html, 'lxml')
-    # 匹配所有含有technique-cell类型的元素
-    top_cells = [
-        div for div in soup.find_all(
-            'div',
-            class_=lambda x: x and 'technique-cell' in x
-        )
-        if is_top_level(div)
-    ]
+    root = etree.HTML(html)
+    if root is None:
+        return []
+    # 匹配所有含有technique-cell类型的最外层元素
+    top_cells = _TOP_LEVEL_CELLS(root)
 
     result = []
     for top in top_cells:
-        a_tag = top.find('a')
-        if not a_tag:
+        a_tag = top.find('.//a')
+        if a_tag is None:
             continue
         tid, name = extract_id_name(a_tag)
         if not tid:
@@ -91,27 +81,27 @@ def parse_html(html: str):
         item = {tid: name}
 
         # 查找嵌套的子技术（包含所有层级的 technique-cell）
-        sub_cells = top.find_all('div', class_=lambda x: x and 'technique-cell' in x)
+        sub_cells = _TECHNIQUE_CELLS(top)
         if sub_cells:
             sub_list = []
             for sub in sub_cells:
-                sa = sub.find('a')
-                if not sa:
+                sa = sub.find('.//a')
+                if sa is None:
                     continue
                 stid, sname = extract_id_name(sa)
                 if stid:
-                    # sub_list.append({'id': stid, 'name': sname})
-                    sub_list.append({stid, sname})
+                    # 与parse_html2的子技术格式一致：{Txxxx.001: 名称}
+                    sub_list.append({stid: sname})
             if sub_list:
                 item['sub'] = sub_list
         result.append(item)
 
     return result
 
-def _extract_technique_info(container: Tag) -> dict:
+def _extract_technique_info(container: etree._Element) -> dict:
     """提取单个技术信息，返回{id: name}格式字典"""
-    anchor_tag = container.find('a')
-    if not anchor_tag:
+    anchor_tag = container.find('.//a')
+    if anchor_tag is None:
         return None
 
     technique_id, technique_name = extract_id_name(anchor_tag)
@@ -121,7 +111,7 @@ def _extract_technique_info(container: Tag) -> dict:
     return {technique_id: technique_name}
 
 
-def _process_simple_technique(child_element: Tag) -> dict:
+def _process_simple_technique(child_element: etree._Element) -> dict:
     """处理无子技术的简单技术"""
     technique_info = _extract_technique_info(child_element)
     if technique_info:
@@ -129,15 +119,10 @@ def _process_simple_technique(child_element: Tag) -> dict:
     return technique_info
 
 
-def _process_composite_technique(child_element: Tag) -> dict:
+def _process_composite_technique(child_element: etree._Element) -> dict:
     """处理包含子技术的复合技术"""
     # 提取所有技术单元格
-    technique_cells = [
-        div for div in child_element.find_all(
-            'div',
-            class_=lambda x: x and 'technique-cell' in x
-        )
-    ]
+    technique_cells = _TECHNIQUE_CELLS(child_element)
 
     if len(technique_cells) < 2:
         return None  # 复合技术应该至少有主技术+子技术
@@ -162,6 +147,13 @@ def _process_composite_technique(child_element: Tag) -> dict:
     return main_technique
 
 
+def _process_top_child(child: etree._Element) -> dict:
+    """按元素类型分派：div为无子技术的简单技术，其他（如table）为包含子技术的复合技术"""
+    if child.tag == 'div':
+        return _process_simple_technique(child)
+    return _process_composite_technique(child)
+
+
 def parse_html2(html: str):
     """
     解析 MITRE ATT&CK HTML 矩阵，提取技术和子技术信息
@@ -173,32 +165,26 @@ def parse_html2(html: str):
         list: 包含技术信息的字典列表，格式 [{Txxxx: 名称, sub: [{Txxxx.001: 名称}]}]
     """
     try:
-        soup = BeautifulSoup(html, 'lxml')
+        # 使用etree.HTML而不是lxml.html：lxml.html为每个返回到Python的节点
+        # 执行一次Python层的元素类查找，这里只需要普通元素
+        root = etree.HTML(html)
         result = []
         # 安全获取根节点
-        body_element = soup.body
-        if not body_element:
+        body_element = root.find('body') if root is not None else None
+        if body_element is None:
             raise ValueError("HTML文档缺少body元素")
 
-        root_children = body_element.find_all(recursive=False)
-        if not root_children:
+        # 只需要第一个元素节点，跳过注释和处理指令，不构建完整的子节点列表
+        container = next((child for child in body_element if isinstance(child.tag, str)), None)
+        if container is None:
             raise ValueError("HTML文档body为空")
 
-        # 遍历第一层子元素
-        for child in root_children[0].find_all(recursive=False):
-            if not isinstance(child, Tag):
+        # 遍历第一层子元素，每个子树只由一次预编译XPath扫描
+        for child in container:
+            if not isinstance(child.tag, str):
                 continue
 
-            technique_info = None
-
-            if child.name == 'div':
-                # 处理无子技术的简单技术
-                technique_info = _process_simple_technique(child)
-            else:
-                # print("test\n")
-                # 处理包含子技术的复合技术
-                technique_info = _process_composite_technique(child)
-
+            technique_info = _process_top_child(child)
             if technique_info:
                 result.append(technique_info)
 
@@ -210,6 +196,55 @@ def parse_html2(html: str):
         return []    
 
 
+def parse_html2_file(html_path: Path):
+    """
+    流式解析 MITRE ATT&CK HTML 矩阵文件，结果与 parse_html2 一致
+
+    Args:
+        html_path: HTML 文件路径
+
+    Returns:
+        list: 与 parse_html2 相同格式的技术信息列表
+
+    设计思路：
+    1. 用iterparse边读文件边建树，不需要先把整个文件读成字符串
+    2. body第一个元素的每个子元素闭合时立即提取技术信息
+    3. 提取后清空该子元素并删除已处理的兄弟节点，峰值内存只与单个技术的子树相关
+    """
+    try:
+        result = []
+        container = None
+        for _, elem in etree.iterparse(str(html_path), events=('end',), html=True, encoding='utf-8'):
+            parent = elem.getparent()
+            if parent is None:
+                continue
+
+            if container is None:
+                grandparent = parent.getparent()
+                if grandparent is None or grandparent.tag != 'body':
+                    continue
+                # 与parse_html2一致，只处理body中的第一个元素
+                container = next(child for child in grandparent if isinstance(child.tag, str))
+
+            if parent is not container:
+                continue
+
+            technique_info = _process_top_child(elem)
+            if technique_info:
+                result.append(technique_info)
+
+            # 释放已处理的子树
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+
+        return result
+
+    except Exception as e:
+        print(f"解析HTML时出错: {e}", file=sys.stderr)
+        return []
+
+
 def main():
     if len(sys.argv) != 2:
         print('用法: python extract.py input.html > output.json', file=sys.stderr)
@@ -218,8 +253,13 @@ def main():
     if not html_path.exists():
         print('文件不存在', file=sys.stderr)
         sys.exit(1)
-    records = parse_html2(html_path.read_text(encoding='utf-8'))
-    print(json.dumps(records, ensure_ascii=False, indent=2))
+    records = parse_html2_file(html_path)
+    if orjson is not None:
+        # 直接输出UTF-8字节，格式与json.dumps(indent=2, ensure_ascii=False)一致
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(records, option=orjson.OPT_INDENT_2) + b'\n')
+    else:
+        print(json.dumps(records, ensure_ascii=False, indent=2))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
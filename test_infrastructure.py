@@ -4,6 +4,7 @@
 测试数据库、Redis和基础功能
 """
 
+import os
 import subprocess
 import time
 import sys
@@ -88,16 +89,11 @@ def test_file_structure():
     ]
 
     for file_path in required_files:
-        try:
-            with open(file_path, 'r') as f:
-                pass
-            print(f"✅ {file_path}")
-        except FileNotFoundError:
+        # 只检查文件是否存在，一次stat即可，不需要打开文件
+        if not os.path.isfile(file_path):
             print(f"❌ {file_path} 不存在")
             return False
-        except Exception as e:
-            print(f"❌ {file_path} 访问异常: {e}")
-            return False
+        print(f"✅ {file_path}")
 
     return True
 